@@ -0,0 +1,177 @@
+"""Server settings loaded from storage/config/server.json."""
+
+import copy
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+
+# Default settings
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    "transcription": {
+        # "openai-whisper" or "faster-whisper"; jobs may override per upload
+        "default_engine": "openai-whisper",
+        "device": "auto",
+        "model_size": "large-v3"
+    },
+    "job_store": {
+        # Persist jobs to SQLite and requeue unfinished ones on startup
+        "enabled": True,
+        "path": "storage/jobs.db",
+        "flush_interval": 1.0  # seconds between batched writes
+    },
+    "scheduler": {
+        # "sjf" (shortest estimated job first, with aging) or "fifo"
+        "policy": "sjf",
+        # Seconds of waiting that offset one second of estimated cost
+        "aging_rate": 1.0,
+        # Seconds of estimated cost each upload priority point is worth
+        "priority_weight": 600,
+        # Processing seconds per second of media, until measured
+        "cost_per_media_second": 1.0
+    },
+    "uploads": {
+        # Uploads are streamed to disk in chunks of this size, hashed on the way
+        "chunk_size": 1024 * 1024,
+        "max_bytes": 0,  # largest accepted upload, 0 = no limit
+        # Resumable uploads left incomplete this long are deleted
+        "partial_ttl_hours": 24
+    },
+    "admission": {
+        # Reject uploads with 429 + Retry-After once any limit is reached (0 = no limit)
+        "enabled": True,
+        "max_queued_jobs": 50,
+        "max_queued_seconds": 24 * 3600,  # total media duration waiting
+        "min_free_disk_bytes": 2 * 1024 * 1024 * 1024
+    },
+    "broker": {
+        # Run jobs on separate worker nodes (python -m app.worker_node) that
+        # claim them from a shared SQLite broker; the API then starts no workers
+        "enabled": False,
+        "path": "storage/broker.db",  # must be on storage every node mounts
+        "lease_seconds": 120,  # a node that stops renewing loses its job after this
+        "heartbeat_interval": 15,
+        "poll_interval": 1.0  # idle claim / relay / cancellation check interval
+    },
+    "retry": {
+        # Attempts per stage (1 = no retry). A failed stage is rerun on its own
+        # after base_delay * 2^(n-1) seconds, capped at max_delay; an LLM stage
+        # that runs out of attempts falls back to the raw transcript
+        "extract": {"max_attempts": 3, "base_delay": 5, "max_delay": 60},
+        "transcribe": {"max_attempts": 3, "base_delay": 10, "max_delay": 120},
+        "llm": {"max_attempts": 4, "base_delay": 10, "max_delay": 120}
+    },
+    "watchdog": {
+        # Kill and requeue a stage that overruns its deadline or stops
+        # making progress; a job stuck more than max_requeues times fails
+        "enabled": True,
+        "interval": 10,  # seconds between checks
+        "stall_seconds": 600,  # longest gap between progress updates
+        "max_requeues": 2,
+        # Stage deadline = base + per_media_second * media duration (seconds)
+        "deadlines": {
+            "extract": {"base": 300, "per_media_second": 0.5},
+            "transcribe": {"base": 600, "per_media_second": 10.0},  # CPU large-v3 can run slower than real time
+            "llm": {"base": 300, "per_media_second": 1.0}
+        }
+    },
+    "pipeline": {
+        # Separate worker pools per stage; disable to run whole jobs per worker
+        "enabled": True,
+        "extract_workers": 1,  # CPU-bound ffmpeg
+        "transcribe_workers": 2,  # model-bound ASR
+        "llm_workers": 4,  # I/O-bound LLM requests
+        # Extracted jobs allowed to wait for a transcription worker
+        "handoff_limit": 2
+    },
+    "autoscale": {
+        # Grow and shrink the transcription pool (whole-job workers when the
+        # pipeline is disabled) with the backlog and free RAM / CPU; when
+        # disabled the pool stays at its starting size
+        "enabled": True,
+        "min_workers": 1,  # also the starting size without the pipeline
+        "max_workers": 0,  # 0 = half the CPU cores
+        "interval": 5,  # seconds between decisions
+        "scale_up_cooldown": 30,  # seconds between growth steps
+        "scale_down_idle_seconds": 120,  # idle time before a worker is drained
+        "memory_per_job_bytes": 2 * 1024 * 1024 * 1024,  # until measured
+        "memory_reserve_bytes": 1024 * 1024 * 1024,  # RAM left for the OS and API
+        "max_cpu_load": 0.9  # 1-minute load per core above which the pool stops growing
+    },
+    "audio": {
+        # Decode straight into memory instead of writing a WAV to storage/audio
+        "in_memory": True,
+        # Longer media falls back to a WAV file to bound memory (~64 KB/s as float32)
+        "max_in_memory_seconds": 4 * 3600
+    },
+    "ffmpeg": {
+        "timeout": 0,  # total seconds per run, 0 = no limit
+        "stall_timeout": 120  # kill FFmpeg after this long without output
+    },
+    "cache": {
+        # Reuse transcripts of identical uploads (keyed by content hash + parameters)
+        "enabled": True,
+        "max_bytes": 512 * 1024 * 1024,
+        "max_entries": 10000
+    },
+    "checkpoint": {
+        # Persist decoded segments so interrupted transcriptions resume
+        "enabled": True,
+        "fsync_interval": 10  # seconds; bounds the decoding lost on a crash
+    },
+    "parallel": {
+        # Split long files on pauses and transcribe chunks in a process pool
+        "enabled": False,
+        "processes": 0,  # 0 = half the CPU cores
+        "min_duration": 900,  # seconds of audio before splitting
+        "chunk_seconds": 300,
+        "search_seconds": 20  # how far from a chunk boundary to look for a pause
+    },
+    "models": {
+        # Load and warm the models at startup so the first job does not pay
+        # for it, and unload them when idle to give the memory back
+        "warm_up": True,
+        "warm_up_engines": [],  # empty = the default engine
+        "block_startup": False,  # finish warm-up before accepting requests
+        "idle_unload_minutes": 30  # 0 = keep models loaded forever
+    },
+    "whisper": {
+        # Concurrent transcriptions allowed on a single loaded model.
+        # Workers share one copy of each model, so every extra slot costs
+        # only that inference's activations (far less than a second model
+        # copy) but splits the CPU/GPU between more jobs; 1 runs every
+        # transcription in turn. 0 = CPU cores / threads_per_inference,
+        # and never fewer than 2. The autoscaler adds slots as it grows the
+        # transcription pool, while RAM allows
+        "max_concurrent_inference": 0,
+        "threads_per_inference": 4  # CPU threads one transcription keeps busy
+    }
+}
+
+SETTINGS_PATH = Path("storage/config/server.json")
+
+
+def _merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Recursively merge override into a copy of base."""
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_settings() -> Dict[str, Any]:
+    """Load settings from file, filling in defaults for missing keys."""
+    if SETTINGS_PATH.exists():
+        try:
+            with open(SETTINGS_PATH, 'r', encoding='utf-8') as f:
+                return _merge(DEFAULT_SETTINGS, json.load(f))
+        except Exception as e:
+            print(f"Error loading server settings: {e}")
+    return copy.deepcopy(DEFAULT_SETTINGS)
+
+
+# Global settings instance
+settings = load_settings()
@@ -0,0 +1,178 @@
+"""Upload admission control based on queue backlog and free disk space."""
+
+import math
+import os
+import shutil
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+from .throughput_stats import throughput_stats
+from ..config import settings
+from ..models import Job, JobStatus
+
+
+# Completed jobs the processing rate is averaged over
+RATE_WINDOW = 20
+
+# Bounds on the Retry-After hint, in seconds
+MIN_RETRY_AFTER = 5
+MAX_RETRY_AFTER = 3600
+
+
+class AdmissionRejected(Exception):
+    """Raised when a new upload would exceed a configured limit."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Decides whether uploads are accepted and estimates when jobs finish.
+
+    Throughput is the average media-seconds-per-wall-second of recently
+    completed jobs times the number of concurrent transcription slots,
+    falling back to the recorded transcription speed before any job
+    finished in this process.
+    """
+
+    def __init__(
+        self,
+        max_queued_jobs: int,
+        max_queued_seconds: float,
+        min_free_disk_bytes: int,
+        storage_path: str = "storage"
+    ):
+        self.max_queued_jobs = max_queued_jobs
+        self.max_queued_seconds = max_queued_seconds
+        self.min_free_disk_bytes = min_free_disk_bytes
+        self.storage_path = storage_path
+        self.rejected = 0
+        # Current transcription pool size, kept up to date by the worker supervisor
+        self.slots: Optional[int] = None
+        self._rates: deque = deque(maxlen=RATE_WINDOW)
+
+    def record_completion(self, job: Job):
+        """Sample the processing rate of a finished job."""
+        if job.cache_hit or not job.media or not job.started_at or not job.completed_at:
+            return
+        elapsed = (job.completed_at - job.started_at).total_seconds()
+        if elapsed > 0 and job.media.duration > 0:
+            self._rates.append(job.media.duration / elapsed)
+
+    def concurrency(self) -> int:
+        """Jobs transcribed at the same time."""
+        if self.slots:
+            return self.slots
+        pipeline_config = settings["pipeline"]
+        if pipeline_config["enabled"]:
+            return max(1, pipeline_config["transcribe_workers"])
+        return settings["autoscale"]["min_workers"]
+
+    def throughput(self) -> float:
+        """Media seconds processed per wall-clock second across all workers."""
+        if self._rates:
+            rate = sum(self._rates) / len(self._rates)
+        else:
+            # No job finished yet; use the measured transcription speed
+            config = settings["transcription"]
+            rate = throughput_stats.speed(
+                "transcribe",
+                (config["default_engine"], config["model_size"], config["device"])
+            )
+        return rate * self.concurrency()
+
+    @staticmethod
+    def _remaining_seconds(job: Job) -> float:
+        """Media seconds of a job still to be processed."""
+        duration = job.media.duration if job.media else 0.0
+        return duration * (1 - job.progress / 100)
+
+    def backlog_seconds(self, jobs: Iterable[Job]) -> float:
+        """Unprocessed media seconds across unfinished jobs."""
+        return sum(
+            self._remaining_seconds(job) for job in jobs
+            if job.status not in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+        )
+
+    def _retry_after(self, excess_seconds: float) -> int:
+        """Seconds until excess_seconds of work has drained."""
+        seconds = math.ceil(excess_seconds / self.throughput())
+        return max(MIN_RETRY_AFTER, min(seconds, MAX_RETRY_AFTER))
+
+    def check(
+        self,
+        jobs: Iterable[Job],
+        incoming_bytes: int = 0,
+        incoming_seconds: float = 0.0
+    ):
+        """
+        Raise AdmissionRejected if accepting one more upload exceeds a limit.
+
+        Args:
+            jobs: Every job the queue manager knows about
+            incoming_bytes: Size of the upload, if known
+            incoming_seconds: Media duration of the upload, if known
+        """
+        queued = [job for job in jobs if job.status == JobStatus.QUEUED]
+        queued_seconds = sum(job.media.duration for job in queued if job.media)
+
+        try:
+            if self.max_queued_jobs and len(queued) >= self.max_queued_jobs:
+                # Roughly the time for one queued job to start
+                average = queued_seconds / len(queued) if queued else 0.0
+                raise AdmissionRejected(
+                    f"Queue is full ({len(queued)} jobs waiting)",
+                    self._retry_after((len(queued) - self.max_queued_jobs + 1) * average)
+                )
+
+            if self.max_queued_seconds and queued_seconds + incoming_seconds > self.max_queued_seconds:
+                raise AdmissionRejected(
+                    f"Queued media would reach {(queued_seconds + incoming_seconds) / 3600:.1f}h "
+                    f"(limit {self.max_queued_seconds / 3600:.1f}h)",
+                    self._retry_after(queued_seconds + incoming_seconds - self.max_queued_seconds)
+                )
+
+            if self.min_free_disk_bytes:
+                # Storage is created at startup; measure the working dir until then
+                path = self.storage_path if os.path.isdir(self.storage_path) else "."
+                free = shutil.disk_usage(path).free
+                if free - incoming_bytes < self.min_free_disk_bytes:
+                    # Space is only reclaimed as the backlog finishes
+                    raise AdmissionRejected(
+                        f"Insufficient disk space ({free // (1024 * 1024)} MB free)",
+                        self._retry_after(queued_seconds)
+                    )
+        except AdmissionRejected:
+            self.rejected += 1
+            raise
+
+    def estimate_completion(self, job: Job, jobs: Iterable[Job]) -> Optional[datetime]:
+        """Wall-clock time the job should finish if all current work runs first."""
+        if not job.media:
+            return None
+        ahead = self.backlog_seconds(other for other in jobs if other.id != job.id)
+        seconds = (ahead + self._remaining_seconds(job)) / self.throughput()
+        return datetime.now() + timedelta(seconds=seconds)
+
+    def stats(self, jobs: Iterable[Job]) -> Dict[str, Any]:
+        """Limits, current throughput and backlog for /api/status."""
+        return {
+            "max_queued_jobs": self.max_queued_jobs,
+            "max_queued_seconds": self.max_queued_seconds,
+            "min_free_disk_bytes": self.min_free_disk_bytes,
+            "throughput": round(self.throughput(), 3),
+            "backlog_seconds": round(self.backlog_seconds(jobs), 1),
+            "rejected": self.rejected
+        }
+
+
+# Global admission controller
+admission = AdmissionController(
+    max_queued_jobs=settings["admission"]["max_queued_jobs"],
+    max_queued_seconds=settings["admission"]["max_queued_seconds"],
+    min_free_disk_bytes=settings["admission"]["min_free_disk_bytes"]
+)
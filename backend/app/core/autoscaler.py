@@ -0,0 +1,289 @@
+"""Supervisor that sizes the worker pool to the backlog and host headroom."""
+
+import asyncio
+import os
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from .admission import admission
+from ..config import settings
+
+
+# Scaling decisions kept for /api/status
+DECISION_HISTORY = 20
+
+# Weight of the newest per-job memory sample
+MEMORY_SMOOTHING = 0.2
+
+
+def get_max_workers() -> int:
+    """Upper bound of the pool from settings (0 = half the cores)."""
+    config = settings["autoscale"]
+    configured = config["max_workers"]
+    upper = configured if configured > 0 else max(1, cpu_count() // 2)
+    return max(upper, config["min_workers"], 1)
+
+
+def cpu_count() -> int:
+    """Cores this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def available_memory() -> Optional[int]:
+    """Bytes of RAM available to new work, or None if unknown."""
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def process_memory() -> Optional[int]:
+    """Resident set size of this process in bytes, or None if unknown."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def cpu_load() -> Optional[float]:
+    """1-minute load average per core, or None if unknown."""
+    try:
+        return os.getloadavg()[0] / cpu_count()
+    except OSError:
+        return None
+
+
+class WorkerSupervisor:
+    """
+    Grows and shrinks one pool of workers between min_workers and max_workers.
+
+    The pool grows while jobs wait and every worker is busy, as long as the
+    host has room for another job: free RAM above the reserve for one more
+    job's measured footprint, and CPU load below max_cpu_load. It shrinks by
+    draining workers that have been idle for scale_down_idle_seconds, or one
+    worker at a time while RAM is below the reserve. A drained worker stops
+    taking jobs; if busy it finishes its current job first.
+
+    A pool whose workers all need an inference slot (the pipeline's
+    transcription stage) keeps the shared models' slots in step with its
+    size, since workers beyond the slots would only wait on the model.
+    Growing adds slots (the memory check above covers the extra
+    inferences); without a way to add them the pool is capped at the
+    slots available.
+
+    Per-job memory is measured as this process's resident memory above its
+    idle baseline divided by the busy workers, smoothed over time.
+    """
+
+    def __init__(
+        self,
+        spawn: Callable[[int], Any],
+        backlog: Callable[[], int],
+        discard: Optional[Callable[[Any], None]] = None,
+        first_worker_id: int = 0,
+        inference_slots: Optional[Callable[[], int]] = None,
+        add_inference_slot: Optional[Callable[[], None]] = None
+    ):
+        """
+        Initialize supervisor.
+
+        Args:
+            spawn: Creates an unstarted worker with the given ID
+            backlog: Number of jobs waiting for this pool
+            discard: Called with each worker once it has exited
+            first_worker_id: ID given to the first spawned worker
+            inference_slots: Concurrent inferences the loaded models allow,
+                if every worker of this pool needs one
+            add_inference_slot: Raises the concurrent inferences allowed
+        """
+        config = settings["autoscale"]
+        self.enabled = config["enabled"]
+        self.min_workers = max(1, config["min_workers"])
+        self.max_workers = get_max_workers()
+        self.spawn = spawn
+        self.backlog = backlog
+        self.discard = discard
+        self.inference_slots = inference_slots
+        self.add_inference_slot = add_inference_slot
+        self.workers: List[Any] = []
+        self.draining: List[Any] = []
+        self.decisions: deque = deque(maxlen=DECISION_HISTORY)
+        self.memory_per_job = float(config["memory_per_job_bytes"])
+        self.memory_measured = False
+        self._tasks: Dict[Any, asyncio.Task] = {}
+        self._next_id = first_worker_id
+        self._idle_baseline: Optional[int] = None
+        self._last_scale_up = 0.0
+        self._loop: Optional[asyncio.Task] = None
+
+    def limit(self) -> int:
+        """Current upper bound of the pool: max_workers, or fewer fixed inference slots."""
+        if self.inference_slots is None or self.add_inference_slot is not None:
+            return self.max_workers
+        return max(self.min_workers, min(self.max_workers, self.inference_slots()))
+
+    def _fit_slots(self, target: int) -> int:
+        """Add inference slots for a pool of target workers; returns the size that fits."""
+        if self.inference_slots is None:
+            return target
+        if self.add_inference_slot is not None:
+            for _ in range(target - self.inference_slots()):
+                self.add_inference_slot()
+        return max(self.min_workers, min(target, self.inference_slots()))
+
+    def start(self, initial: int) -> List[Any]:
+        """Start `initial` workers (clamped to the bounds) and the control loop."""
+        count = self._fit_slots(max(self.min_workers, min(initial, self.max_workers)))
+        for _ in range(count):
+            self._add_worker()
+        admission.slots = len(self.workers)
+        if self.enabled:
+            self._loop = asyncio.create_task(self._control_loop())
+        return list(self.workers)
+
+    def stop(self):
+        """Stop the control loop and every worker."""
+        if self._loop is not None:
+            self._loop.cancel()
+            self._loop = None
+        for worker in self.workers + self.draining:
+            worker.stop()
+
+    def _add_worker(self):
+        """Create and start one worker."""
+        worker = self.spawn(self._next_id)
+        self._next_id += 1
+        self.workers.append(worker)
+        task = asyncio.create_task(worker.start())
+        self._tasks[worker] = task
+        task.add_done_callback(lambda _, worker=worker: self._on_exit(worker))
+
+    def _drain(self, worker):
+        """Stop a worker from taking jobs; an idle one exits right away."""
+        self.workers.remove(worker)
+        self.draining.append(worker)
+        worker.stop()
+        if worker.idle_since is not None:
+            # Waiting on the queue; cancelling the wait loses no job
+            self._tasks[worker].cancel()
+
+    def _on_exit(self, worker):
+        """Forget a worker whose loop has ended."""
+        self._tasks.pop(worker, None)
+        for pool in (self.workers, self.draining):
+            if worker in pool:
+                pool.remove(worker)
+        if self.discard:
+            self.discard(worker)
+
+    def _record(self, action: str, before: int, reason: str):
+        """Remember a scaling decision."""
+        after = len(self.workers)
+        self.decisions.append({
+            "at": datetime.now().isoformat(),
+            "action": action,
+            "from": before,
+            "to": after,
+            "reason": reason
+        })
+        admission.slots = after
+        print(f"Autoscale: {action} {before} -> {after} workers ({reason})")
+
+    def _measure_memory(self, busy: int):
+        """Update the per-job memory estimate from this process's RSS."""
+        rss = process_memory()
+        if rss is None:
+            return
+        if busy == 0:
+            # Loaded models stay resident, so the baseline follows the idle RSS
+            self._idle_baseline = rss
+        elif self._idle_baseline is not None:
+            sample = max(0, rss - self._idle_baseline) / busy
+            if self.memory_measured:
+                self.memory_per_job += MEMORY_SMOOTHING * (sample - self.memory_per_job)
+            else:
+                self.memory_per_job = sample
+                self.memory_measured = True
+
+    def evaluate(self):
+        """Make one scaling decision."""
+        config = settings["autoscale"]
+        now = time.monotonic()
+        busy = len([w for w in self.workers if w.idle_since is None])
+        idle = [w for w in self.workers if w.idle_since is not None]
+        waiting = self.backlog()
+        count = len(self.workers)
+        limit = self.limit()
+        self._measure_memory(busy + len(self.draining))
+
+        free = available_memory()
+        headroom = None if free is None else free - config["memory_reserve_bytes"]
+
+        if headroom is not None and headroom < 0 and count > self.min_workers:
+            # Under memory pressure; shed a worker (an idle one if possible)
+            self._drain(idle[0] if idle else self.workers[-1])
+            self._record("scale_down", count, f"{free // (1024 * 1024)} MB RAM free, below reserve")
+            return
+
+        if waiting > len(idle) and count < limit:
+            if now - self._last_scale_up < config["scale_up_cooldown"]:
+                return
+            load = cpu_load()
+            if load is not None and load >= config["max_cpu_load"]:
+                return
+            add = min(waiting - len(idle), limit - count)
+            if headroom is not None:
+                add = min(add, int(headroom // max(self.memory_per_job, 1)))
+            add = self._fit_slots(count + add) - count
+            if add <= 0:
+                return
+            for _ in range(add):
+                self._add_worker()
+            self._last_scale_up = now
+            self._record("scale_up", count, f"{waiting} jobs waiting, {len(idle)} idle workers")
+            return
+
+        if waiting == 0 and count > self.min_workers:
+            stale = [w for w in idle if now - w.idle_since >= config["scale_down_idle_seconds"]]
+            if stale:
+                for worker in stale[:count - self.min_workers]:
+                    self._drain(worker)
+                self._record("scale_down", count, f"idle for {config['scale_down_idle_seconds']}s")
+
+    async def _control_loop(self):
+        """Re-evaluate the pool every interval seconds."""
+        while True:
+            await asyncio.sleep(settings["autoscale"]["interval"])
+            try:
+                self.evaluate()
+            except Exception as e:
+                print(f"Autoscale error: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, host headroom and recent decisions for /api/status."""
+        return {
+            "enabled": self.enabled,
+            "min_workers": self.min_workers,
+            "max_workers": self.max_workers,
+            "limit": self.limit(),
+            "workers": len(self.workers),
+            "busy": len([w for w in self.workers if w.idle_since is None]),
+            "draining": len(self.draining),
+            "backlog": self.backlog(),
+            "memory_per_job_bytes": int(self.memory_per_job),
+            "memory_measured": self.memory_measured,
+            "available_memory_bytes": available_memory(),
+            "cpu_count": cpu_count(),
+            "cpu_load": cpu_load(),
+            "decisions": list(self.decisions)
+        }
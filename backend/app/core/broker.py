@@ -0,0 +1,257 @@
+"""Shared SQLite job broker for worker processes on other hosts."""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..models import Job
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS broker_jobs (
+    job_id TEXT PRIMARY KEY,
+    rank REAL NOT NULL,
+    state TEXT NOT NULL,
+    data TEXT NOT NULL,
+    worker_id TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_broker_jobs_state_rank ON broker_jobs (state, rank);
+CREATE TABLE IF NOT EXISTS broker_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+# broker_jobs.state values
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+CANCELLED = "cancelled"
+
+
+class JobBroker:
+    """
+    Job queue shared by the API process and remote worker nodes.
+
+    The API enqueues jobs; nodes claim them under a time-limited lease and
+    renew it with heartbeats. A job whose lease expires (node crashed or
+    lost) is handed to the next node that asks. Nodes publish job updates
+    and segments as events, which the API relays to WebSocket clients.
+
+    SQLite in WAL mode on storage every node mounts is enough for a few
+    nodes; claims take a write lock (BEGIN IMMEDIATE) so a job is only
+    ever leased to one node at a time.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def open(self):
+        """Open the database and create the schema."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        print(f"Job broker opened: {self.path}")
+
+    def close(self):
+        """Close the database."""
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+            self._conn = None
+
+    def _write(self, sql: str, params: Tuple = ()) -> int:
+        """Run one write statement. Returns the number of rows changed."""
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    # ============== API side ==============
+
+    def enqueue(self, job: Job, rank: float):
+        """Queue a job unless the broker already has it (e.g. leased before a restart)."""
+        self._write(
+            "INSERT OR IGNORE INTO broker_jobs (job_id, rank, state, data) VALUES (?, ?, ?, ?)",
+            (job.id, rank, QUEUED, job.model_dump_json())
+        )
+
+    def cancel(self, job_id: str):
+        """Withdraw a queued job, or flag a leased one so its node stops it."""
+        self._write(
+            "UPDATE broker_jobs SET state = ? WHERE job_id = ? AND state IN (?, ?)",
+            (CANCELLED, job_id, QUEUED, LEASED)
+        )
+
+    def events_after(self, seq: int, limit: int = 500) -> List[Tuple[int, str, Dict[str, Any]]]:
+        """Events published after seq, oldest first, as (seq, job_id, message)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, job_id, data FROM broker_events WHERE seq > ? ORDER BY seq LIMIT ?",
+                (seq, limit)
+            ).fetchall()
+        return [(row_seq, job_id, json.loads(data)) for row_seq, job_id, data in rows]
+
+    def prune_events(self, up_to_seq: int):
+        """Drop events the API has applied."""
+        self._write("DELETE FROM broker_events WHERE seq <= ?", (up_to_seq,))
+
+    def counts(self) -> Dict[str, int]:
+        """Number of broker jobs per state, plus live leases."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM broker_jobs GROUP BY state"
+            ).fetchall()
+            nodes = self._conn.execute(
+                "SELECT COUNT(DISTINCT worker_id) FROM broker_jobs WHERE state = ? AND lease_expires > ?",
+                (LEASED, time.time())
+            ).fetchone()[0]
+        counts = {state: 0 for state in (QUEUED, LEASED, DONE, CANCELLED)}
+        counts.update(dict(rows))
+        counts["busy_nodes"] = nodes
+        return counts
+
+    # ============== Node side ==============
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        """Lease the best-ranked queued (or abandoned) job, if any."""
+        now = time.time()
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT job_id, data FROM broker_jobs "
+                    "WHERE state = ? OR (state = ? AND lease_expires < ?) "
+                    "ORDER BY rank LIMIT 1",
+                    (QUEUED, LEASED, now)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                job_id, data = row
+                conn.execute(
+                    "UPDATE broker_jobs SET state = ?, worker_id = ?, lease_expires = ?, "
+                    "attempts = attempts + 1 WHERE job_id = ?",
+                    (LEASED, worker_id, now + lease_seconds, job_id)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return Job.model_validate_json(data)
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Extend a lease. Returns False if the job was cancelled or leased elsewhere."""
+        return self._write(
+            "UPDATE broker_jobs SET lease_expires = ? WHERE job_id = ? AND worker_id = ? AND state = ?",
+            (time.time() + lease_seconds, job_id, worker_id, LEASED)
+        ) == 1
+
+    def lease_state(self, job_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """(state, worker_id) of a broker job, or (None, None) if unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state, worker_id FROM broker_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return row if row else (None, None)
+
+    def release(self, job: Job, worker_id: str) -> bool:
+        """
+        Hand a job back to the queue for any node to claim.
+
+        Also applies once the node has already finished the job, as when a
+        stage was stopped rather than completed. Returns False if the job
+        is not the worker's (or was cancelled).
+        """
+        return self._write(
+            "UPDATE broker_jobs SET state = ?, data = ?, worker_id = NULL, lease_expires = NULL "
+            "WHERE job_id = ? AND worker_id = ? AND state IN (?, ?)",
+            (QUEUED, job.model_dump_json(), job.id, worker_id, LEASED, DONE)
+        ) == 1
+
+    def finish(self, job_id: str, worker_id: str):
+        """Release a lease once the node is done with the job."""
+        self._write(
+            "UPDATE broker_jobs SET state = ?, lease_expires = NULL "
+            "WHERE job_id = ? AND worker_id = ? AND state = ?",
+            (DONE, job_id, worker_id, LEASED)
+        )
+
+    def publish(self, events: List[Tuple[str, Dict[str, Any]]]):
+        """Publish job updates and segments, in order, for the API to relay."""
+        rows = [
+            (job_id, json.dumps(message, ensure_ascii=False, default=str))
+            for job_id, message in events
+        ]
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                conn.executemany("INSERT INTO broker_events (job_id, data) VALUES (?, ?)", rows)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+
+class BrokerPublisher:
+    """
+    Stands in for WebSocketManager on a worker node: everything the
+    QueueManager would broadcast is published to the broker instead,
+    batched every flush_interval and written by one writer to keep order.
+    """
+
+    def __init__(self, broker: JobBroker, flush_interval: float = 0.5):
+        self.broker = broker
+        self.flush_interval = flush_interval
+        self.active_connections: List[Any] = []
+        self._pending: List[Tuple[str, Dict[str, Any]]] = []
+        self._flush_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def broadcast(self, message: dict):
+        """Queue a message for the API to relay to its clients."""
+        self._pending.append((message.get("job_id") or message.get("id"), message))
+
+    async def flush(self):
+        """Write queued messages to the broker."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch = self._pending
+            self._pending = []
+            try:
+                await asyncio.to_thread(self.broker.publish, batch)
+            except Exception as e:
+                print(f"Error publishing to broker: {e}")
+                self._pending = batch + self._pending
+
+    async def _flush_loop(self):
+        """Flush every flush_interval seconds."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self):
+        """Start the background flusher."""
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        """Stop the flusher and write what is left."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await self.flush()
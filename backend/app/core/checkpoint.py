@@ -0,0 +1,97 @@
+"""Append-only per-job transcription checkpoints for resuming after a crash."""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config import settings
+
+
+CHECKPOINT_ROOT = Path("storage/checkpoints")
+
+
+class TranscriptCheckpoint:
+    """
+    Decoded segments of one job, one JSON line per segment.
+
+    Lines are flushed as they are appended and fsynced at most once per
+    fsync_interval, so a crash loses at most that much decoding. A torn
+    last line from a crash mid-write is cut off on load, so appends after
+    a resume start on a fresh line.
+    """
+
+    def __init__(self, job_id: str, fsync_interval: Optional[float] = None):
+        self.path = CHECKPOINT_ROOT / f"{job_id}.jsonl"
+        self.fsync_interval = (
+            fsync_interval if fsync_interval is not None
+            else settings["checkpoint"]["fsync_interval"]
+        )
+        self._file = None
+        self._last_sync = time.monotonic()
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Read committed segments, in order, truncating any torn tail."""
+        if not self.path.exists():
+            return []
+        segments = []
+        committed = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Partial line from an interrupted write
+                    break
+                try:
+                    segments.append(json.loads(line))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break
+                committed += len(line)
+            torn = f.seek(0, os.SEEK_END) > committed
+        if torn:
+            # Drop everything after the last complete line; appending in
+            # 'a' mode would otherwise leave the torn bytes mid-file
+            with open(self.path, 'r+b') as f:
+                f.truncate(committed)
+                f.flush()
+                os.fsync(f.fileno())
+        return segments
+
+    def resume_offset(self, segments: List[Dict[str, Any]]) -> float:
+        """Timestamp to resume decoding from: the end of the last committed segment."""
+        return segments[-1]["end"] if segments else 0.0
+
+    async def append(self, segment: Dict[str, Any]):
+        """Append a segment, fsyncing off the event loop when the interval has elapsed."""
+        if self._file is None:
+            CHECKPOINT_ROOT.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(segment, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+        if time.monotonic() - self._last_sync >= self.fsync_interval:
+            self._last_sync = time.monotonic()
+            await asyncio.to_thread(os.fsync, self._file.fileno())
+
+    def close(self):
+        """
+        Sync and close the checkpoint file.
+
+        Blocks on fsync; call it through asyncio.to_thread from async code.
+        """
+        if self._file is not None:
+            try:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            finally:
+                self._file.close()
+                self._file = None
+
+    def remove(self):
+        """Delete the checkpoint once the transcript is saved."""
+        self.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -1,43 +1,124 @@
 """FFmpeg processor for audio extraction with progress tracking."""
 
 import asyncio
+import json
 import subprocess
-import re
-from pathlib import Path
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, Optional
+
+from ..config import settings
+from ..models import MediaInfo, MediaStream
+
+
+class FFmpegTimeout(Exception):
+    """Raised when FFmpeg stalls or exceeds its time limit."""
+    pass
+
+
+class _ThreadedPipe:
+    """Async reads from a blocking pipe, each run on a worker thread."""
+
+    def __init__(self, pipe):
+        self._pipe = pipe
+
+    async def read(self, n: int = -1) -> bytes:
+        # read1 returns what is available, like StreamReader.read(n)
+        if n < 0:
+            return await asyncio.to_thread(self._pipe.read)
+        return await asyncio.to_thread(self._pipe.read1, n)
+
+    async def readline(self) -> bytes:
+        return await asyncio.to_thread(self._pipe.readline)
+
+
+class _ThreadedProcess:
+    """
+    subprocess.Popen behind the parts of asyncio.subprocess.Process used
+    here, for event loops that cannot spawn subprocesses (the
+    SelectorEventLoop on Windows, which uvicorn uses with --reload).
+    """
+
+    def __init__(self, cmd):
+        self._popen = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        self.stdout = _ThreadedPipe(self._popen.stdout)
+        self.stderr = _ThreadedPipe(self._popen.stderr)
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self._popen.poll()
+
+    async def wait(self) -> int:
+        return await asyncio.to_thread(self._popen.wait)
+
+    async def communicate(self):
+        return await asyncio.to_thread(self._popen.communicate)
+
+    def terminate(self):
+        self._popen.terminate()
+
+    def kill(self):
+        self._popen.kill()
+
+
+async def _spawn(cmd):
+    """Start cmd with piped stdout/stderr, on a thread if the loop cannot."""
+    try:
+        return await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    except NotImplementedError:
+        return await asyncio.to_thread(_ThreadedProcess, cmd)
 
 
 class FFmpegProcessor:
     """Handles FFmpeg audio extraction with progress tracking."""
 
     def __init__(self):
-        self.process: Optional[subprocess.Popen] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._cancelled = False
 
     async def extract_audio(
         self,
         video_path: str,
         audio_path: str,
-        progress_callback: Optional[Callable[[float, str], None]] = None
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        duration: Optional[float] = None
     ) -> bool:
         """
         Extract audio from video using FFmpeg with progress tracking.
 
+        Progress is read from FFmpeg's -progress pipe while it runs.
+
         Args:
             video_path: Path to input video
             audio_path: Path to output audio
             progress_callback: Async callback(progress_percent, message)
+            duration: Media duration if already known (skips ffprobe)
 
         Returns:
             bool: True if successful
         """
         try:
             # First, get video duration
-            duration = await self._get_duration(video_path)
+            if duration is None:
+                duration = await self._get_duration(video_path)
             print(f"Video duration: {duration:.2f} seconds")
 
             # FFmpeg command to extract audio
             cmd = [
                 'ffmpeg',
+                '-nostdin',
+                '-hide_banner',
+                '-loglevel', 'error',
+                '-progress', 'pipe:1',  # Machine-readable progress on stdout
+                '-nostats',
                 '-i', video_path,
                 '-vn',  # No video
                 '-acodec', 'pcm_s16le',  # WAV codec
@@ -47,41 +128,26 @@ class FFmpegProcessor:
                 audio_path
             ]
 
-            def run_ffmpeg():
-                """Run FFmpeg in a thread."""
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    encoding='utf-8',
-                    errors='ignore'
-                )
-
-                stderr_output = []
-                if process.stderr:
-                    for line in process.stderr:
-                        stderr_output.append(line)
-
-                process.wait()
-                return process.returncode, stderr_output
+            process = await self._start(cmd)
+            # Drain stderr concurrently so FFmpeg never blocks on a full pipe
+            stderr_task = asyncio.create_task(process.stderr.read())
 
-            # Run FFmpeg in thread pool
-            returncode, stderr_lines = await asyncio.to_thread(run_ffmpeg)
+            try:
+                await self._run_with_timeouts(
+                    self._read_progress(process, duration, progress_callback)
+                )
+            except FFmpegTimeout as e:
+                print(f"FFmpeg timed out: {e}")
+                await self._terminate(process)
+                return False
 
-            # Parse progress from stderr
-            for line in stderr_lines:
-                time_match = re.search(r'time=(\d{2}):(\d{2}):(\d{2}\.\d{2})', line)
-                if time_match and duration > 0:
-                    hours, minutes, seconds = time_match.groups()
-                    current_time = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
-                    progress = min((current_time / duration) * 100, 100)
+            returncode = await process.wait()
+            stderr = await stderr_task
+            self.process = None
 
-                    if progress_callback:
-                        await progress_callback(
-                            progress,
-                            f"Extracting audio: {progress:.1f}%"
-                        )
+            if self._cancelled:
+                print("FFmpeg extraction cancelled")
+                return False
 
             if returncode == 0:
                 if progress_callback:
@@ -89,62 +155,268 @@ class FFmpegProcessor:
                 print(f"Audio extracted successfully: {audio_path}")
                 return True
             else:
-                print(f"FFmpeg failed with return code: {returncode}")
+                print(f"FFmpeg failed with return code {returncode}: "
+                      f"{stderr.decode('utf-8', errors='ignore')[-500:]}")
                 return False
 
         except Exception as e:
             print(f"FFmpeg error: {e}")
             import traceback
             traceback.print_exc()
+            if self.process is not None:
+                await self._terminate(self.process)
             return False
 
-    async def _get_duration(self, video_path: str) -> float:
-        """Get video duration in seconds using ffprobe."""
+    async def decode_audio(
+        self,
+        video_path: str,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        duration: Optional[float] = None
+    ):
+        """
+        Decode audio straight into memory as 16 kHz mono float32 PCM.
+
+        FFmpeg writes raw s16le samples to a pipe, so nothing is written to
+        disk and the engine does not need to decode the audio again.
+
+        Args:
+            video_path: Path to input video
+            progress_callback: Async callback(progress_percent, message)
+            duration: Media duration if already known (skips ffprobe)
+
+        Returns:
+            numpy.ndarray of float32 samples, or None on failure
+        """
+        import numpy as np
+
         try:
-            import os
-            import subprocess
-
-            def run_ffprobe():
-                cmd = [
-                    'ffprobe',
-                    '-v', 'error',
-                    '-show_entries', 'format=duration',
-                    '-of', 'default=noprint_wrappers=1:nokey=1',
-                    video_path
-                ]
-
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    encoding='utf-8',
-                    errors='ignore'
-                )
+            if duration is None:
+                duration = await self._get_duration(video_path)
+            print(f"Video duration: {duration:.2f} seconds")
+            expected_bytes = duration * 16000 * 2
+
+            cmd = [
+                'ffmpeg',
+                '-nostdin',
+                '-hide_banner',
+                '-loglevel', 'error',
+                '-i', video_path,
+                '-vn',  # No video
+                '-f', 's16le',  # Raw 16-bit PCM
+                '-acodec', 'pcm_s16le',
+                '-ar', '16000',  # Sample rate (Whisper recommended)
+                '-ac', '1',  # Mono
+                'pipe:1'
+            ]
+
+            process = await self._start(cmd)
+            # Drain stderr concurrently so FFmpeg never blocks on a full pipe
+            stderr_task = asyncio.create_task(process.stderr.read())
+
+            pcm = bytearray()
 
-                return result.returncode, result.stdout, result.stderr
+            async def read_pcm():
+                # Progress comes from the number of PCM bytes received
+                last_reported = -1
+                while True:
+                    chunk = await self._with_stall_timeout(process.stdout.read(1 << 20))
+                    if not chunk:
+                        break
+                    pcm.extend(chunk)
 
-            # Run subprocess in thread pool to avoid blocking
-            returncode, stdout, stderr = await asyncio.to_thread(run_ffprobe)
+                    if progress_callback and expected_bytes > 0:
+                        progress = min(len(pcm) / expected_bytes * 100, 100)
+                        if int(progress) > last_reported:
+                            last_reported = int(progress)
+                            await progress_callback(
+                                progress,
+                                f"Decoding audio: {progress:.1f}%"
+                            )
+
+            try:
+                await self._run_with_timeouts(read_pcm())
+            except FFmpegTimeout as e:
+                print(f"FFmpeg timed out: {e}")
+                await self._terminate(process)
+                return None
+
+            returncode = await process.wait()
+            stderr = await stderr_task
+            self.process = None
+
+            if self._cancelled:
+                print("FFmpeg decoding cancelled")
+                return None
 
             if returncode != 0:
-                print(f"ffprobe failed with return code {returncode}: {stderr}")
-                return 0.0
+                print(f"FFmpeg failed with return code {returncode}: "
+                      f"{stderr.decode('utf-8', errors='ignore')[-500:]}")
+                return None
+
+            # Drop a trailing odd byte, if any, before viewing as int16
+            usable = len(pcm) - (len(pcm) % 2)
+            audio = np.frombuffer(pcm, dtype=np.int16, count=usable // 2).astype(np.float32) / 32768.0
+
+            if progress_callback:
+                await progress_callback(100, "Audio decoding complete")
+            print(f"Audio decoded in memory: {len(audio) / 16000:.2f}s")
+            return audio
+
+        except Exception as e:
+            print(f"FFmpeg decode error: {e}")
+            import traceback
+            traceback.print_exc()
+            if self.process is not None:
+                await self._terminate(self.process)
+            return None
+
+    async def _start(self, cmd) -> asyncio.subprocess.Process:
+        """Start FFmpeg and remember the process so cancel() can stop it."""
+        self._cancelled = False
+        self.process = await _spawn(cmd)
+        return self.process
+
+    async def _run_with_timeouts(self, coro):
+        """Run a reader coroutine under the configured total time limit."""
+        timeout = settings["ffmpeg"]["timeout"]
+        try:
+            await asyncio.wait_for(coro, timeout=timeout or None)
+        except asyncio.TimeoutError:
+            raise FFmpegTimeout(f"no completion within {timeout}s")
+
+    async def _with_stall_timeout(self, coro):
+        """Await one read, failing if FFmpeg produces nothing for stall_timeout."""
+        stall_timeout = settings["ffmpeg"]["stall_timeout"]
+        try:
+            return await asyncio.wait_for(coro, timeout=stall_timeout or None)
+        except asyncio.TimeoutError:
+            raise FFmpegTimeout(f"no output for {stall_timeout}s")
+
+    async def _read_progress(
+        self,
+        process: asyncio.subprocess.Process,
+        duration: float,
+        progress_callback: Optional[Callable[[float, str], None]]
+    ):
+        """Parse key=value blocks from -progress pipe:1 as FFmpeg emits them."""
+        while True:
+            line = await self._with_stall_timeout(process.stdout.readline())
+            if not line:
+                break
 
-            duration_str = stdout.strip()
-            if not duration_str:
-                print("ffprobe returned empty duration")
-                return 0.0
+            key, _, value = line.decode('utf-8', errors='ignore').strip().partition('=')
+            # out_time_ms is in microseconds too (a long-standing FFmpeg quirk)
+            if key in ('out_time_us', 'out_time_ms') and value.isdigit() and duration > 0:
+                current_time = int(value) / 1_000_000
+                progress = min((current_time / duration) * 100, 100)
 
-            return float(duration_str)
+                if progress_callback:
+                    await progress_callback(
+                        progress,
+                        f"Extracting audio: {progress:.1f}%"
+                    )
+            elif key == 'progress' and value == 'end':
+                break
+
+    async def _terminate(self, process: asyncio.subprocess.Process, grace: float = 5.0):
+        """Terminate FFmpeg, killing it if it ignores the signal."""
+        if process.returncode is None:
+            try:
+                process.terminate()
+                await asyncio.wait_for(process.wait(), timeout=grace)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+            except ProcessLookupError:
+                pass
+        if self.process is process:
+            self.process = None
+
+    async def probe(self, media_path: str) -> Optional[MediaInfo]:
+        """
+        Probe container and stream metadata with a single ffprobe call.
+
+        Args:
+            media_path: Path to media file
+
+        Returns:
+            MediaInfo, or None if ffprobe failed
+        """
+        try:
+            cmd = [
+                'ffprobe',
+                '-v', 'error',
+                '-print_format', 'json',
+                '-show_format',
+                '-show_streams',
+                media_path
+            ]
+
+            process = await _spawn(cmd)
+            stdout, stderr = await process.communicate()
+
+            if process.returncode != 0:
+                print(f"ffprobe failed with return code {process.returncode}: "
+                      f"{stderr.decode('utf-8', errors='ignore')}")
+                return None
+
+            return self._parse_probe(json.loads(stdout.decode('utf-8', errors='ignore')))
 
         except Exception as e:
-            print(f"Error getting duration: {e}")
+            print(f"Error probing media: {e}")
             import traceback
             traceback.print_exc()
-            return 0.0
+            return None
+
+    @staticmethod
+    def _parse_probe(data: Dict[str, Any]) -> MediaInfo:
+        """Convert ffprobe JSON output to MediaInfo."""
+        def to_int(value):
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return None
+
+        fmt = data.get("format", {})
+        streams = []
+        for stream in data.get("streams", []):
+            # Embedded cover art shows up as a single-frame video stream
+            if stream.get("disposition", {}).get("attached_pic"):
+                continue
+            streams.append(MediaStream(
+                index=stream.get("index", len(streams)),
+                codec_type=stream.get("codec_type", "unknown"),
+                codec_name=stream.get("codec_name"),
+                sample_rate=to_int(stream.get("sample_rate")),
+                channels=to_int(stream.get("channels")),
+                channel_layout=stream.get("channel_layout"),
+                width=to_int(stream.get("width")),
+                height=to_int(stream.get("height"))
+            ))
+
+        try:
+            duration = float(fmt.get("duration", 0.0))
+        except (TypeError, ValueError):
+            duration = 0.0
+
+        return MediaInfo(
+            format_name=fmt.get("format_name"),
+            duration=duration,
+            bit_rate=to_int(fmt.get("bit_rate")),
+            streams=streams
+        )
+
+    async def _get_duration(self, video_path: str) -> float:
+        """Get media duration in seconds using ffprobe."""
+        media = await self.probe(video_path)
+        return media.duration if media else 0.0
 
     def cancel(self):
         """Cancel current FFmpeg process."""
-        if self.process:
-            self.process.terminate()
-            print("FFmpeg process terminated")
+        self._cancelled = True
+        if self.process and self.process.returncode is None:
+            try:
+                self.process.terminate()
+                print("FFmpeg process terminated")
+            except ProcessLookupError:
+                pass
@@ -0,0 +1,147 @@
+"""Secondary indexes over the job table: arrival order, status and changes."""
+
+import heapq
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models import Job, JobStatus
+
+
+class JobIndex:
+    """
+    Keeps every job's arrival position in a sorted list overall and per
+    status, updated on each status transition, so status counts are O(1)
+    and a page of jobs (optionally filtered by status) costs O(log n + page)
+    however long the history grows.
+
+    Positions only increase, so a position doubles as the pagination
+    cursor: a page lists jobs newest first, strictly before the cursor.
+
+    It also orders jobs by the change sequence number of their latest
+    update, so the jobs changed since a sequence number cost O(changes).
+    """
+
+    def __init__(self):
+        self._next_position = 0
+        self._position: Dict[str, int] = {}
+        self._job_at: Dict[int, str] = {}
+        self._status: Dict[str, JobStatus] = {}
+        self._all: List[int] = []
+        self._by_status: Dict[JobStatus, List[int]] = {status: [] for status in JobStatus}
+        # job ID -> sequence number of its latest change, least recent first
+        self._changes: "OrderedDict[str, int]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def add(self, job: Job):
+        """Index a new job (or re-index a known one) at the end of the order."""
+        if job.id in self._position:
+            self.update(job)
+            return
+        position = self._next_position
+        self._next_position += 1
+        self._position[job.id] = position
+        self._job_at[position] = job.id
+        self._status[job.id] = job.status
+        self._all.append(position)
+        self._by_status[job.status].append(position)
+
+    def update(self, job: Job):
+        """Move a job to the index of its current status."""
+        old = self._status.get(job.id)
+        if old is None:
+            self.add(job)
+            return
+        if old == job.status:
+            return
+        position = self._position[job.id]
+        _discard(self._by_status[old], position)
+        insort(self._by_status[job.status], position)
+        self._status[job.id] = job.status
+
+    def remove(self, job_id: str):
+        """Drop a job from every index."""
+        position = self._position.pop(job_id, None)
+        if position is None:
+            return
+        del self._job_at[position]
+        self._changes.pop(job_id, None)
+        _discard(self._all, position)
+        _discard(self._by_status[self._status.pop(job_id)], position)
+
+    def touch(self, job_id: str, seq: int):
+        """Record that a job changed at sequence number seq (seqs only increase)."""
+        self._changes.pop(job_id, None)
+        self._changes[job_id] = seq
+
+    def changed_since(self, seq: int) -> List[str]:
+        """IDs of jobs whose latest change is after seq, least recent first."""
+        changed = []
+        for job_id, changed_at in reversed(self._changes.items()):
+            if changed_at <= seq:
+                break
+            changed.append(job_id)
+        changed.reverse()
+        return changed
+
+    def count(self, *statuses: JobStatus) -> int:
+        """Jobs currently in any of the given statuses."""
+        return sum(len(self._by_status[status]) for status in statuses)
+
+    def counts(self) -> Dict[str, int]:
+        """Jobs per status."""
+        return {status.value: len(positions) for status, positions in self._by_status.items()}
+
+    def ids(self, *statuses: JobStatus) -> List[str]:
+        """IDs of jobs in the given statuses, oldest first."""
+        positions = heapq.merge(*(self._by_status[status] for status in statuses))
+        return [self._job_at[position] for position in positions]
+
+    def page(
+        self,
+        statuses: Iterable[JobStatus] = (),
+        cursor: Optional[int] = None,
+        limit: int = 100
+    ) -> Tuple[List[str], Optional[int]]:
+        """
+        Newest-first page of job IDs.
+
+        Args:
+            statuses: Only jobs in these statuses (all jobs if empty)
+            cursor: Return jobs that arrived before this position
+            limit: Maximum jobs returned
+
+        Returns:
+            (job IDs, cursor for the next page or None on the last page)
+        """
+        statuses = list(dict.fromkeys(statuses))
+        lists = [self._by_status[status] for status in statuses] if statuses else [self._all]
+        # Walk each sorted list backwards from the cursor, merging newest first
+        ends = [bisect_left(positions, cursor) if cursor is not None else len(positions) for positions in lists]
+        merged = heapq.merge(
+            *(_reversed_until(positions, end) for positions, end in zip(lists, ends)),
+            reverse=True
+        )
+
+        page = []
+        for position in merged:
+            if len(page) == limit:
+                # Something older remains
+                return [self._job_at[p] for p in page], page[-1]
+            page.append(position)
+        return [self._job_at[p] for p in page], None
+
+
+def _reversed_until(positions: List[int], end: int):
+    """positions[:end] newest first, without copying the list."""
+    for i in range(end - 1, -1, -1):
+        yield positions[i]
+
+
+def _discard(positions: List[int], position: int):
+    """Remove position from a sorted list, if present."""
+    i = bisect_left(positions, position)
+    if i < len(positions) and positions[i] == position:
+        del positions[i]
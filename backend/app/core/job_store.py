@@ -0,0 +1,121 @@
+"""Durable SQLite job store with batched writes."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..models import Job
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs (created_at);
+"""
+
+
+class JobStore:
+    """
+    Persists jobs to SQLite in WAL mode.
+
+    Updates are only marked dirty and written in one transaction per
+    flush interval, so frequent progress updates cost one fsync per
+    batch instead of one per update.
+    """
+
+    def __init__(self, path: Path, flush_interval: float = 1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._dirty: Dict[str, Job] = {}
+        self._flusher: Optional[asyncio.Task] = None
+
+    def open(self):
+        """Open the database and create the schema."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL only fsyncs at checkpoints; committed batches survive a process crash
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        print(f"Job store opened: {self.path}")
+
+    def load_all(self) -> List[Job]:
+        """Load every stored job, oldest first."""
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT data FROM jobs ORDER BY created_at"
+            ).fetchall()
+        jobs = []
+        for (data,) in rows:
+            try:
+                jobs.append(Job.model_validate_json(data))
+            except Exception as e:
+                print(f"Skipping unreadable stored job: {e}")
+        return jobs
+
+    def mark_dirty(self, job: Job):
+        """Schedule a job to be written with the next batch."""
+        self._dirty[job.id] = job
+
+    async def flush(self):
+        """Write all dirty jobs in a single transaction."""
+        if not self._dirty or self._conn is None:
+            return
+        batch = self._dirty
+        self._dirty = {}
+        # Serialize on the event loop so the thread never sees a job mid-update
+        rows = [
+            (job.id, job.status.value, job.created_at.isoformat(), time.time(), job.model_dump_json())
+            for job in batch.values()
+        ]
+        try:
+            await asyncio.to_thread(self._write, rows)
+        except Exception as e:
+            print(f"Error writing job batch: {e}")
+            # Keep the batch for the next attempt unless newer state replaced it
+            for job_id, job in batch.items():
+                self._dirty.setdefault(job_id, job)
+
+    def _write(self, rows):
+        """Upsert rows (runs in a thread)."""
+        with self._db_lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO jobs (id, status, created_at, updated_at, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+
+    async def _flush_loop(self):
+        """Flush dirty jobs every flush_interval seconds."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self):
+        """Start the background flusher."""
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        """Stop the flusher, write pending changes and close the database."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await self.flush()
+        if self._conn is not None:
+            with self._db_lock:
+                self._conn.close()
+            self._conn = None
@@ -34,6 +34,19 @@ def clean_llm_output(text: str) -> str:
     return text.strip()
 
 
+class LLMRequestError(Exception):
+    """An LLM request failed; retryable when a later attempt may succeed."""
+
+    def __init__(self, message: str, retryable: bool):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def is_retryable_status(status_code: int) -> bool:
+    """Rate limits and server errors pass; other HTTP errors repeat on retry."""
+    return status_code == 429 or status_code >= 500
+
+
 # Language name mapping
 LANGUAGE_NAMES = {
     "zh": "中文",
@@ -94,7 +107,12 @@ class BaseLLMProvider(ABC):
         model: Optional[str] = None,
         progress_callback: Optional[Callable[[str], None]] = None
     ) -> Optional[str]:
-        """Generate text using LLM."""
+        """
+        Generate text using LLM.
+
+        Raises LLMRequestError when the request fails (retryable for
+        timeouts, connection errors, 429 and 5xx responses).
+        """
         pass
 
 
@@ -111,7 +129,9 @@ class OllamaProvider(BaseLLMProvider):
             "url": self.config.get("base_url", "http://localhost:11434"),
             "enabled": self.config.get("enabled", True),
             "models_count": 0,
-            "error": None
+            "error": None,
+            # Whether the error may clear up by itself (server down or busy)
+            "retryable": False
         }
 
         try:
@@ -124,10 +144,13 @@ class OllamaProvider(BaseLLMProvider):
                     result["models_count"] = len(models)
                 else:
                     result["error"] = f"HTTP {response.status_code}"
+                    result["retryable"] = is_retryable_status(response.status_code)
         except httpx.ConnectError:
             result["error"] = "Cannot connect to Ollama service"
+            result["retryable"] = True
         except httpx.TimeoutException:
             result["error"] = "Connection timeout"
+            result["retryable"] = True
         except Exception as e:
             result["error"] = str(e)
 
@@ -171,7 +194,15 @@ class OllamaProvider(BaseLLMProvider):
                     return data.get("response", "")
                 else:
                     print(f"Ollama generate error: HTTP {response.status_code}")
-                    return None
+                    raise LLMRequestError(
+                        f"Ollama HTTP {response.status_code}",
+                        is_retryable_status(response.status_code)
+                    )
+        except LLMRequestError:
+            raise
+        except (httpx.TimeoutException, httpx.TransportError) as e:
+            print(f"Error generating text with Ollama: {e}")
+            raise LLMRequestError(f"Ollama unreachable: {e}", retryable=True)
         except Exception as e:
             print(f"Error generating text with Ollama: {e}")
             return None
@@ -206,7 +237,9 @@ class OpenRouterProvider(BaseLLMProvider):
         result = {
             "available": False,
             "enabled": bool(self.config.get("api_key")),
-            "error": None
+            "error": None,
+            # Whether the error may clear up by itself (server down or busy)
+            "retryable": False
         }
 
         api_key = self.config.get("api_key", "")
@@ -230,10 +263,13 @@ class OpenRouterProvider(BaseLLMProvider):
                     result["error"] = "Invalid API key"
                 else:
                     result["error"] = f"HTTP {response.status_code}"
+                    result["retryable"] = is_retryable_status(response.status_code)
         except httpx.ConnectError:
             result["error"] = "Cannot connect to OpenRouter"
+            result["retryable"] = True
         except httpx.TimeoutException:
             result["error"] = "Connection timeout"
+            result["retryable"] = True
         except Exception as e:
             result["error"] = str(e)
 
@@ -276,7 +312,7 @@ class OpenRouterProvider(BaseLLMProvider):
 
         if not api_key:
             print("OpenRouter API key not configured")
-            return None
+            raise LLMRequestError("OpenRouter API key not configured", retryable=False)
 
         try:
             async with httpx.AsyncClient(timeout=timeout) as client:
@@ -308,7 +344,15 @@ class OpenRouterProvider(BaseLLMProvider):
                         print(f"Error details: {error_data}")
                     except:
                         pass
-                    return None
+                    raise LLMRequestError(
+                        f"OpenRouter HTTP {response.status_code}",
+                        is_retryable_status(response.status_code)
+                    )
+        except LLMRequestError:
+            raise
+        except (httpx.TimeoutException, httpx.TransportError) as e:
+            print(f"Error generating text with OpenRouter: {e}")
+            raise LLMRequestError(f"OpenRouter unreachable: {e}", retryable=True)
         except Exception as e:
             print(f"Error generating text with OpenRouter: {e}")
             return None
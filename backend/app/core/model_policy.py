@@ -0,0 +1,120 @@
+"""Model lifecycle policy: warm-up at startup and unloading when idle."""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from .model_registry import model_registry
+from .transcription_engine import create_engine, resolve_engine_name
+from ..config import settings
+
+
+# Process start, for the time-to-ready metric
+STARTED_AT = time.time()
+
+# Longest wait between idle checks, in seconds
+MAX_CHECK_INTERVAL = 60
+
+
+class ModelPolicy:
+    """
+    Preloads and warms the configured engines' models, then unloads models
+    the registry has not used for idle_unload_minutes.
+
+    Until warm-up has finished the policy reports not ready, which the API
+    exposes for load balancers; a blocking start holds the caller (server
+    startup, or a worker node before it claims jobs) until then. A failed warm-up is logged and the process
+    reports ready anyway, so jobs load the model on demand as before.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.time_to_ready: Optional[float] = None
+        self.warmed: List[Dict[str, Any]] = []
+        self.errors: List[str] = []
+        self._evictor: Optional[asyncio.Task] = None
+        self._warmer: Optional[asyncio.Task] = None
+
+    def _engine_names(self) -> List[str]:
+        """Engines to warm: the configured list, or the default engine."""
+        names = settings["models"]["warm_up_engines"] or [None]
+        return list(dict.fromkeys(resolve_engine_name(name) for name in names))
+
+    async def warm_up(self):
+        """Load and warm each engine's model, then mark the process ready."""
+        for name in self._engine_names():
+            try:
+                start = time.time()
+                engine = await asyncio.to_thread(create_engine, name)
+                if await engine.warm_up():
+                    self.warmed.append({"engine": name, "seconds": round(time.time() - start, 2)})
+            except Exception as e:
+                print(f"Model warm-up failed for {name}: {e}")
+                self.errors.append(f"{name}: {e}")
+        self._mark_ready()
+
+    def _mark_ready(self):
+        """Record the time from process start to ready."""
+        self.ready = True
+        self.time_to_ready = time.time() - STARTED_AT
+        print(f"Ready after {self.time_to_ready:.1f}s")
+
+    async def start(self, block: bool = False, runs_models: bool = True):
+        """
+        Start warm-up and the idle unloader.
+
+        Args:
+            block: Return only once warm-up has finished
+            runs_models: False in a process that never transcribes, which
+                is ready straight away
+        """
+        config = settings["models"]
+        if not runs_models:
+            self._mark_ready()
+            return
+        if config["idle_unload_minutes"] > 0:
+            self._evictor = asyncio.create_task(self._evict_loop(config["idle_unload_minutes"] * 60))
+
+        if not config["warm_up"]:
+            self._mark_ready()
+        elif block:
+            await self.warm_up()
+        else:
+            self._warmer = asyncio.create_task(self.warm_up())
+
+    def stop(self):
+        """Stop background warm-up and unloading."""
+        for task in (self._warmer, self._evictor):
+            if task is not None:
+                task.cancel()
+        self._warmer = None
+        self._evictor = None
+
+    async def _evict_loop(self, max_idle_seconds: float):
+        """Unload models idle for max_idle_seconds."""
+        interval = min(MAX_CHECK_INTERVAL, max_idle_seconds / 2)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                evicted = await asyncio.to_thread(model_registry.evict_idle, max_idle_seconds)
+                for key in evicted:
+                    print(f"Unloaded idle model {key} after {max_idle_seconds / 60:.0f} min")
+            except Exception as e:
+                print(f"Error unloading idle models: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Readiness, warm-up timings and unload counters for /api/status."""
+        config = settings["models"]
+        return {
+            "ready": self.ready,
+            "time_to_ready_seconds": round(self.time_to_ready, 2) if self.time_to_ready is not None else None,
+            "warmed": self.warmed,
+            "errors": self.errors,
+            "idle_unload_minutes": config["idle_unload_minutes"],
+            "loads": model_registry.loads,
+            "evictions": model_registry.evictions
+        }
+
+
+# Global policy instance
+model_policy = ModelPolicy()
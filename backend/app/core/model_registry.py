@@ -0,0 +1,266 @@
+"""Process-wide registry of loaded Whisper models shared between workers."""
+
+import asyncio
+import gc
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config import settings
+from .autoscaler import cpu_count
+
+
+# (engine, model size, device, compute type)
+ModelKey = Tuple[str, str, str, str]
+
+# Seconds between cancel checks while waiting for an inference slot
+SLOT_POLL_SECONDS = 0.5
+
+# Fewest automatic slots per model: the two transcriptions the default
+# pipeline.transcribe_workers ran when each worker loaded its own model
+MIN_AUTO_INFERENCE_SLOTS = 2
+
+
+def get_max_concurrent_inference() -> int:
+    """Inference slots per model from settings (0 = cores / threads_per_inference)."""
+    config = settings["whisper"]
+    configured = config["max_concurrent_inference"]
+    if configured > 0:
+        return configured
+    threads = max(1, config["threads_per_inference"])
+    return max(MIN_AUTO_INFERENCE_SLOTS, cpu_count() // threads)
+
+
+class InferenceCancelled(Exception):
+    """Raised when a caller gives up waiting for an inference slot."""
+    pass
+
+
+class ModelHandle:
+    """A loaded model with its reference count and inference slots."""
+
+    def __init__(self, key: ModelKey, model: Any, max_concurrency: int):
+        self.key = key
+        self.model = model
+        self.refcount = 0
+        self.active = 0
+        self.load_seconds = 0.0
+        self.warmup_seconds: Optional[float] = None
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+        self.max_concurrency = max_concurrency
+        # Not bounded: add_slot() raises the count while the model is in use
+        self._semaphore = threading.Semaphore(max_concurrency)
+        self._lock = threading.Lock()
+
+    def add_slot(self):
+        """Allow one more concurrent inference on this model."""
+        with self._lock:
+            self.max_concurrency += 1
+        self._semaphore.release()
+
+    @contextmanager
+    def inference(
+        self,
+        cancelled: Optional[Callable[[], bool]] = None,
+        on_wait: Optional[Callable[[], None]] = None
+    ):
+        """
+        Hold one inference slot on this model (blocking, call from a thread).
+
+        Args:
+            cancelled: Checked while waiting for a slot; once it returns
+                True the wait is abandoned with InferenceCancelled
+            on_wait: Called once if no slot is free right away
+        """
+        if not self._semaphore.acquire(blocking=False):
+            if on_wait is not None:
+                on_wait()
+            while not self._semaphore.acquire(timeout=SLOT_POLL_SECONDS):
+                if cancelled is not None and cancelled():
+                    raise InferenceCancelled("Cancelled while waiting for an inference slot")
+        try:
+            with self._lock:
+                self.active += 1
+            try:
+                yield self.model
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.last_used = time.time()
+        finally:
+            self._semaphore.release()
+
+
+class ModelRegistry:
+    """Loads each model combination once and hands out shared references."""
+
+    def __init__(self, max_concurrency: int = 1):
+        self.max_concurrency = max(1, max_concurrency)
+        self._handles: Dict[ModelKey, ModelHandle] = {}
+        self._load_locks: Dict[ModelKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def acquire(self, key: ModelKey, loader: Callable[[], Any]) -> ModelHandle:
+        """
+        Get a shared handle for key, loading the model on first use.
+
+        Blocks while the model loads; concurrent callers for the same key
+        wait for a single load instead of loading their own copy.
+
+        Args:
+            key: (engine, model size, device, compute type)
+            loader: Callable returning the loaded model
+
+        Returns:
+            ModelHandle: Handle with its refcount incremented
+        """
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                handle = self._handles.get(key)
+
+            if handle is None:
+                print(f"Loading model {key}...")
+                start = time.time()
+                model = loader()
+                handle = ModelHandle(key, model, self.max_concurrency)
+                handle.load_seconds = time.time() - start
+                print(f"Model {key} loaded in {handle.load_seconds:.1f}s")
+                with self._lock:
+                    self._handles[key] = handle
+                    self.loads += 1
+
+            with self._lock:
+                handle.refcount += 1
+                handle.last_used = time.time()
+
+        return handle
+
+    async def acquire_async(self, key: ModelKey, loader: Callable[[], Any]) -> ModelHandle:
+        """Acquire a handle without blocking the event loop."""
+        return await asyncio.to_thread(self.acquire, key, loader)
+
+    def release(self, handle: ModelHandle):
+        """Drop a reference obtained from acquire."""
+        with self._lock:
+            if handle.refcount > 0:
+                handle.refcount -= 1
+            handle.last_used = time.time()
+
+    async def warm_up(
+        self,
+        key: ModelKey,
+        loader: Callable[[], Any],
+        infer: Callable[[Any], Any]
+    ) -> ModelHandle:
+        """
+        Load a model if needed and run one dummy inference on it.
+
+        The first real inference pays for lazy initialisation (CUDA kernels,
+        allocator growth, ...); doing it here keeps that out of the first job.
+
+        Args:
+            key: (engine, model size, device, compute type)
+            loader: Callable returning the loaded model
+            infer: Callable running a short inference on the model (blocking)
+
+        Returns:
+            ModelHandle: The warmed handle (not referenced)
+        """
+        handle = await self.acquire_async(key, loader)
+        try:
+            def run():
+                with handle.inference() as model:
+                    start = time.time()
+                    infer(model)
+                    handle.warmup_seconds = time.time() - start
+
+            await asyncio.to_thread(run)
+            print(f"Model {key} warmed up in {handle.warmup_seconds:.1f}s")
+            return handle
+        finally:
+            self.release(handle)
+
+    def unload(self, key: ModelKey) -> bool:
+        """Unload a model that no one references. Returns True if unloaded."""
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is None or handle.refcount > 0 or handle.active > 0:
+                return False
+            del self._handles[key]
+        handle.model = None
+        self._free_memory()
+        print(f"Model {key} unloaded")
+        return True
+
+    def evict_idle(self, max_idle_seconds: float) -> List[ModelKey]:
+        """Unload every unreferenced model unused for max_idle_seconds."""
+        now = time.time()
+        with self._lock:
+            idle = [
+                key for key, handle in self._handles.items()
+                if handle.refcount == 0 and handle.active == 0
+                and now - handle.last_used >= max_idle_seconds
+            ]
+        evicted = [key for key in idle if self.unload(key)]
+        with self._lock:
+            self.evictions += len(evicted)
+        return evicted
+
+    @staticmethod
+    def _free_memory():
+        """Return an unloaded model's memory to the OS / GPU."""
+        gc.collect()
+        torch = sys.modules.get("torch")
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def inference_slots(self) -> int:
+        """
+        Inferences that can run at once across the loaded models.
+
+        With nothing loaded yet this is one model's worth, since the first
+        job loads its model.
+        """
+        with self._lock:
+            slots = sum(handle.max_concurrency for handle in self._handles.values())
+        return slots or self.max_concurrency
+
+    def add_inference_slot(self):
+        """Allow one more concurrent inference on every model, loaded now or later."""
+        with self._lock:
+            self.max_concurrency += 1
+            handles = list(self._handles.values())
+        for handle in handles:
+            handle.add_slot()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Get a summary of loaded models."""
+        with self._lock:
+            handles = list(self._handles.values())
+        return [
+            {
+                "engine": h.key[0],
+                "model": h.key[1],
+                "device": h.key[2],
+                "compute_type": h.key[3],
+                "refcount": h.refcount,
+                "active": h.active,
+                "max_concurrency": h.max_concurrency,
+                "load_seconds": round(h.load_seconds, 2),
+                "warmup_seconds": round(h.warmup_seconds, 2) if h.warmup_seconds is not None else None,
+                "idle_seconds": round(time.time() - h.last_used, 1)
+            }
+            for h in handles
+        ]
+
+
+# Global registry instance
+model_registry = ModelRegistry(max_concurrency=get_max_concurrent_inference())
@@ -0,0 +1,332 @@
+"""Parallel transcription of a long file split on pauses across a process pool."""
+
+import asyncio
+import multiprocessing
+import os
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config import settings
+from .transcription_engine import (
+    AudioInput, BaseTranscriptionEngine, SAMPLE_RATE, describe_audio, get_audio_duration,
+    read_wav_range
+)
+from .text_formatter import format_segments_with_pauses
+
+
+# Energy frame and smoothing window used to locate pauses
+FRAME_SECONDS = 0.03
+SMOOTH_FRAMES = 10
+
+
+def _frame_energies(audio: AudioInput, frame_samples: int):
+    """Compute per-frame RMS energy, streaming WAV files in blocks."""
+    import numpy as np
+
+    if not isinstance(audio, str):
+        count = len(audio) // frame_samples
+        frames = audio[:count * frame_samples].reshape(count, frame_samples)
+        return np.sqrt(np.mean(frames ** 2, axis=1))
+
+    energies = []
+    block_frames = 2000
+    with wave.open(audio, 'rb') as wav:
+        while True:
+            data = wav.readframes(frame_samples * block_frames)
+            if not data:
+                break
+            samples = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+            count = len(samples) // frame_samples
+            if count == 0:
+                break
+            frames = samples[:count * frame_samples].reshape(count, frame_samples)
+            energies.append(np.sqrt(np.mean(frames ** 2, axis=1)))
+    return np.concatenate(energies) if energies else np.zeros(0, dtype=np.float32)
+
+
+def find_split_points(
+    audio: AudioInput,
+    chunk_seconds: float,
+    search_seconds: float
+) -> List[Tuple[int, int]]:
+    """
+    Split audio into chunks of roughly chunk_seconds, cutting at pauses.
+
+    Each cut is placed at the quietest point (smoothed frame energy)
+    within search_seconds of the target boundary, so chunks end between
+    words rather than mid-utterance.
+
+    Args:
+        audio: Path to 16 kHz mono WAV, or decoded PCM buffer
+        chunk_seconds: Target chunk length
+        search_seconds: How far from the target to look for a pause
+
+    Returns:
+        List of (start_sample, end_sample) ranges covering the file
+    """
+    import numpy as np
+
+    frame_samples = int(SAMPLE_RATE * FRAME_SECONDS)
+    energy = _frame_energies(audio, frame_samples)
+    total_samples = int(get_audio_duration(audio) * SAMPLE_RATE)
+
+    if len(energy) > SMOOTH_FRAMES:
+        kernel = np.ones(SMOOTH_FRAMES) / SMOOTH_FRAMES
+        energy = np.convolve(energy, kernel, mode='same')
+
+    chunk_frames = int(chunk_seconds / FRAME_SECONDS)
+    search_frames = int(search_seconds / FRAME_SECONDS)
+
+    cuts = [0]
+    target = chunk_frames
+    # Leave the tail in the last chunk rather than making a tiny one
+    while target + chunk_frames // 2 < len(energy):
+        lo = max(cuts[-1] + 1, target - search_frames)
+        hi = min(len(energy), target + search_frames)
+        cut = lo + int(np.argmin(energy[lo:hi]))
+        cuts.append(cut)
+        target = cut + chunk_frames
+
+    boundaries = [c * frame_samples for c in cuts] + [total_samples]
+    return [
+        (boundaries[i], boundaries[i + 1])
+        for i in range(len(boundaries) - 1)
+        if boundaries[i + 1] > boundaries[i]
+    ]
+
+
+# ============== Pool process side ==============
+
+_process_models: Dict[Tuple[str, str, str], Any] = {}
+
+
+def _init_process(threads: int):
+    """Limit intra-op threads so pool processes don't oversubscribe cores."""
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+
+def _get_process_model(engine: str, model_size: str, device: str):
+    """Load the engine's model once per pool process."""
+    key = (engine, model_size, device)
+    if key not in _process_models:
+        if engine == "faster-whisper":
+            from faster_whisper import WhisperModel
+            compute_type = "float16" if device == "cuda" else "int8"
+            _process_models[key] = WhisperModel(model_size, device=device, compute_type=compute_type)
+        else:
+            import whisper
+            _process_models[key] = whisper.load_model(model_size, device=device)
+    return _process_models[key]
+
+
+def transcribe_chunk(
+    engine: str,
+    model_size: str,
+    device: str,
+    audio: AudioInput,
+    start_sample: int,
+    end_sample: int,
+    language: Optional[str],
+    beam_size: Optional[int]
+) -> List[Dict[str, Any]]:
+    """
+    Transcribe one chunk in a pool process, returning absolute-time segments.
+
+    audio is either the WAV path (the chunk is read here) or the chunk's
+    samples already sliced out of an in-memory buffer.
+    """
+    model = _get_process_model(engine, model_size, device)
+    if isinstance(audio, str):
+        audio = read_wav_range(audio, start_sample, end_sample)
+    offset = start_sample / SAMPLE_RATE
+
+    if engine == "faster-whisper":
+        segments, _ = model.transcribe(audio, beam_size=beam_size or 5, language=language, task="transcribe")
+        raw = [{"text": s.text, "start": s.start, "end": s.end} for s in segments]
+    else:
+        result = model.transcribe(
+            audio, language=language, task="transcribe", beam_size=beam_size, verbose=None
+        )
+        raw = [
+            {"text": s["text"], "start": s["start"], "end": s["end"]}
+            for s in result.get("segments", [])
+        ]
+
+    return [
+        {"text": s["text"], "start": s["start"] + offset, "end": s["end"] + offset}
+        for s in raw
+    ]
+
+
+# ============== Event loop side ==============
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_pool_size() -> int:
+    """Number of pool processes from settings (0 = half the cores)."""
+    configured = settings["parallel"]["processes"]
+    return configured if configured > 0 else max(1, (os.cpu_count() or 2) // 2)
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Get the process-wide transcription pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        processes = get_pool_size()
+        threads = max(1, (os.cpu_count() or processes) // processes)
+        # spawn keeps CUDA and the event loop out of the children
+        _pool = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_process,
+            initargs=(threads,)
+        )
+        print(f"Parallel transcription pool started: {processes} processes x {threads} threads")
+    return _pool
+
+
+def shutdown_pool():
+    """Shut down the transcription pool if it was started."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        print("Parallel transcription pool stopped")
+
+
+def should_parallelize(audio: AudioInput) -> bool:
+    """Check whether audio is long enough to be split across the pool."""
+    config = settings["parallel"]
+    if not config["enabled"]:
+        return False
+    if isinstance(audio, str) and not audio.endswith(".wav"):
+        return False
+    try:
+        return get_audio_duration(audio) >= config["min_duration"]
+    except Exception as e:
+        print(f"Error reading WAV duration: {e}")
+        return False
+
+
+class ParallelTranscriber(BaseTranscriptionEngine):
+    """Map-reduce transcription: split on pauses, decode chunks in parallel, stitch."""
+
+    def __init__(self, engine: str, model_size: str, device: str, beam_size: Optional[int] = None):
+        self.name = engine
+        self.beam_size = beam_size
+        self.model_size = model_size
+        # Pool processes each load their own model, which only pays off on CPU
+        self.device = "cpu" if device == "auto" else device
+        self._cancel_flag = False
+
+    async def transcribe_with_progress(
+        self,
+        audio: AudioInput,
+        output_path: str,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        segment_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        slot_callback: Optional[Callable[[bool], None]] = None
+    ) -> bool:
+        """
+        Transcribe audio with progress tracking.
+
+        Args:
+            audio: Path to 16 kHz mono WAV, or decoded PCM buffer
+            output_path: Path to save transcript
+            progress_callback: Async callback(progress_percent, message)
+            segment_callback: Async callback(segment) for each decoded segment
+            slot_callback: Unused, pool processes load their own models
+
+        Returns:
+            bool: True if successful
+        """
+        futures = []
+        try:
+            config = settings["parallel"]
+            chunks = await asyncio.to_thread(
+                find_split_points,
+                audio,
+                config["chunk_seconds"],
+                config["search_seconds"]
+            )
+            print(f"Split {describe_audio(audio)} into {len(chunks)} chunks")
+
+            if progress_callback:
+                await progress_callback(5, f"Split audio into {len(chunks)} chunks")
+
+            loop = asyncio.get_running_loop()
+            pool = get_pool()
+            futures = [
+                loop.run_in_executor(
+                    pool,
+                    transcribe_chunk,
+                    self.name,
+                    self.model_size,
+                    self.device,
+                    audio if isinstance(audio, str) else audio[start:end],
+                    start,
+                    end,
+                    None,
+                    self.beam_size
+                )
+                for start, end in chunks
+            ]
+
+            # Chunks finish out of order; stream segments once all earlier chunks are in
+            results: Dict[int, List[Dict[str, Any]]] = {}
+            next_chunk = 0
+            pending = set(futures)
+            while pending:
+                finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if self._cancel_flag:
+                    raise Exception("Transcription cancelled")
+                for future in finished:
+                    results[futures.index(future)] = future.result()
+
+                while next_chunk in results:
+                    if segment_callback:
+                        for segment in results[next_chunk]:
+                            await segment_callback(segment)
+                    next_chunk += 1
+
+                if progress_callback:
+                    await progress_callback(
+                        5 + len(results) / len(chunks) * 90,
+                        f"Transcribing: chunk {len(results)}/{len(chunks)}"
+                    )
+
+            segments = [segment for i in range(len(chunks)) for segment in results[i]]
+            transcription = format_segments_with_pauses(segments)
+            Path(output_path).write_text(transcription, encoding='utf-8')
+
+            if progress_callback:
+                await progress_callback(100, "Transcription complete")
+
+            print(f"Transcription saved: {output_path}")
+            return True
+
+        except Exception as e:
+            print(f"Parallel transcription error: {e}")
+            return False
+
+        finally:
+            # Chunks not yet started are dropped on error or cancellation
+            for future in futures:
+                future.cancel()
+
+    def cancel(self):
+        """Cancel transcription."""
+        self._cancel_flag = True
+        print("Transcription cancellation requested")
+
+    def profile(self):
+        """Parallel runs are recorded separately; their speed scales with the pool."""
+        return (f"{self.name}+parallel", self.model_size, self.device)
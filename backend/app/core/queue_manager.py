@@ -1,21 +1,58 @@
 """Queue manager for job processing."""
 
 import asyncio
-from typing import Dict, Optional, List
+import time
+from typing import Any, Dict, Iterable, Optional, List, Tuple
 from uuid import uuid4
 from datetime import datetime
-from ..models import Job, JobStatus, ProgressUpdate
+from ..models import Job, JobStatus, MediaInfo, ProgressUpdate
 from ..utils.websocket_manager import WebSocketManager
+from .job_store import JobStore
+from .job_index import JobIndex
+from .broker import JobBroker
+from .scheduler import JobScheduler
+from .admission import admission
+from ..config import settings
+
+# Statuses a job never leaves
+TERMINAL_STATUSES = {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}
+UNFINISHED_STATUSES = [status for status in JobStatus if status not in TERMINAL_STATUSES]
 
 
 class QueueManager:
     """Manages job queue and state."""
 
-    def __init__(self, max_workers: int = 2):
-        self.job_queue: asyncio.Queue = asyncio.Queue()
+    def __init__(
+        self,
+        max_workers: int = 2,
+        store: Optional[JobStore] = None,
+        broker: Optional[JobBroker] = None
+    ):
+        scheduler_config = settings["scheduler"]
+        self.job_queue = JobScheduler(
+            policy=scheduler_config["policy"],
+            aging_rate=scheduler_config["aging_rate"],
+            priority_weight=scheduler_config["priority_weight"]
+        )
         self.jobs: Dict[str, Job] = {}
+        # Arrival order and per-status indexes over self.jobs
+        self.index = JobIndex()
+        # Change sequence number, bumped on every job update. Seeded from the
+        # clock in ms so it keeps increasing across restarts even when the
+        # last updates before a shutdown were never persisted.
+        self.seq = int(time.time() * 1000)
+        # Segments decoded so far for jobs still transcribing
+        self.segments: Dict[str, List[Dict[str, Any]]] = {}
+        # Worker currently running each job, so cancel_job() can interrupt it
+        self.active: Dict[str, Any] = {}
+        # Idempotency-Key -> job ID, so retried uploads map to one job
+        self.idempotency_keys: Dict[str, str] = {}
         self.max_workers = max_workers
         self.websocket_manager = WebSocketManager()
+        self.store = store
+        # Shared broker when jobs run on separate worker nodes
+        self.broker = broker
+        self._relay: Optional[asyncio.Task] = None
 
     async def add_job(
         self,
@@ -23,10 +60,16 @@ class QueueManager:
         file_size: int,
         video_path: str,
         target_language: Optional[str] = None,
-        llm_model: Optional[str] = None
+        llm_model: Optional[str] = None,
+        engine: Optional[str] = None,
+        media: Optional[MediaInfo] = None,
+        priority: int = 0,
+        idempotency_key: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        job_id: Optional[str] = None
     ) -> Job:
-        """Add a new job to the queue."""
-        job_id = str(uuid4())
+        """Add a new job to the queue (job_id is generated unless given)."""
+        job_id = job_id or str(uuid4())
         job = Job(
             id=job_id,
             filename=filename,
@@ -38,6 +81,8 @@ class QueueManager:
             completed_at=None,
             error_message=None,
             video_path=video_path,
+            media=media,
+            priority=priority,
             audio_path=None,
             transcript_path=None,
             transcript_raw_path=None,
@@ -45,13 +90,25 @@ class QueueManager:
             llm_model=llm_model,
             llm_model_used=None,
             llm_processing_skipped=False,
-            detected_language=None
+            detected_language=None,
+            engine=engine,
+            engine_used=None,
+            idempotency_key=idempotency_key,
+            content_hash=content_hash
         )
+        job.estimated_completion_at = admission.estimate_completion(job, self.get_unfinished_jobs())
 
         self.jobs[job_id] = job
-        await self.job_queue.put(job_id)
+        self.index.add(job)
+        if idempotency_key:
+            self.idempotency_keys[idempotency_key] = job_id
+        if self.store:
+            # Persist before acknowledging the upload
+            self.store.mark_dirty(job)
+            await self.store.flush()
+        await self.enqueue(job)
         await self.broadcast_update(job)
-        print(f"Job {job_id} added to queue: {filename} (target_language={target_language}, llm_model={llm_model})")
+        print(f"Job {job_id} added to queue: {filename} (target_language={target_language}, llm_model={llm_model}, engine={engine})")
         return job
 
     async def update_job_progress(
@@ -67,19 +124,238 @@ class QueueManager:
             return
 
         job = self.jobs[job_id]
+        # Late updates from a stage that is still winding down must not revive the job
+        if job.status == JobStatus.CANCELLED:
+            return
+        if job.started_at is None and status not in (JobStatus.QUEUED, JobStatus.CANCELLED):
+            job.started_at = datetime.now()
         job.status = status
+        self.index.update(job)
         job.progress = progress
         job.current_stage = current_stage
 
         if status == JobStatus.COMPLETED:
             job.completed_at = datetime.now()
-        elif status == JobStatus.FAILED:
+            job.estimated_completion_at = job.completed_at
+            job.eta_seconds = 0.0
+            admission.record_completion(job)
+        elif status in TERMINAL_STATUSES:
+            job.estimated_completion_at = None
+            job.eta_seconds = None
+
+        if status == JobStatus.FAILED:
             job.error_message = message
 
+        if self.store:
+            self.store.mark_dirty(job)
         await self.broadcast_update(job)
 
+    async def cancel_job(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a job: drop it from the queue, or interrupt the worker running it.
+
+        Returns:
+            The job (unchanged if it had already finished), or None if unknown
+        """
+        job = self.jobs.get(job_id)
+        if not job or job.status in TERMINAL_STATUSES:
+            return job
+
+        self.job_queue.remove(job_id)
+        if self.broker:
+            # The node running it sees the flag at its next lease check
+            await asyncio.to_thread(self.broker.cancel, job_id)
+        await self.update_job_progress(
+            job_id,
+            JobStatus.CANCELLED,
+            job.progress,
+            "Cancelled",
+            "Cancelled by user"
+        )
+        self.clear_segments(job_id)
+
+        worker = self.active.get(job_id)
+        if worker is not None:
+            worker.cancel_current()
+        print(f"Job {job_id} cancelled")
+        return job
+
+    def find_by_idempotency_key(self, key: Optional[str]) -> Optional[Job]:
+        """Job created by an earlier upload with the same Idempotency-Key."""
+        job_id = self.idempotency_keys.get(key) if key else None
+        return self.jobs.get(job_id) if job_id else None
+
+    def idempotency_key_pending(self, key: Optional[str]) -> bool:
+        """Whether an upload holding this Idempotency-Key is still creating its job."""
+        job_id = self.idempotency_keys.get(key) if key else None
+        return job_id is not None and job_id not in self.jobs
+
+    def reserve_idempotency_key(self, key: Optional[str], job_id: str) -> bool:
+        """
+        Claim an Idempotency-Key for a job about to be created.
+
+        Call it without awaiting in between the lookup, so two uploads with
+        the same key cannot both go on to create a job. Returns False if
+        another upload already holds the key.
+        """
+        if not key:
+            return True
+        if key in self.idempotency_keys:
+            return False
+        self.idempotency_keys[key] = job_id
+        return True
+
+    def release_idempotency_key(self, key: Optional[str], job_id: str):
+        """Drop a reservation whose job was never created (no-op once it was)."""
+        if key and self.idempotency_keys.get(key) == job_id and job_id not in self.jobs:
+            del self.idempotency_keys[key]
+
+    def set_active(self, job_id: str, worker):
+        """Record the worker running a job."""
+        self.active[job_id] = worker
+
+    def clear_active(self, job_id: str):
+        """Forget the worker running a job."""
+        self.active.pop(job_id, None)
+
+    def is_cancelled(self, job_id: str) -> bool:
+        """Check whether a job was cancelled."""
+        job = self.jobs.get(job_id)
+        return job is not None and job.status == JobStatus.CANCELLED
+
+    async def enqueue(self, job: Job, enqueued_at: Optional[float] = None):
+        """Queue a job locally, or on the broker for worker nodes to claim."""
+        if self.broker:
+            rank = self.job_queue.rank(job, enqueued_at if enqueued_at is not None else time.time())
+            await asyncio.to_thread(self.broker.enqueue, job, rank)
+        else:
+            await self.job_queue.put(job, enqueued_at)
+
+    async def requeue(self, job: Job, current_stage: str, enqueued_at: Optional[float] = None):
+        """Put an interrupted job back in the queue; transcription resumes from its checkpoint."""
+        job.status = JobStatus.QUEUED
+        self.index.update(job)
+        job.progress = 0.0
+        job.started_at = None
+        job.current_stage = current_stage
+        if self.store:
+            self.store.mark_dirty(job)
+        await self.enqueue(job, enqueued_at)
+        await self.broadcast_update(job)
+
+    async def start(self):
+        """Open the job store, restore history and requeue unfinished jobs."""
+        if self.broker:
+            await asyncio.to_thread(self.broker.open)
+            self._relay = asyncio.create_task(
+                self._relay_loop(settings["broker"]["poll_interval"])
+            )
+        if not self.store:
+            return
+
+        await asyncio.to_thread(self.store.open)
+        stored = await asyncio.to_thread(self.store.load_all)
+        requeued = 0
+        for job in sorted(stored, key=lambda job: job.seq):
+            self.index.touch(job.id, job.seq)
+        self.seq = max([self.seq] + [job.seq for job in stored])
+        for job in stored:
+            self.jobs[job.id] = job
+            self.index.add(job)
+            if job.idempotency_key:
+                self.idempotency_keys[job.idempotency_key] = job.id
+            if job.status in TERMINAL_STATUSES:
+                continue
+            # Keep the original arrival time so recovered jobs keep their aging credit
+            await self.requeue(
+                job,
+                "Queued (recovered after restart)",
+                enqueued_at=job.created_at.timestamp()
+            )
+            requeued += 1
+
+        self.store.start()
+        print(f"Restored {len(stored)} jobs from store, requeued {requeued}")
+
+    async def shutdown(self):
+        """Write pending job updates and close the store."""
+        if self._relay is not None:
+            self._relay.cancel()
+            self._relay = None
+        if self.store:
+            await self.store.close()
+        if self.broker:
+            self.broker.close()
+
+    async def _relay_loop(self, interval: float = 0.5):
+        """Apply updates published by worker nodes and fan them out to clients."""
+        seq = 0
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                events = await asyncio.to_thread(self.broker.events_after, seq)
+                for seq, job_id, message in events:
+                    await self.apply_remote_update(job_id, message)
+                if events:
+                    await asyncio.to_thread(self.broker.prune_events, seq)
+            except Exception as e:
+                print(f"Error relaying worker node updates: {e}")
+
+    async def apply_remote_update(self, job_id: str, message: Dict[str, Any]):
+        """Apply one job update or segment published by a worker node."""
+        if self.is_cancelled(job_id):
+            return
+
+        if message.get("type") == "segment":
+            segments = self.segments.setdefault(job_id, [])
+            # A resumed run replays from index 0; drop what it replaces
+            del segments[message["index"]:]
+            segments.append({key: message[key] for key in ("index", "text", "start", "end")})
+            await self.websocket_manager.broadcast(message)
+            return
+
+        job = Job.model_validate(message)
+        if job_id not in self.jobs:
+            return
+        self.jobs[job_id] = job
+        self.index.update(job)
+        if job.status in TERMINAL_STATUSES or job.segments_path:
+            self.clear_segments(job_id)
+        if job.status == JobStatus.COMPLETED:
+            admission.record_completion(job)
+        if self.store:
+            self.store.mark_dirty(job)
+        await self.broadcast_update(job)
+
+    async def add_segment(self, job_id: str, segment: Dict[str, Any]):
+        """Record a decoded segment and push it to WebSocket clients."""
+        if self.is_cancelled(job_id):
+            return
+        segments = self.segments.setdefault(job_id, [])
+        entry = {
+            "index": len(segments),
+            "text": segment["text"],
+            "start": segment["start"],
+            "end": segment["end"]
+        }
+        segments.append(entry)
+        await self.websocket_manager.broadcast({"type": "segment", "job_id": job_id, **entry})
+
+    def get_segments(self, job_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Get segments decoded so far for an active job."""
+        return self.segments.get(job_id)
+
+    def clear_segments(self, job_id: str):
+        """Drop a job's in-memory segments once they are saved to disk."""
+        self.segments.pop(job_id, None)
+
     async def broadcast_update(self, job: Job):
-        """Broadcast job update to all WebSocket clients."""
+        """Stamp a job update with the next change sequence number and broadcast it."""
+        self.seq += 1
+        job.seq = self.seq
+        self.index.touch(job.id, job.seq)
+        if self.store:
+            self.store.mark_dirty(job)
         await self.websocket_manager.broadcast(job.model_dump(mode='json'))
 
     def get_job(self, job_id: str) -> Optional[Job]:
@@ -90,6 +366,63 @@ class QueueManager:
         """Get all jobs."""
         return list(self.jobs.values())
 
+    def get_jobs(
+        self,
+        statuses: Iterable[JobStatus] = (),
+        cursor: Optional[int] = None,
+        limit: int = 100
+    ) -> Tuple[List[Job], Optional[int]]:
+        """Newest-first page of jobs, optionally filtered by status (see JobIndex.page)."""
+        job_ids, next_cursor = self.index.page(statuses, cursor, limit)
+        return [self.jobs[job_id] for job_id in job_ids], next_cursor
+
+    def get_changes(
+        self,
+        since: int,
+        statuses: Iterable[JobStatus] = (),
+        limit: Optional[int] = None
+    ) -> Tuple[List[Job], int]:
+        """
+        Jobs changed after sequence number since, in change order.
+
+        Returns:
+            (jobs, sequence number to pass as since next time)
+        """
+        statuses = set(statuses)
+        jobs = [
+            self.jobs[job_id] for job_id in self.index.changed_since(since)
+            if not statuses or self.jobs[job_id].status in statuses
+        ]
+        if limit is not None and len(jobs) > limit:
+            jobs = jobs[:limit]
+            return jobs, jobs[-1].seq
+        return jobs, self.seq
+
+    def get_unfinished_jobs(self) -> List[Job]:
+        """Jobs that are queued or running, oldest first."""
+        return [self.jobs[job_id] for job_id in self.index.ids(*UNFINISHED_STATUSES)]
+
+    def status_counts(self) -> Dict[str, int]:
+        """Number of jobs in each status."""
+        return self.index.counts()
+
+    def adopt_job(self, job: Job):
+        """Track a job created elsewhere (e.g. claimed from the broker)."""
+        self.jobs[job.id] = job
+        self.index.add(job)
+
+    def drop_job(self, job_id: str):
+        """Forget a job."""
+        self.jobs.pop(job_id, None)
+        self.index.remove(job_id)
+
+    def get_queue_position(self, job_id: str) -> Optional[int]:
+        """0-based position of a queued job in scheduling order."""
+        order = self.job_queue.snapshot()
+        return order.index(job_id) if job_id in order else None
+
     def get_queue_size(self) -> int:
         """Get current queue size."""
+        if self.broker:
+            return self.index.count(JobStatus.QUEUED)
         return self.job_queue.qsize()
@@ -0,0 +1,51 @@
+"""Per-stage retry policies with exponential backoff."""
+
+import random
+from typing import Optional
+
+from ..config import settings
+
+
+class PermanentError(Exception):
+    """A stage failure retrying cannot fix (missing input, unsupported media, ...)."""
+    pass
+
+
+# Failures that are never transient
+PERMANENT_ERRORS = (PermanentError, FileNotFoundError, ImportError, NotImplementedError)
+
+
+class RetryPolicy:
+    """
+    How often a stage is retried and how long to wait between attempts.
+
+    The wait before attempt n+1 is base_delay * 2^(n-1), capped at
+    max_delay, with +/-20% jitter so jobs that failed together (e.g. an
+    LLM server restart) do not retry in lockstep.
+    """
+
+    def __init__(self, max_attempts: int, base_delay: float, max_delay: float):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def for_stage(cls, stage: str) -> "RetryPolicy":
+        """Policy configured for a pipeline stage."""
+        config = settings["retry"].get(stage) or {}
+        return cls(
+            max_attempts=config.get("max_attempts", 1),
+            base_delay=config.get("base_delay", 5),
+            max_delay=config.get("max_delay", 60)
+        )
+
+    def should_retry(self, attempt: int, error: Exception) -> bool:
+        """Whether a failed attempt (1-based) gets another try."""
+        return attempt < self.max_attempts and not isinstance(error, PERMANENT_ERRORS)
+
+    def delay(self, attempt: int, jitter: Optional[float] = None) -> float:
+        """Seconds to wait after failed attempt (1-based)."""
+        base = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        if jitter is None:
+            jitter = random.uniform(-0.2, 0.2)
+        return max(0.0, base * (1 + jitter))
@@ -0,0 +1,99 @@
+"""Duration-aware job scheduling (shortest-job-first with aging)."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ..config import settings
+from ..models import Job
+
+
+# Rough LLM stage cost in seconds, added when formatting/translation is requested
+LLM_STAGE_COST = 60.0
+
+
+def estimate_cost(job: Job) -> float:
+    """Estimated processing cost of a job in seconds."""
+    duration = job.media.duration if job.media else 0.0
+    cost = duration * settings["scheduler"]["cost_per_media_second"]
+    if job.target_language and job.llm_model:
+        cost += LLM_STAGE_COST
+    return cost
+
+
+class JobScheduler:
+    """
+    Priority queue of job IDs with the asyncio.Queue get/put/qsize API.
+
+    With the "sjf" policy a job's rank is
+
+        estimated_cost - priority * priority_weight + aging_rate * enqueued_at
+
+    Lower runs first. Because every waiting job ages at the same rate the
+    rank is fixed at enqueue time, so a heap is enough: each second a job
+    waits is worth aging_rate seconds of cost against later arrivals, and
+    a long job can only be overtaken by jobs arriving within
+    cost / aging_rate seconds of it. The "fifo" policy ranks by priority,
+    then arrival.
+    """
+
+    def __init__(
+        self,
+        policy: str = "sjf",
+        aging_rate: float = 1.0,
+        priority_weight: float = 600.0
+    ):
+        self.policy = policy
+        self.aging_rate = aging_rate
+        self.priority_weight = priority_weight
+        self._heap: List[Tuple[float, int, str]] = []
+        self._ranks: Dict[str, float] = {}
+        self._counter = itertools.count()
+        self._not_empty = asyncio.Condition()
+
+    def rank(self, job: Job, enqueued_at: float) -> float:
+        """Rank of a job; lower is scheduled first."""
+        if self.policy == "fifo":
+            # Priority dominates, arrival order breaks ties
+            return -job.priority * 1e12 + enqueued_at
+        return (
+            estimate_cost(job)
+            - job.priority * self.priority_weight
+            + self.aging_rate * enqueued_at
+        )
+
+    async def put(self, job: Job, enqueued_at: Optional[float] = None):
+        """Enqueue a job; enqueued_at defaults to now (epoch seconds)."""
+        if enqueued_at is None:
+            enqueued_at = time.time()
+        rank = self.rank(job, enqueued_at)
+        async with self._not_empty:
+            self._ranks[job.id] = rank
+            heapq.heappush(self._heap, (rank, next(self._counter), job.id))
+            self._not_empty.notify()
+
+    async def get(self) -> str:
+        """Wait for and remove the best-ranked job ID."""
+        async with self._not_empty:
+            while True:
+                while self._heap:
+                    rank, _, job_id = heapq.heappop(self._heap)
+                    # Skip entries removed or re-ranked since they were pushed
+                    if self._ranks.get(job_id) == rank:
+                        del self._ranks[job_id]
+                        return job_id
+                await self._not_empty.wait()
+
+    def remove(self, job_id: str) -> bool:
+        """Drop a queued job. Returns True if it was waiting."""
+        return self._ranks.pop(job_id, None) is not None
+
+    def qsize(self) -> int:
+        """Number of jobs waiting."""
+        return len(self._ranks)
+
+    def snapshot(self) -> List[str]:
+        """Waiting job IDs in the order they would be scheduled."""
+        return [job_id for _, job_id in sorted((r, j) for j, r in self._ranks.items())]
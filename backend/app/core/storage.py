@@ -0,0 +1,118 @@
+"""Storage layout: job-id keyed working files and content-addressed uploads."""
+
+import os
+import shutil
+import time
+from pathlib import Path
+from uuid import uuid4
+
+
+UPLOAD_DIR = Path("storage/uploads")
+# One copy of each distinct upload, named by its SHA-256
+BLOB_DIR = UPLOAD_DIR / "blobs"
+# Uploads received but not yet accepted as a job
+INCOMING_DIR = UPLOAD_DIR / "incoming"
+AUDIO_DIR = Path("storage/audio")
+TRANSCRIPT_DIR = Path("storage/transcripts")
+
+STORAGE_DIRS = (UPLOAD_DIR, BLOB_DIR, INCOMING_DIR, AUDIO_DIR, TRANSCRIPT_DIR)
+
+# Incoming files older than this are leftovers of interrupted requests
+INCOMING_TTL_SECONDS = 24 * 3600
+
+
+def temp_path(path: Path) -> Path:
+    """Unique hidden sibling of path to write into before renaming over it."""
+    # Keep the suffix, FFmpeg picks the output format from it
+    return path.with_name(f".{path.stem}.{uuid4().hex[:8]}.tmp{path.suffix}")
+
+
+def incoming_path(filename: str) -> Path:
+    """Fresh path for an upload being received, keeping its extension."""
+    return INCOMING_DIR / f"{uuid4().hex}{Path(filename).suffix.lower()}"
+
+
+def blob_path(content_hash: str) -> Path:
+    """
+    Content-addressed location of an upload.
+
+    Keyed by the hash alone, so the same bytes uploaded as clip.mp4 and
+    clip.MOV share one blob; the job's hardlink keeps the extension.
+    """
+    return BLOB_DIR / content_hash[:2] / content_hash
+
+
+def upload_file(job_id: str, filename: str) -> Path:
+    """Where a job's upload lives, under its original name."""
+    return UPLOAD_DIR / job_id / Path(filename).name
+
+
+def audio_file(job_id: str) -> Path:
+    """Where a job's extracted audio is written."""
+    return AUDIO_DIR / f"{job_id}.wav"
+
+
+def transcript_file(job_id: str, name: str) -> Path:
+    """A job's transcript output (raw_transcript.txt, segments.json, transcript.txt)."""
+    return TRANSCRIPT_DIR / job_id / name
+
+
+def atomic_write_text(path: Path, text: str):
+    """Write text so readers see either the old file or the complete new one."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = temp_path(path)
+    try:
+        tmp_path.write_text(text, encoding='utf-8')
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def store_upload(incoming: Path, content_hash: str, job_id: str, filename: str) -> Path:
+    """
+    Move an accepted upload into the blob store and link it under the job.
+
+    An upload whose content is already stored is dropped and the job gets
+    a hardlink to the existing blob, so identical uploads share one copy
+    on disk. Filesystems without hardlinks get a private copy instead.
+
+    Returns:
+        Path of the job's upload
+    """
+    blob = blob_path(content_hash)
+    blob.parent.mkdir(parents=True, exist_ok=True)
+    if blob.exists():
+        incoming.unlink(missing_ok=True)
+        print(f"Upload {filename} deduplicated against {blob.name}")
+    else:
+        # Two identical uploads racing here both rename identical bytes
+        os.replace(incoming, blob)
+
+    destination = upload_file(job_id, filename)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(blob, destination)
+    except OSError:
+        tmp_path = temp_path(destination)
+        try:
+            shutil.copyfile(blob, tmp_path)
+            os.replace(tmp_path, destination)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    return destination
+
+
+def clean_incoming():
+    """Remove uploads left in incoming/ by requests that never finished."""
+    if not INCOMING_DIR.exists():
+        return
+    cutoff = time.time() - INCOMING_TTL_SECONDS
+    for path in INCOMING_DIR.iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
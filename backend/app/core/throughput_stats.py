@@ -0,0 +1,108 @@
+"""Rolling per-stage processing speed, used for progress and ETA estimates."""
+
+import json
+import os
+import statistics
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+STATS_PATH = Path("storage/stats/throughput.json")
+
+# Samples kept per key
+WINDOW = 20
+
+# Media seconds per wall-clock second assumed before anything was measured
+DEFAULT_SPEEDS = {
+    "extract": 100.0,
+    "transcribe": 1.0,
+    "llm": 30.0
+}
+
+# (engine or tool, model, device)
+Profile = Tuple[str, str, str]
+
+
+class ThroughputStats:
+    """
+    Speed samples (media seconds processed per wall-clock second) keyed by
+    stage, engine, model and device, persisted as a small JSON file.
+
+    Lookups fall back from the exact key to the same engine and model on
+    any device, then to every sample of the stage, then to a default, so
+    a new device or model starts from the closest measurement available.
+    """
+
+    def __init__(self, path: Path, window: int = WINDOW):
+        self.path = path
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Optional[Dict[str, List[float]]] = None
+
+    @staticmethod
+    def _key(stage: str, profile: Profile) -> str:
+        return "/".join([stage, *[part or "" for part in profile]])
+
+    def _load(self) -> Dict[str, List[float]]:
+        """Load samples from disk on first use."""
+        if self._samples is None:
+            self._samples = {}
+            if self.path.exists():
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        self._samples = json.load(f)
+                except Exception as e:
+                    print(f"Error loading throughput stats: {e}")
+        return self._samples
+
+    def _save(self):
+        """Write samples atomically."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._samples, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving throughput stats: {e}")
+
+    def record(self, stage: str, profile: Profile, media_seconds: float, wall_seconds: float):
+        """Add a speed sample for one completed stage run."""
+        if media_seconds <= 0 or wall_seconds <= 0:
+            return
+        with self._lock:
+            samples = self._load().setdefault(self._key(stage, profile), [])
+            samples.append(media_seconds / wall_seconds)
+            del samples[:-self.window]
+            self._save()
+
+    def speed(self, stage: str, profile: Profile) -> float:
+        """Median speed for the closest matching key."""
+        with self._lock:
+            samples = self._load()
+            exact = samples.get(self._key(stage, profile))
+            if exact:
+                return statistics.median(exact)
+            engine, model, _ = profile
+            for prefix in (f"{stage}/{engine}/{model}/", f"{stage}/"):
+                matched = [value for key, values in samples.items() if key.startswith(prefix) for value in values]
+                if matched:
+                    return statistics.median(matched)
+        return DEFAULT_SPEEDS.get(stage, 1.0)
+
+    def estimate(self, stage: str, profile: Profile, media_seconds: float) -> float:
+        """Predicted wall-clock seconds for a stage over media_seconds of media."""
+        return media_seconds / self.speed(stage, profile)
+
+    def stats(self) -> Dict[str, Any]:
+        """Median speed and sample count per key."""
+        with self._lock:
+            return {
+                key: {"speed": round(statistics.median(values), 3), "samples": len(values)}
+                for key, values in self._load().items() if values
+            }
+
+
+# Global stats instance
+throughput_stats = ThroughputStats(STATS_PATH)
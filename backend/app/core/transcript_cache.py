@@ -0,0 +1,193 @@
+"""Content-addressed transcript cache with size-bounded LRU eviction."""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..config import settings
+
+
+CACHE_ROOT = Path("storage/cache")
+INDEX_FILE = "index.json"
+
+
+def hash_file(path: str, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def make_key(*parts: Any) -> str:
+    """Build a cache key from the content hash and the decoding parameters."""
+    return hashlib.sha256(
+        json.dumps(parts, sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
+
+
+class TranscriptCache:
+    """
+    Stores transcription results under storage/cache/<key>/.
+
+    Each entry holds named text files (segments.json, raw.txt, final.txt)
+    plus a meta.json. Entries are evicted least-recently-used first once
+    the total size or entry count exceeds its limits.
+    """
+
+    def __init__(self, root: Path, max_bytes: int, max_entries: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # key -> size in bytes
+        self._loaded = False
+
+    def _load_index(self):
+        """Load the LRU index from disk on first use."""
+        if self._loaded:
+            return
+        self._loaded = True
+        index_path = self.root / INDEX_FILE
+        if index_path.exists():
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    for key, size in json.load(f):
+                        if (self.root / key).is_dir():
+                            self._index[key] = size
+            except Exception as e:
+                print(f"Error loading transcript cache index: {e}")
+
+    def _save_index(self):
+        """Persist the LRU order (oldest first)."""
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.root / (INDEX_FILE + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(list(self._index.items()), f)
+            os.replace(tmp_path, self.root / INDEX_FILE)
+        except Exception as e:
+            print(f"Error saving transcript cache index: {e}")
+
+    def get(self, key: str, count: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Look up an entry and mark it most recently used.
+
+        Args:
+            key: Cache key
+            count: Count the hit or miss; callers trying several keys for
+                one lookup pass False and call record_lookup once
+
+        Returns:
+            Dict with 'meta' and 'files' (name -> text), or None on a miss
+        """
+        with self._lock:
+            self._load_index()
+            if key not in self._index:
+                if count:
+                    self.misses += 1
+                return None
+
+            entry_dir = self.root / key
+            try:
+                meta = json.loads((entry_dir / "meta.json").read_text(encoding='utf-8'))
+                files = {
+                    name: (entry_dir / name).read_text(encoding='utf-8')
+                    for name in meta.get("files", [])
+                }
+            except Exception as e:
+                print(f"Dropping unreadable cache entry {key}: {e}")
+                self._remove(key)
+                if count:
+                    self.misses += 1
+                return None
+
+            self._index.move_to_end(key)
+            if count:
+                self.hits += 1
+            self._save_index()
+            return {"meta": meta, "files": files}
+
+    def record_lookup(self, hit: bool):
+        """Count the outcome of a lookup made with get(..., count=False)."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def put(self, key: str, files: Dict[str, str], meta: Optional[Dict[str, Any]] = None):
+        """Store an entry atomically, then evict down to the limits."""
+        with self._lock:
+            self._load_index()
+            self.root.mkdir(parents=True, exist_ok=True)
+
+            # Write into a temp dir and rename so readers never see a partial entry
+            tmp_dir = self.root / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir.mkdir()
+            size = 0
+            for name, text in files.items():
+                data = text.encode('utf-8')
+                (tmp_dir / name).write_bytes(data)
+                size += len(data)
+            entry_meta = dict(meta or {})
+            entry_meta["files"] = list(files.keys())
+            entry_meta["created_at"] = time.time()
+            (tmp_dir / "meta.json").write_text(json.dumps(entry_meta), encoding='utf-8')
+
+            self._remove(key)
+            os.replace(tmp_dir, self.root / key)
+            self._index[key] = size
+            self._evict()
+            self._save_index()
+
+    def _remove(self, key: str):
+        """Delete an entry's files and index record."""
+        self._index.pop(key, None)
+        shutil.rmtree(self.root / key, ignore_errors=True)
+
+    def _evict(self):
+        """Drop least-recently-used entries until within limits."""
+        total = sum(self._index.values())
+        while self._index and (total > self.max_bytes or len(self._index) > self.max_entries):
+            key, size = self._index.popitem(last=False)
+            shutil.rmtree(self.root / key, ignore_errors=True)
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters."""
+        with self._lock:
+            self._load_index()
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._index),
+                "bytes": sum(self._index.values()),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+
+# Global cache instance
+transcript_cache = TranscriptCache(
+    CACHE_ROOT,
+    max_bytes=settings["cache"]["max_bytes"],
+    max_entries=settings["cache"]["max_entries"]
+)
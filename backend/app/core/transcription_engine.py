@@ -0,0 +1,186 @@
+"""Pluggable transcription engines (faster-whisper, openai-whisper)."""
+
+import importlib.util
+import wave
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
+
+from ..config import settings
+from ..models import TranscriptionEngine
+
+
+# Whisper models expect 16 kHz mono audio
+SAMPLE_RATE = 16000
+
+# A WAV path, or a float32 NumPy array of 16 kHz mono samples
+AudioInput = Union[str, Any]
+
+
+def get_audio_duration(audio: AudioInput) -> float:
+    """Get duration in seconds of a decoded buffer or a PCM WAV file."""
+    if isinstance(audio, str):
+        with wave.open(audio, 'rb') as wav:
+            return wav.getnframes() / float(wav.getframerate())
+    return len(audio) / float(SAMPLE_RATE)
+
+
+def read_wav_range(audio_path: str, start_sample: int, end_sample: int):
+    """Read [start_sample, end_sample) of a 16-bit mono WAV as float32."""
+    import numpy as np
+
+    with wave.open(audio_path, 'rb') as wav:
+        wav.setpos(start_sample)
+        data = wav.readframes(end_sample - start_sample)
+    return np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def is_whisper_ready_wav(path: str) -> bool:
+    """Whether a file is a plain 16 kHz mono 16-bit PCM WAV the engines can use as-is."""
+    try:
+        with wave.open(path, 'rb') as wav:
+            return (
+                wav.getframerate() == SAMPLE_RATE
+                and wav.getnchannels() == 1
+                and wav.getsampwidth() == 2
+                and wav.getcomptype() == 'NONE'
+            )
+    except (wave.Error, EOFError, OSError):
+        # Compressed, WAVE_FORMAT_EXTENSIBLE or truncated: let FFmpeg handle it
+        return False
+
+
+def read_wav(audio_path: str):
+    """Read a whole 16-bit mono WAV as float32."""
+    with wave.open(audio_path, 'rb') as wav:
+        total_samples = wav.getnframes()
+    return read_wav_range(audio_path, 0, total_samples)
+
+
+def trim_audio(audio: AudioInput, offset_seconds: float) -> AudioInput:
+    """Drop the first offset_seconds of audio (WAV input is read into memory)."""
+    if offset_seconds <= 0:
+        return audio
+    start_sample = int(offset_seconds * SAMPLE_RATE)
+    if isinstance(audio, str):
+        with wave.open(audio, 'rb') as wav:
+            total_samples = wav.getnframes()
+        return read_wav_range(audio, min(start_sample, total_samples), total_samples)
+    return audio[start_sample:]
+
+
+def silence(seconds: float = 1.0):
+    """A buffer of silent 16 kHz samples, used for warm-up inferences."""
+    import numpy as np
+
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+def describe_audio(audio: AudioInput) -> str:
+    """Short description of an audio input for log messages."""
+    if isinstance(audio, str):
+        return audio
+    return f"<in-memory PCM, {get_audio_duration(audio):.1f}s>"
+
+
+class BaseTranscriptionEngine(ABC):
+    """Abstract base class for transcription engines."""
+
+    # Engine identifier reported on the job
+    name: str = ""
+    # Beam width passed to the decoder (None = engine default)
+    beam_size: Optional[int] = None
+    # Model and resolved device, used to key throughput statistics
+    model_size: str = ""
+    device: str = ""
+
+    @abstractmethod
+    async def transcribe_with_progress(
+        self,
+        audio: AudioInput,
+        output_path: str,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        segment_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        slot_callback: Optional[Callable[[bool], None]] = None
+    ) -> bool:
+        """
+        Transcribe audio (WAV path or PCM buffer) into output_path.
+
+        progress_callback is awaited with (progress_percent, message).
+        segment_callback is awaited with each decoded segment as a dict
+        with 'text', 'start' and 'end' keys, in time order.
+        slot_callback is awaited with False when the engine has to wait for
+        an inference slot on a shared model and with True once it holds one.
+        """
+        pass
+
+    @abstractmethod
+    def cancel(self):
+        """Request cancellation of the running transcription."""
+        pass
+
+    async def warm_up(self) -> bool:
+        """
+        Load the engine's model and run a short dummy inference.
+
+        Returns:
+            bool: False if the engine has nothing to warm up
+        """
+        return False
+
+    def profile(self) -> Tuple[str, str, str]:
+        """(engine, model, device) this engine's speed is recorded under."""
+        return (self.name, self.model_size, self.device)
+
+
+# Python module each engine needs, used to report availability
+ENGINE_DEPENDENCIES = {
+    TranscriptionEngine.FASTER_WHISPER: "faster_whisper",
+    TranscriptionEngine.OPENAI_WHISPER: "whisper",
+}
+
+
+def get_default_engine() -> str:
+    """Get the configured default engine name."""
+    return settings["transcription"]["default_engine"]
+
+
+def resolve_engine_name(name: Optional[str]) -> str:
+    """Validate an engine name, falling back to the configured default."""
+    return TranscriptionEngine(name or get_default_engine()).value
+
+
+def list_engines() -> List[Dict[str, Any]]:
+    """List known engines and whether their dependencies are installed."""
+    default = get_default_engine()
+    return [
+        {
+            "name": engine.value,
+            "available": importlib.util.find_spec(module) is not None,
+            "default": engine.value == default
+        }
+        for engine, module in ENGINE_DEPENDENCIES.items()
+    ]
+
+
+def create_engine(name: Optional[str] = None) -> BaseTranscriptionEngine:
+    """
+    Create a transcription engine.
+
+    Engine modules are imported lazily so a missing backend only fails
+    the jobs that ask for it.
+
+    Args:
+        name: Engine name, or None for the configured default
+
+    Returns:
+        BaseTranscriptionEngine: New engine instance
+    """
+    engine = TranscriptionEngine(resolve_engine_name(name))
+    config = settings["transcription"]
+
+    if engine == TranscriptionEngine.FASTER_WHISPER:
+        from .whisper_wrapper import WhisperWrapper as FasterWhisperWrapper
+        return FasterWhisperWrapper(device=config["device"], model_size=config["model_size"])
+
+    from .whisper_wrapper_openai import WhisperWrapper as OpenAIWhisperWrapper
+    return OpenAIWhisperWrapper(device=config["device"], model_size=config["model_size"])
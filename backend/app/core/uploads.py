@@ -0,0 +1,347 @@
+"""Streaming upload writes and resumable (tus-style) upload sessions."""
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from uuid import uuid4
+
+from .storage import UPLOAD_DIR, incoming_path
+from .transcript_cache import hash_file
+from ..config import settings
+
+
+PARTIAL_DIR = UPLOAD_DIR / "partial"
+
+# Bytes of the upload inspected to identify its container
+SNIFF_BYTES = 16
+
+# tus protocol version implemented
+TUS_VERSION = "1.0.0"
+
+# Offsets 4..8 of an ISO-BMFF / QuickTime file hold the first atom type
+QUICKTIME_ATOMS = (b"ftyp", b"moov", b"mdat", b"free", b"wide", b"skip", b"pnot")
+
+
+def sniff_container(head: bytes) -> Optional[str]:
+    """Identify the media container from the first bytes of a file, or None."""
+    if head[4:8] in QUICKTIME_ATOMS:
+        return "mp4"  # also mov, m4a
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        return "matroska"  # also webm
+    if head[:4] == b"RIFF" and head[8:12] == b"AVI ":
+        return "avi"
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head.startswith(b"fLaC"):
+        return "flac"
+    if head.startswith(b"OggS"):
+        return "ogg"  # also opus
+    if head.startswith(b"ID3") or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        return "mp3"  # ID3 tag or bare MPEG audio frame sync
+    if head.startswith(b"FLV"):
+        return "flv"
+    if head.startswith(b"\x30\x26\xb2\x75\x8e\x66\xcf\x11"):
+        return "asf"  # wmv
+    return None
+
+
+def parse_upload_metadata(header: Optional[str]) -> Dict[str, str]:
+    """Decode a tus Upload-Metadata header ("key base64value,key2 ...")."""
+    metadata = {}
+    for pair in (header or "").split(","):
+        parts = pair.strip().split(" ", 1)
+        if not parts[0]:
+            continue
+        try:
+            value = base64.b64decode(parts[1]).decode("utf-8") if len(parts) > 1 else ""
+        except (binascii.Error, UnicodeDecodeError):
+            raise UploadRejected(400, f"Invalid Upload-Metadata value for {parts[0]}")
+        metadata[parts[0]] = value
+    return metadata
+
+
+async def iter_file(file, chunk_size: int) -> AsyncIterator[bytes]:
+    """Read an object with an async read() (e.g. UploadFile) in chunks."""
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+class UploadRejected(Exception):
+    """Raised when upload bytes cannot be accepted; carries the HTTP status."""
+
+    def __init__(self, status_code: int, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+
+
+class StreamingWriter:
+    """
+    Writes an upload to disk off the event loop, hashing it and sniffing its
+    container as the bytes pass through, so a multi-GB upload neither blocks
+    other requests nor needs a second read to hash.
+    """
+
+    def __init__(self, path: Path, offset: int = 0, digest=None, head: bytes = b""):
+        """
+        Args:
+            path: Destination file
+            offset: Bytes already in the file (appends after them)
+            digest: SHA-256 state covering those bytes, or None if unknown
+            head: First bytes of the file already received
+        """
+        self.path = path
+        self.offset = offset
+        if digest is None and offset == 0:
+            digest = hashlib.sha256()
+        self.digest = digest
+        self.head = head
+        self.container: Optional[str] = sniff_container(head) if len(head) >= SNIFF_BYTES else None
+        self._file = None
+
+    async def open(self):
+        """Open the destination for appending."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = await asyncio.to_thread(open, self.path, "ab")
+
+    def _write(self, chunk: bytes):
+        # Runs in a thread; hashlib releases the GIL for large buffers
+        self._file.write(chunk)
+        if self.digest is not None:
+            self.digest.update(chunk)
+
+    async def write(self, chunk: bytes):
+        """Append a chunk, rejecting the upload early if it is not a known container."""
+        if len(self.head) < SNIFF_BYTES:
+            self.head += chunk[:SNIFF_BYTES - len(self.head)]
+            if len(self.head) >= SNIFF_BYTES:
+                self.check_container()
+        await asyncio.to_thread(self._write, chunk)
+        self.offset += len(chunk)
+
+    def check_container(self):
+        """Identify the container from the bytes seen so far."""
+        self.container = sniff_container(self.head)
+        if self.container is None:
+            raise UploadRejected(415, "Unrecognized media container")
+
+    async def close(self):
+        """Flush and close the destination."""
+        if self._file is not None:
+            await asyncio.to_thread(self._file.close)
+            self._file = None
+
+    async def hexdigest(self) -> str:
+        """SHA-256 of everything written, re-reading the file if the state was lost."""
+        if self.digest is None:
+            return await asyncio.to_thread(hash_file, str(self.path))
+        return self.digest.hexdigest()
+
+
+async def save_stream(chunks: AsyncIterator[bytes], path: Path) -> StreamingWriter:
+    """
+    Write a stream of chunks to path, hashing and sniffing it on the way.
+
+    The partial file is removed if the stream fails or is rejected.
+    """
+    writer = StreamingWriter(path)
+    await asyncio.to_thread(path.unlink, missing_ok=True)
+    await writer.open()
+    try:
+        async for chunk in chunks:
+            await writer.write(chunk)
+        if writer.container is None:
+            writer.check_container()
+    except BaseException:
+        await writer.close()
+        await asyncio.to_thread(path.unlink, missing_ok=True)
+        raise
+    await writer.close()
+    return writer
+
+
+class UploadSession:
+    """One resumable upload: its target length, options and bytes received."""
+
+    def __init__(self, upload_id: str, filename: str, length: int, options: Dict[str, Any], created_at: float):
+        self.id = upload_id
+        self.filename = filename
+        self.length = length
+        self.options = options
+        self.created_at = created_at
+        # SHA-256 state (covering digest_offset bytes) and leading bytes,
+        # kept between PATCH requests in this process
+        self.digest = None
+        self.digest_offset = 0
+        self.head = b""
+        self.lock = asyncio.Lock()
+
+    @property
+    def path(self) -> Path:
+        return PARTIAL_DIR / f"{self.id}.part"
+
+    @property
+    def info_path(self) -> Path:
+        return PARTIAL_DIR / f"{self.id}.json"
+
+    @property
+    def offset(self) -> int:
+        """Bytes received so far; the file on disk is the source of truth."""
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "length": self.length,
+            "options": self.options,
+            "created_at": self.created_at
+        }
+
+
+class UploadManager:
+    """
+    Resumable uploads following the tus 1.0 offset protocol (core,
+    creation and termination): a client creates an upload with its total
+    length, then PATCHes bytes at the offset the server reports, and after
+    a dropped connection asks for the offset (HEAD) and continues from it.
+
+    Bytes go to storage/uploads/partial/<id>.part with a JSON sidecar, so
+    uploads also resume across server restarts; the hash is then
+    recomputed from disk when the upload completes.
+    """
+
+    def __init__(self):
+        self.sessions: Dict[str, UploadSession] = {}
+
+    def create(self, filename: str, length: int, options: Dict[str, Any]) -> UploadSession:
+        """Start a new upload."""
+        max_bytes = settings["uploads"]["max_bytes"]
+        if max_bytes and length > max_bytes:
+            raise UploadRejected(413, f"Upload exceeds {max_bytes} bytes")
+        self.expire()
+
+        session = UploadSession(str(uuid4()), Path(filename).name, length, options, time.time())
+        PARTIAL_DIR.mkdir(parents=True, exist_ok=True)
+        session.path.touch()
+        session.info_path.write_text(json.dumps(session.to_dict()), encoding="utf-8")
+        self.sessions[session.id] = session
+        return session
+
+    def get(self, upload_id: str) -> Optional[UploadSession]:
+        """Look up an upload, reloading it from its sidecar after a restart."""
+        session = self.sessions.get(upload_id)
+        if session is not None:
+            return session
+        info_path = PARTIAL_DIR / f"{Path(upload_id).name}.json"
+        if not info_path.exists():
+            return None
+        try:
+            info = json.loads(info_path.read_text(encoding="utf-8"))
+        except Exception as e:
+            print(f"Error loading upload {upload_id}: {e}")
+            return None
+        session = UploadSession(info["id"], info["filename"], info["length"], info["options"], info["created_at"])
+        self.sessions[session.id] = session
+        return session
+
+    async def append(self, session: UploadSession, offset: int, chunks: AsyncIterator[bytes]) -> int:
+        """
+        Write chunks at offset. Returns the new offset.
+
+        Bytes that arrived before a dropped connection are kept, so the
+        client resumes from wherever the stream broke off.
+        """
+        async with session.lock:
+            current = session.offset
+            if offset != current:
+                raise UploadRejected(409, f"Upload-Offset {offset} does not match {current}")
+
+            # The hash can only continue if it covers exactly the bytes on disk
+            digest = session.digest if session.digest_offset == current else None
+            writer = StreamingWriter(session.path, current, digest, session.head)
+            await writer.open()
+            try:
+                try:
+                    async for chunk in chunks:
+                        if writer.offset + len(chunk) > session.length:
+                            raise UploadRejected(413, "Upload exceeds its declared Upload-Length")
+                        await writer.write(chunk)
+                finally:
+                    await writer.close()
+                    session.digest = writer.digest
+                    session.digest_offset = writer.offset
+                    session.head = writer.head
+                    # Expiry counts from the last activity
+                    os.utime(session.info_path)
+            except UploadRejected as e:
+                if e.status_code == 415:
+                    self.delete(session)
+                raise
+            return writer.offset
+
+    async def complete(self, session: UploadSession) -> Tuple[Path, str, str]:
+        """
+        Move a fully received upload into storage/uploads/incoming.
+
+        Returns:
+            (file path, SHA-256 of the contents, container)
+        """
+        offset = session.offset
+        digest = session.digest if session.digest_offset == offset else None
+        writer = StreamingWriter(session.path, offset, digest, session.head)
+        if writer.container is None:
+            # Short files or a session restored from disk
+            writer.head = await asyncio.to_thread(_read_head, session.path)
+            try:
+                writer.check_container()
+            except UploadRejected:
+                self.delete(session)
+                raise
+        content_hash = await writer.hexdigest()
+
+        destination = incoming_path(session.filename)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(os.replace, session.path, destination)
+        session.info_path.unlink(missing_ok=True)
+        self.sessions.pop(session.id, None)
+        return destination, content_hash, writer.container
+
+    def delete(self, session: UploadSession):
+        """Abandon an upload and remove its bytes."""
+        self.sessions.pop(session.id, None)
+        session.path.unlink(missing_ok=True)
+        session.info_path.unlink(missing_ok=True)
+
+    def expire(self):
+        """Remove uploads left incomplete for longer than partial_ttl_hours."""
+        cutoff = time.time() - settings["uploads"]["partial_ttl_hours"] * 3600
+        if not PARTIAL_DIR.exists():
+            return
+        for info_path in PARTIAL_DIR.glob("*.json"):
+            if info_path.stat().st_mtime < cutoff:
+                session = self.get(info_path.stem)
+                if session is not None:
+                    print(f"Removing expired upload {session.id} ({session.filename})")
+                    self.delete(session)
+
+
+def _read_head(path: Path) -> bytes:
+    with open(path, "rb") as f:
+        return f.read(SNIFF_BYTES)
+
+
+# Global upload manager
+upload_manager = UploadManager()
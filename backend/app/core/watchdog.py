@@ -0,0 +1,169 @@
+"""Watchdog that kills and requeues job stages that hang or overrun."""
+
+import asyncio
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..config import settings
+from ..models import JobStatus
+
+
+# Recoveries kept for /api/status
+RECOVERY_HISTORY = 20
+
+# Seconds to wait for a killed stage to unwind before requeueing its job
+KILL_WAIT = 5.0
+
+
+def stage_deadline(stage: str, media_seconds: float) -> float:
+    """Seconds a stage may run for media of the given duration."""
+    config = settings["watchdog"]["deadlines"].get(stage) or {}
+    return config.get("base", 600) + config.get("per_media_second", 0.0) * max(media_seconds, 0.0)
+
+
+class Watchdog:
+    """
+    Checks every busy worker each interval and recovers stuck jobs.
+
+    A stage is stuck when it runs past its deadline (base plus a per
+    media-second allowance, so long files get proportionally longer) or
+    when the worker's heartbeat, refreshed only on real progress, is older
+    than stall_seconds. The stage is then cancelled like a user cancel
+    (FFmpeg killed, engine flagged, in-flight LLM requests aborted), which
+    frees the worker, and the job is requeued with its checkpoint kept.
+    After max_requeues recoveries the job fails instead.
+
+    Time spent queued for an inference slot on a shared model counts
+    toward neither limit: the transcription clock starts once the slot
+    is held.
+    """
+
+    def __init__(
+        self,
+        queue_manager,
+        workers: Callable[[], List[Any]],
+        requeue: Optional[Callable[[Any, str], Awaitable[None]]] = None
+    ):
+        """
+        Initialize watchdog.
+
+        Args:
+            queue_manager: Shared queue manager
+            workers: Returns the workers to watch
+            requeue: Async callback(job, current_stage) putting a stuck job
+                back in the queue (default: queue_manager.requeue)
+        """
+        self.queue_manager = queue_manager
+        self.workers = workers
+        self.requeue = requeue or queue_manager.requeue
+        self.recoveries: deque = deque(maxlen=RECOVERY_HISTORY)
+        self.requeued = 0
+        self.failed = 0
+        self._loop: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start checking in the background."""
+        if self._loop is None:
+            self._loop = asyncio.create_task(self._check_loop())
+
+    def stop(self):
+        """Stop checking."""
+        if self._loop is not None:
+            self._loop.cancel()
+            self._loop = None
+
+    @staticmethod
+    def overdue(worker, now: float) -> Optional[str]:
+        """Why the worker's current stage is stuck, or None if it is healthy."""
+        if worker.current_job_id is None or worker.stage_running is None:
+            return None
+        stage = worker.stage_running.value
+        if now > worker.stage_deadline:
+            return f"{stage} exceeded its {worker.stage_deadline - worker.stage_started:.0f}s deadline"
+        stall_seconds = settings["watchdog"]["stall_seconds"]
+        if now - worker.heartbeat > stall_seconds:
+            return f"{stage} made no progress for {stall_seconds:.0f}s"
+        return None
+
+    async def _check_loop(self):
+        """Check the workers every interval seconds."""
+        while True:
+            await asyncio.sleep(settings["watchdog"]["interval"])
+            try:
+                await self.check()
+            except Exception as e:
+                print(f"Watchdog error: {e}")
+
+    async def check(self):
+        """Recover every stuck stage."""
+        now = time.monotonic()
+        for worker in self.workers():
+            reason = self.overdue(worker, now)
+            if reason:
+                await self.recover(worker, worker.current_job_id, reason)
+
+    async def recover(self, worker, job_id: str, reason: str):
+        """Kill a worker's stuck stage and requeue (or fail) its job."""
+        job = self.queue_manager.get_job(job_id)
+        stage = worker.stage_running.value if worker.stage_running else None
+        task = worker.current_task
+        print(f"Watchdog: job {job_id} on worker {worker.worker_id} is stuck ({reason})")
+
+        worker.cancel_current(discard_checkpoint=False)
+        if task is not None:
+            await asyncio.wait({task}, timeout=KILL_WAIT)
+        if job is None or job.status == JobStatus.CANCELLED:
+            return
+
+        job.stalls += 1
+        if job.stalls > settings["watchdog"]["max_requeues"]:
+            action = "failed"
+            self.failed += 1
+            await self.queue_manager.update_job_progress(
+                job_id,
+                JobStatus.FAILED,
+                job.progress,
+                "Failed",
+                f"Stuck: {reason}"
+            )
+        else:
+            action = "requeued"
+            self.requeued += 1
+            await self.requeue(job, f"Queued (retry after stuck {stage})")
+
+        self.recoveries.append({
+            "at": datetime.now().isoformat(),
+            "job_id": job_id,
+            "worker_id": worker.worker_id,
+            "stage": stage,
+            "reason": reason,
+            "action": action
+        })
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-worker stage timing and recent recoveries for /api/status."""
+        now = time.monotonic()
+        running = []
+        for worker in self.workers():
+            if worker.current_job_id is None or worker.stage_running is None:
+                continue
+            running.append({
+                "worker_id": worker.worker_id,
+                "job_id": worker.current_job_id,
+                "stage": worker.stage_running.value,
+                "elapsed_seconds": round(now - worker.stage_started, 1),
+                "deadline_in_seconds": round(worker.stage_deadline - now, 1),
+                "heartbeat_age_seconds": round(now - worker.heartbeat, 1),
+                "stuck": self.overdue(worker, now)
+            })
+        return {
+            "enabled": self._loop is not None,
+            "stall_seconds": settings["watchdog"]["stall_seconds"],
+            "running": running,
+            "stuck": [entry for entry in running if entry["stuck"]],
+            "requeued": self.requeued,
+            "failed": self.failed,
+            "recoveries": list(self.recoveries)
+        }
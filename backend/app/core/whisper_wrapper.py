@@ -3,7 +3,7 @@
 import asyncio
 import sys
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, Optional
 
 # Add parent directory to path to import whisper_cli
 # Get the project root (4 levels up from this file)
@@ -12,7 +12,6 @@ sys.path.insert(0, str(project_root))
 
 try:
     from whisper_cli.transcriber import WhisperTranscriber, TranscriberError
-    import librosa
 except ImportError as e:
     print(f"Warning: Failed to import whisper dependencies: {e}")
     print(f"Project root: {project_root}")
@@ -20,81 +19,140 @@ except ImportError as e:
     # Re-raise to make the error visible
     raise
 
+from .model_registry import model_registry
+from .transcription_engine import AudioInput, BaseTranscriptionEngine, get_audio_duration, silence
 
-class WhisperWrapper:
+
+class WhisperWrapper(BaseTranscriptionEngine):
     """Handles Whisper transcription with progress tracking."""
 
-    def __init__(self, device: str = "auto"):
-        self.transcriber = WhisperTranscriber(device=device, verbose=False)
+    name = "faster-whisper"
+    beam_size = 5
+
+    def __init__(self, device: str = "auto", model_size: str = "large-v3"):
+        self.transcriber = WhisperTranscriber(device=device, verbose=False, model_size=model_size)
+        # The transcriber resolves "auto" and picks the precision for the device
+        self.device = self.transcriber.device
+        self.compute_type = self.transcriber.compute_type
+        self.model_size = self.transcriber.model_size
         self._cancel_flag = False
 
+    def _model_key(self):
+        """Registry key for the transcriber's model."""
+        return ("faster-whisper", self.model_size, self.device, self.compute_type)
+
+    def _load_model(self):
+        """Load the CTranslate2 model through the transcriber."""
+        self.transcriber._load_model()
+        model = self.transcriber.model
+        # The registry owns the model; without this an idle unload frees nothing
+        self.transcriber.model = None
+        self.transcriber._model_loaded = False
+        return model
+
+    async def warm_up(self) -> bool:
+        """Load the shared model and decode one second of silence."""
+        await model_registry.warm_up(
+            self._model_key(),
+            self._load_model,
+            lambda model: list(model.transcribe(silence(), beam_size=1)[0])
+        )
+        return True
+
     async def transcribe_with_progress(
         self,
-        audio_path: str,
+        audio: AudioInput,
         output_path: str,
-        progress_callback: Optional[Callable[[float, str], None]] = None
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        segment_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        slot_callback: Optional[Callable[[bool], None]] = None
     ) -> bool:
         """
         Transcribe audio with progress tracking.
 
         Args:
-            audio_path: Path to audio file
+            audio: Path to audio file, or 16 kHz float32 PCM buffer
             output_path: Path to save transcript
             progress_callback: Async callback(progress_percent, message)
+            segment_callback: Async callback(segment) for each decoded segment
+            slot_callback: Async callback(acquired) around the wait for an
+                inference slot on the shared model
 
         Returns:
             bool: True if successful
         """
+        handle = None
+        self._cancel_flag = False
         try:
-            # Load model (this happens once)
-            self.transcriber._load_model()
+            # Get shared model from registry (loads once per process)
+            handle = await model_registry.acquire_async(self._model_key(), self._load_model)
 
             if progress_callback:
                 await progress_callback(5, "Model loaded, starting transcription...")
 
-            # Estimate duration for progress calculation
-            duration = await self._get_audio_duration(audio_path)
-            estimated_segments = max(int(duration / 5), 1)  # ~5 seconds per segment
-            print(f"Audio duration: {duration:.2f}s, estimated segments: {estimated_segments}")
+            # Progress is the decoded position within the audio
+            duration = await self._get_audio_duration(audio)
+            print(f"Audio duration: {duration:.2f}s")
 
             # Run transcription in thread pool (blocking operation)
             loop = asyncio.get_event_loop()
 
             # Create a wrapper to track segments
-            segments_processed = [0]  # Use list to allow modification in nested function
-            transcription_text = [""]
+            transcription_text = [""]  # Use list to allow modification in nested function
+
+            def report_slot(acquired):
+                if slot_callback:
+                    asyncio.run_coroutine_threadsafe(slot_callback(acquired), loop).result()
 
             def transcribe_sync():
                 """Synchronous transcription function."""
                 try:
-                    segments, info = self.transcriber.model.transcribe(
-                        str(audio_path),
-                        beam_size=5,
-                        language=None,
-                        task="transcribe"
-                    )
-
-                    # Process segments with progress tracking
-                    for segment in segments:
-                        if self._cancel_flag:
-                            raise TranscriberError("Transcription cancelled")
-
-                        transcription_text[0] += segment.text
-                        segments_processed[0] += 1
-
-                        # Calculate progress (5% for loading, 95% for transcription)
-                        progress = 5 + (segments_processed[0] / estimated_segments) * 95
-                        progress = min(progress, 99)  # Cap at 99% until complete
-
-                        # Schedule callback in async context
-                        if progress_callback:
-                            asyncio.run_coroutine_threadsafe(
-                                progress_callback(
-                                    progress,
-                                    f"Transcribing: segment {segments_processed[0]}/{estimated_segments}"
-                                ),
-                                loop
-                            )
+                    # Segments are decoded lazily, so hold the slot while iterating;
+                    # a cancel while queued for it abandons the wait
+                    with handle.inference(
+                        cancelled=lambda: self._cancel_flag,
+                        on_wait=lambda: report_slot(False)
+                    ) as model:
+                        report_slot(True)
+                        segments, info = model.transcribe(
+                            audio,
+                            beam_size=self.beam_size,
+                            language=None,
+                            task="transcribe"
+                        )
+
+                        # Process segments with progress tracking
+                        for segment in segments:
+                            if self._cancel_flag:
+                                raise TranscriberError("Transcription cancelled")
+
+                            transcription_text[0] += segment.text
+
+                            # Calculate progress (5% for loading, 95% for transcription)
+                            progress = 5 + (segment.end / max(duration, 1e-6)) * 95
+                            progress = min(progress, 99)  # Cap at 99% until complete
+
+                            # Run callbacks in async context and wait for them, so
+                            # segments are recorded in order and all of them before
+                            # this returns (the caller then saves and checkpoints them)
+                            if segment_callback:
+                                asyncio.run_coroutine_threadsafe(
+                                    segment_callback({
+                                        "text": segment.text,
+                                        "start": segment.start,
+                                        "end": segment.end
+                                    }),
+                                    loop
+                                ).result()
+
+                            if progress_callback:
+                                asyncio.run_coroutine_threadsafe(
+                                    progress_callback(
+                                        progress,
+                                        f"Transcribing: {segment.end:.0f}s / {duration:.0f}s"
+                                    ),
+                                    loop
+                                ).result()
 
                     return transcription_text[0].strip()
 
@@ -118,15 +176,14 @@ class WhisperWrapper:
             print(f"Transcription error: {e}")
             return False
 
-    async def _get_audio_duration(self, audio_path: str) -> float:
-        """Get audio duration using librosa."""
+        finally:
+            if handle is not None:
+                model_registry.release(handle)
+
+    async def _get_audio_duration(self, audio: AudioInput) -> float:
+        """Get audio duration from the buffer length or the WAV header."""
         try:
-            loop = asyncio.get_event_loop()
-            duration = await loop.run_in_executor(
-                None,
-                lambda: librosa.get_duration(path=audio_path)
-            )
-            return duration
+            return get_audio_duration(audio)
         except Exception as e:
             print(f"Error getting audio duration: {e}")
             return 60.0  # Default estimate
@@ -1,21 +1,137 @@
 """Whisper wrapper using OpenAI Whisper (not faster-whisper)."""
 
 import asyncio
+import logging
 import whisper
+import whisper.transcribe
 from pathlib import Path
-from typing import Callable, Optional
+import sys
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Optional
 import threading
 import time
+from .model_registry import model_registry
+from .throughput_stats import throughput_stats
+from .transcription_engine import AudioInput, BaseTranscriptionEngine, describe_audio, get_audio_duration, silence
 
 
-class WhisperWrapper:
+class TranscriptionCancelled(Exception):
+    """Raised inside whisper's decoding loop to abandon a cancelled transcription."""
+    pass
+
+
+logger = logging.getLogger(__name__)
+
+# openai-whisper release the window hook below was written against
+SUPPORTED_WHISPER_VERSION = "20250625"
+
+# The module itself: whisper's package __init__ rebinds whisper.transcribe
+# to the function of the same name
+_transcribe_module = sys.modules["whisper.transcribe"]
+
+# Per-thread hook called after each decoded 30-second window
+_window_hooks = threading.local()
+
+
+def _window_hook_supported() -> bool:
+    """Whether whisper.transcribe() still has the progress bar and segment list the hook reads."""
+    transcribe = getattr(_transcribe_module, "transcribe", None)
+    if transcribe is None or not hasattr(getattr(_transcribe_module, "tqdm", None), "tqdm"):
+        return False
+    code = transcribe.__code__
+    return "all_segments" in code.co_varnames + code.co_cellvars
+
+
+WINDOW_HOOK_SUPPORTED = _window_hook_supported()
+if not WINDOW_HOOK_SUPPORTED:
+    logger.warning(
+        "openai-whisper %s has no per-window progress hook (written for %s); "
+        "segments will be streamed once transcription finishes and cancel "
+        "only takes effect between files",
+        getattr(whisper, "__version__", "unknown"), SUPPORTED_WHISPER_VERSION
+    )
+elif getattr(whisper, "__version__", SUPPORTED_WHISPER_VERSION) != SUPPORTED_WHISPER_VERSION:
+    logger.warning(
+        "openai-whisper %s is untested with the per-window progress hook (written for %s)",
+        whisper.__version__, SUPPORTED_WHISPER_VERSION
+    )
+
+
+class _WindowProgressBar:
+    """
+    Stand-in for the tqdm bar whisper.transcribe() advances once per window.
+
+    whisper offers no callback or cancel hook, but it updates this bar
+    between windows, which is the earliest point decoding can be stopped.
+    By then the window's segments are already in transcribe()'s
+    all_segments list, which is handed to the hook so they can be
+    streamed before the whole file is decoded.
+    """
+
+    def __init__(self, total=None, **kwargs):
+        self.total = total
+        self.n = 0
+
+    def update(self, n=1):
+        self.n += n
+        hook = getattr(_window_hooks, "hook", None)
+        if hook is not None:
+            # Empty if the caller is not transcribe(); its segments are then
+            # only emitted once the run finishes
+            decoded = sys._getframe(1).f_locals.get("all_segments", ())
+            hook(self.n, self.total, decoded)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_patch_lock = threading.Lock()
+_patch_users = 0
+_original_tqdm = None
+
+
+class _window_progress:
+    """
+    Swap _WindowProgressBar into whisper's transcribe module for the duration of a call.
+
+    The module attribute is shared by every thread, so it is installed by
+    the first concurrent transcription and the original tqdm is put back
+    when the last one finishes.
+    """
+
+    def __enter__(self):
+        global _patch_users, _original_tqdm
+        with _patch_lock:
+            if _patch_users == 0:
+                _original_tqdm = _transcribe_module.tqdm
+                _transcribe_module.tqdm = SimpleNamespace(tqdm=_WindowProgressBar)
+            _patch_users += 1
+        return self
+
+    def __exit__(self, *exc):
+        global _patch_users, _original_tqdm
+        with _patch_lock:
+            _patch_users -= 1
+            if _patch_users == 0:
+                _transcribe_module.tqdm = _original_tqdm
+                _original_tqdm = None
+        return False
+
+
+class WhisperWrapper(BaseTranscriptionEngine):
     """Handles Whisper transcription with progress tracking using OpenAI Whisper."""
 
-    def __init__(self, device: str = "auto"):
+    name = "openai-whisper"
+
+    def __init__(self, device: str = "auto", model_size: str = "large-v3"):
         """Initialize wrapper.
 
         Args:
             device: "auto", "cpu", or "cuda"
+            model_size: Whisper model name
         """
         import torch
 
@@ -24,42 +140,61 @@ class WhisperWrapper:
         else:
             self.device = device
 
-        self.model = None
+        self.model_size = model_size
+        # openai-whisper runs fp16 on GPU and fp32 on CPU
+        self.compute_type = "float16" if self.device == "cuda" else "float32"
         self._cancel_flag = False
         self._transcription_progress = 0
         self._transcription_running = False
         print(f"WhisperWrapper initialized for device: {self.device}")
 
+    def _model_key(self):
+        """Registry key for this wrapper's model."""
+        return ("openai-whisper", self.model_size, self.device, self.compute_type)
+
+    def _load_model(self):
+        """Load the PyTorch model."""
+        return whisper.load_model(self.model_size, device=self.device)
+
+    async def warm_up(self) -> bool:
+        """Load the shared model and decode one second of silence."""
+        await model_registry.warm_up(
+            self._model_key(),
+            self._load_model,
+            lambda model: model.transcribe(silence(), fp16=self.device == "cuda", verbose=None)
+        )
+        return True
+
     async def transcribe_with_progress(
         self,
-        audio_path: str,
+        audio: AudioInput,
         output_path: str,
-        progress_callback: Optional[Callable[[float, str], None]] = None
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        segment_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        slot_callback: Optional[Callable[[bool], None]] = None
     ) -> bool:
         """
         Transcribe audio with progress tracking.
 
         Args:
-            audio_path: Path to audio file
+            audio: Path to audio file, or 16 kHz float32 PCM buffer
             output_path: Path to save transcript
             progress_callback: Async callback(progress_percent, message)
+            segment_callback: Async callback(segment) for each decoded segment
+            slot_callback: Async callback(acquired) around the wait for an
+                inference slot on the shared model
 
         Returns:
             bool: True if successful
         """
+        handle = None
+        self._cancel_flag = False
         try:
-            # Load model
+            # Get shared model from registry (loads once per process)
             if progress_callback:
                 await progress_callback(5, "Loading Whisper model...")
 
-            if self.model is None:
-                print(f"Loading Whisper large-v3 model on {self.device}...")
-                loop = asyncio.get_event_loop()
-                self.model = await loop.run_in_executor(
-                    None,
-                    lambda: whisper.load_model("large-v3", device=self.device)
-                )
-                print(f"Model loaded on {self.device}")
+            handle = await model_registry.acquire_async(self._model_key(), self._load_model)
 
             if progress_callback:
                 await progress_callback(10, "Model loaded, starting transcription...")
@@ -67,7 +202,13 @@ class WhisperWrapper:
             # Run transcription in thread pool
             loop = asyncio.get_event_loop()
 
-            print(f"Transcribing: {audio_path}")
+            print(f"Transcribing: {describe_audio(audio)}")
+
+            # Decoded position, updated by whisper after each 30-second window
+            duration = get_audio_duration(audio)
+            window_position = {"seconds": 0.0, "at": time.monotonic()}
+            # Historical speed of this engine/model/device, to move between windows
+            speed = throughput_stats.speed("transcribe", self.profile())
 
             # Start progress monitoring
             self._transcription_running = True
@@ -78,39 +219,87 @@ class WhisperWrapper:
                 last_progress = 10
                 while self._transcription_running:
                     await asyncio.sleep(3)  # Update every 3 seconds
-                    # Gradually increment progress, but slow down as we approach 95%
-                    if last_progress < 95:
-                        # Increment by smaller amounts as we get closer to completion
-                        if last_progress < 50:
-                            increment = 5
-                        elif last_progress < 70:
-                            increment = 3
-                        elif last_progress < 85:
-                            increment = 2
-                        else:
-                            increment = 1
-
-                        last_progress = min(last_progress + increment, 95)
-                        self._transcription_progress = last_progress
+                    if duration <= 0:
+                        continue
+                    # Extrapolate from the last finished window, at most one window ahead
+                    decoded = window_position["seconds"]
+                    elapsed = time.monotonic() - window_position["at"]
+                    position = min(decoded + min(elapsed * speed, 30.0), duration)
+
+                    # Map the position to 10-90%
+                    progress = max(last_progress, 10 + position / duration * 80)
+                    if progress > last_progress:
+                        last_progress = progress
+                        self._transcription_progress = progress
                         if progress_callback:
                             await progress_callback(
-                                last_progress,
-                                f"Transcribing... ({int(last_progress)}%)"
+                                progress,
+                                f"Transcribing: {position:.0f}s / {duration:.0f}s"
                             )
 
             # Start monitoring task
             monitor_task = asyncio.create_task(monitor_progress())
 
+            # Segments already passed to segment_callback
+            emitted = {"count": 0}
+
+            def emit_segments(segments):
+                # Wait for each callback so segments are recorded in order
+                # (and checkpointed) as their window finishes
+                for segment in segments[emitted["count"]:]:
+                    asyncio.run_coroutine_threadsafe(segment_callback({
+                        "text": segment["text"],
+                        "start": segment["start"],
+                        "end": segment["end"]
+                    }), loop).result()
+                    emitted["count"] += 1
+
+            def on_window(decoded_frames, total_frames, decoded_segments):
+                if self._cancel_flag:
+                    raise TranscriptionCancelled("Transcription cancelled")
+                if total_frames:
+                    window_position["seconds"] = min(decoded_frames / total_frames, 1.0) * duration
+                    window_position["at"] = time.monotonic()
+                if segment_callback:
+                    emit_segments(decoded_segments)
+
+            def report_slot(acquired):
+                if slot_callback:
+                    asyncio.run_coroutine_threadsafe(slot_callback(acquired), loop).result()
+
+            def transcribe_sync():
+                # Wait for a free inference slot on the shared model; a cancel
+                # while queued for it abandons the wait
+                with handle.inference(
+                    cancelled=lambda: self._cancel_flag,
+                    on_wait=lambda: report_slot(False)
+                ) as model:
+                    report_slot(True)
+                    if self._cancel_flag:
+                        raise TranscriptionCancelled("Transcription cancelled")
+                    options = dict(
+                        language=None,  # Auto-detect
+                        task="transcribe",
+                        beam_size=self.beam_size
+                    )
+                    if WINDOW_HOOK_SUPPORTED:
+                        _window_hooks.hook = on_window
+                        try:
+                            with _window_progress():
+                                # verbose=True enables the progress bar the hook rides on
+                                result = model.transcribe(audio, verbose=True, **options)
+                        finally:
+                            _window_hooks.hook = None
+                    else:
+                        result = model.transcribe(audio, verbose=None, **options)
+                    # Anything whisper decoded after the last window update, or
+                    # every segment when the window hook is unavailable
+                    if segment_callback:
+                        emit_segments(result.get("segments", []))
+                    return result
+
             # Transcribe
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.model.transcribe(
-                    audio_path,
-                    language=None,  # Auto-detect
-                    task="transcribe",
-                    verbose=True  # Enable verbose for progress tracking
-                )
-            )
+            result = await loop.run_in_executor(None, transcribe_sync)
 
             # Stop progress monitoring
             self._transcription_running = False
@@ -148,6 +337,12 @@ class WhisperWrapper:
             traceback.print_exc()
             return False
 
+        finally:
+            # Also stops the progress monitor when the task is cancelled
+            self._transcription_running = False
+            if handle is not None:
+                model_registry.release(handle)
+
     def cancel(self):
         """Cancel transcription."""
         self._cancel_flag = True
@@ -1,42 +1,195 @@
 """Background worker for processing jobs."""
 
 import asyncio
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from enum import Enum
 from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from .queue_manager import QueueManager
 from .ffmpeg_processor import FFmpegProcessor
-from .whisper_wrapper_openai import WhisperWrapper
-from .llm_service import llm_service
+from .transcription_engine import (
+    BaseTranscriptionEngine, create_engine, get_audio_duration, is_whisper_ready_wav, read_wav,
+    resolve_engine_name, trim_audio
+)
+from .throughput_stats import Profile, throughput_stats
+from .checkpoint import TranscriptCheckpoint
+from .storage import atomic_write_text, audio_file, temp_path, transcript_file
+from .retry import PermanentError, RetryPolicy
+from .watchdog import stage_deadline
+from .text_formatter import format_segments_with_pauses
+from .parallel_transcriber import ParallelTranscriber, should_parallelize
+from .transcript_cache import transcript_cache, hash_file, make_key
+from ..config import settings
+from .llm_service import LLMRequestError, llm_service
 from ..models import JobStatus
 
 
+class PipelineStage(str, Enum):
+    """Stages a job flows through when workers are pooled per stage."""
+    EXTRACT = "extract"
+    TRANSCRIBE = "transcribe"
+    LLM = "llm"
+
+
+# Fixed progress bands per stage, used when the media duration is unknown
+LEGACY_BANDS = {
+    "extract": (0, 40),
+    "transcribe": (40, 70),
+    "llm": (70, 100)
+}
+
+# Profile extraction speed is recorded under
+FFMPEG_PROFILE: Profile = ("ffmpeg", "", "")
+
+
+class LLMStageError(Exception):
+    """The LLM was unreachable or overloaded; retried, then skipped."""
+    pass
+
+
+class LLMStageSkipped(LLMStageError, PermanentError):
+    """The LLM cannot succeed on retry (not configured, rejected the request, ...); skipped at once."""
+    pass
+
+
 class Worker:
     """Background worker that processes jobs from the queue."""
 
-    def __init__(self, worker_id: int, queue_manager: QueueManager):
+    def __init__(
+        self,
+        worker_id: int,
+        queue_manager: QueueManager,
+        stage: Optional[PipelineStage] = None,
+        pipeline=None
+    ):
+        """
+        Initialize worker.
+
+        Args:
+            worker_id: Worker identifier
+            queue_manager: Shared queue manager
+            stage: Stage this worker serves in a staged pipeline, or None
+                to run every stage of a job in sequence
+            pipeline: Pipeline owning the inter-stage queues (staged mode)
+        """
         self.worker_id = worker_id
         self.queue_manager = queue_manager
+        self.stage = stage
+        self.pipeline = pipeline
         self.ffmpeg = FFmpegProcessor()
-        self.whisper = None  # Lazy initialization
+        self.engines: Dict[str, BaseTranscriptionEngine] = {}  # Lazy initialization per engine
         self.running = False
+        # Job in progress, as a task so it can be cancelled mid-stage
+        self.current_job_id: Optional[str] = None
+        self.current_task: Optional[asyncio.Task] = None
+        self.current_engine: Optional[BaseTranscriptionEngine] = None
+        self._cancelling = False
+        self._discard_checkpoint = True
+        # Monotonic time the worker started waiting for a job, None while busy
+        self.idle_since: Optional[float] = None
+        # Watchdog state: stage running, its start and deadline (monotonic),
+        # and the last time the job showed progress
+        self.stage_running: Optional[PipelineStage] = None
+        self.stage_started: Optional[float] = None
+        self.stage_deadline: Optional[float] = None
+        self.heartbeat = time.monotonic()
+        self._beat_progress: Tuple[Optional[PipelineStage], float] = (None, -1.0)
 
     async def start(self):
         """Start worker loop."""
         self.running = True
-        print(f"Worker {self.worker_id} started")
+        print(f"Worker {self.worker_id} started" + (f" ({self.stage.value} stage)" if self.stage else ""))
 
         while self.running:
             try:
-                # Get job from queue (wait if empty)
-                job_id = await self.queue_manager.job_queue.get()
-                print(f"Worker {self.worker_id} picked up job {job_id}")
-                await self.process_job(job_id)
+                self.idle_since = time.monotonic()
+                if self.stage is None:
+                    # Get job from queue (wait if empty)
+                    job_id = await self.queue_manager.job_queue.get()
+                    self.idle_since = None
+                    print(f"Worker {self.worker_id} picked up job {job_id}")
+                    await self.run_cancellable(job_id, self.process_job(job_id))
+                    continue
+
+                if self.stage == PipelineStage.EXTRACT:
+                    job_id, payload = await self.queue_manager.job_queue.get(), None
+                else:
+                    job_id, payload = await self.pipeline.queues[self.stage].get()
+                self.idle_since = None
+
+                if self.queue_manager.is_cancelled(job_id):
+                    # Cancelled while waiting between stages; drop its payload
+                    print(f"Worker {self.worker_id} skipping cancelled job {job_id}")
+                    continue
+                print(f"Worker {self.worker_id} picked up job {job_id} ({self.stage.value})")
+
+                handoff = await self.run_cancellable(job_id, self.run_stage(job_id, payload))
+                if handoff is not None:
+                    next_stage, next_payload = handoff
+                    # Blocks while the next stage is backed up (bounds buffered audio)
+                    await self.pipeline.queues[next_stage].put((job_id, next_payload))
 
             except Exception as e:
                 print(f"Worker {self.worker_id} error: {e}")
                 await asyncio.sleep(1)
 
+    async def run_cancellable(self, job_id: str, coro):
+        """
+        Run one job's work as a task that cancel_current() can interrupt.
+
+        Returns:
+            The coroutine's result, or None if the job was cancelled
+        """
+        self.current_job_id = job_id
+        self.current_task = asyncio.create_task(coro)
+        self.queue_manager.set_active(job_id, self)
+        try:
+            return await self.current_task
+        except asyncio.CancelledError:
+            if not self._cancelling:
+                raise
+            print(f"Worker {self.worker_id} stopped cancelled job {job_id}")
+            if self._discard_checkpoint:
+                # A cancelled job is never resumed
+                TranscriptCheckpoint(job_id).remove()
+            return None
+        finally:
+            self.queue_manager.clear_active(job_id)
+            self.current_job_id = None
+            self.current_task = None
+            self.current_engine = None
+            self._cancelling = False
+            self._discard_checkpoint = True
+            self.stage_running = None
+            self.stage_started = None
+            self.stage_deadline = None
+
+    def cancel_current(self, discard_checkpoint: bool = True):
+        """
+        Interrupt the running job.
+
+        FFmpeg is killed and the engine stops at its next segment or window;
+        cancelling the task aborts whatever is awaited, including in-flight
+        LLM HTTP requests, and frees the worker for the next job.
+
+        Args:
+            discard_checkpoint: False when the job continues elsewhere and
+                should resume from its checkpoint
+        """
+        if self.current_task is None or self.current_task.done():
+            return
+        self._cancelling = True
+        self._discard_checkpoint = discard_checkpoint
+        self.ffmpeg.cancel()
+        if self.current_engine is not None:
+            self.current_engine.cancel()
+        self.current_task.cancel()
+
     async def process_job(self, job_id: str):
-        """Process a single job."""
+        """Process a single job, running every stage in sequence."""
         job = self.queue_manager.get_job(job_id)
         if not job:
             print(f"Job {job_id} not found")
@@ -48,122 +201,598 @@ class Worker:
             print(f"Video path exists: {Path(job.video_path).exists()}")
             print(f"Target language: {job.target_language}, LLM model: {job.llm_model}")
 
-            # Stage 1: Extract audio (0-40%)
+            # Reuse results of an identical upload with the same parameters
+            raw_transcript_path = await self.restore_from_cache(job_id, job)
+
+            if raw_transcript_path is None:
+                # Stage 1: Extract audio (0-40%)
+                audio = await self.run_with_retry(
+                    job_id, job, PipelineStage.EXTRACT,
+                    lambda: self.extract_audio(job_id, job)
+                )
+
+                # Stage 2: Transcribe (40-70%)
+                raw_transcript_path = await self.run_with_retry(
+                    job_id, job, PipelineStage.TRANSCRIBE,
+                    lambda: self.transcribe(job_id, job, audio)
+                )
+                # Release the PCM buffer before the (possibly long) LLM stage
+                del audio
+
+            # Stage 3: LLM Processing (70-100%)
+            if not job.transcript_path and self.needs_llm(job):
+                await self.run_llm(job_id, job, raw_transcript_path)
+
+            await self.complete_job(job_id, job, raw_transcript_path)
+
+        except Exception as e:
+            await self.fail_job(job_id, job, e)
+
+    async def run_stage(self, job_id: str, payload) -> Optional[Tuple[PipelineStage, Any]]:
+        """
+        Run this worker's stage for one job.
+
+        Returns:
+            (next stage, payload) to hand the job on, or None when the job
+            finished (completed, failed or served from cache)
+        """
+        job = self.queue_manager.get_job(job_id)
+        if not job:
+            print(f"Job {job_id} not found")
+            return None
+
+        try:
+            if self.stage == PipelineStage.EXTRACT:
+                raw_transcript_path = await self.restore_from_cache(job_id, job)
+                if raw_transcript_path is None:
+                    audio = await self.run_with_retry(
+                        job_id, job, PipelineStage.EXTRACT,
+                        lambda: self.extract_audio(job_id, job)
+                    )
+                    await self.queue_manager.update_job_progress(
+                        job_id,
+                        JobStatus.EXTRACTING_AUDIO,
+                        self.track_progress(job, PipelineStage.EXTRACT, 1.0),
+                        "Waiting for transcription",
+                        "Audio ready, waiting for a transcription worker"
+                    )
+                    return PipelineStage.TRANSCRIBE, audio
+
+            elif self.stage == PipelineStage.TRANSCRIBE:
+                raw_transcript_path = await self.run_with_retry(
+                    job_id, job, PipelineStage.TRANSCRIBE,
+                    lambda: self.transcribe(job_id, job, payload)
+                )
+                del payload
+
+            else:
+                raw_transcript_path = payload
+                await self.run_llm(job_id, job, raw_transcript_path)
+
+            if self.stage != PipelineStage.LLM and not job.transcript_path and self.needs_llm(job):
+                await self.queue_manager.update_job_progress(
+                    job_id,
+                    JobStatus.FORMATTING_LLM,
+                    self.track_progress(job, PipelineStage.TRANSCRIBE, 1.0),
+                    "Waiting for LLM",
+                    "Transcript ready, waiting for an LLM worker"
+                )
+                return PipelineStage.LLM, raw_transcript_path
+
+            await self.complete_job(job_id, job, raw_transcript_path)
+
+        except Exception as e:
+            await self.fail_job(job_id, job, e)
+
+        return None
+
+    async def run_with_retry(
+        self,
+        job_id: str,
+        job,
+        stage: PipelineStage,
+        attempt: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Run one stage, retrying transient failures with exponential backoff.
+
+        Only the failed stage is rerun: the inputs it was given (decoded
+        audio, raw transcript) are reused, and transcription resumes from
+        its checkpoint. The last error is raised once the stage's policy
+        gives up.
+        """
+        policy = RetryPolicy.for_stage(stage.value)
+        number = 1
+        while True:
+            self.begin_stage(job, stage)
+            try:
+                return await attempt()
+            except Exception as e:
+                if not policy.should_retry(number, e):
+                    raise
+                delay = policy.delay(number)
+                job.retries += 1
+                print(f"Worker {self.worker_id} {stage.value} attempt {number}/{policy.max_attempts} "
+                      f"failed for job {job_id}: {e}; retrying in {delay:.1f}s")
+                await self.queue_manager.update_job_progress(
+                    job_id,
+                    job.status,
+                    job.progress,
+                    f"Retrying {stage.value} in {delay:.0f}s "
+                    f"(attempt {number + 1}/{policy.max_attempts})",
+                    str(e)
+                )
+                # Backoff is not progress, but it is not a stall either
+                self.stage_running = None
+                self.beat()
+                await asyncio.sleep(delay)
+                number += 1
+
+    def begin_stage(self, job, stage: PipelineStage):
+        """Start the watchdog clock for one stage attempt."""
+        duration = job.media.duration if job.media else 0.0
+        now = time.monotonic()
+        self.stage_running = stage
+        self.stage_started = now
+        self.stage_deadline = now + stage_deadline(stage.value, duration)
+        self._beat_progress = (stage, -1.0)
+        self.beat()
+
+    def beat(self):
+        """Record that the current job made progress."""
+        self.heartbeat = time.monotonic()
+
+    def needs_llm(self, job) -> bool:
+        """Check if LLM formatting/translation was requested."""
+        return bool(job.target_language and job.llm_model)
+
+    async def run_llm(self, job_id: str, job, raw_transcript_path: str):
+        """Stage 3: LLM processing, caching the result."""
+        started = time.monotonic()
+        try:
+            await self.run_with_retry(
+                job_id, job, PipelineStage.LLM,
+                lambda: self.process_with_llm(job_id, job, raw_transcript_path)
+            )
+        except LLMStageError as e:
+            # Out of retries; deliver the raw transcript rather than fail the job
+            print(f"{e} for job {job_id}, using raw transcript")
+            job.transcript_path = raw_transcript_path
+            job.llm_processing_skipped = True
+            await self.queue_manager.update_job_progress(
+                job_id,
+                JobStatus.FORMATTING_LLM,
+                self.track_progress(job, PipelineStage.LLM, 0.95),
+                "LLM Processing",
+                f"{e}, using raw transcript"
+            )
+        if not job.llm_processing_skipped and job.media:
+            await asyncio.to_thread(
+                throughput_stats.record,
+                PipelineStage.LLM.value,
+                self.stage_profile(job, PipelineStage.LLM),
+                job.media.duration,
+                time.monotonic() - started
+            )
+        await asyncio.to_thread(self.store_final_in_cache, job)
+
+    async def complete_job(self, job_id: str, job, raw_transcript_path: str):
+        """Mark a job completed."""
+        if not job.transcript_path:
+            # No LLM processing, use raw transcript as final
+            job.transcript_path = raw_transcript_path
+            job.llm_processing_skipped = True
+
+        await self.queue_manager.update_job_progress(
+            job_id,
+            JobStatus.COMPLETED,
+            100,
+            "Completed",
+            "Job completed successfully"
+        )
+
+        print(f"Worker {self.worker_id} completed job {job_id}")
+
+    async def fail_job(self, job_id: str, job, error: Exception):
+        """Mark a job failed."""
+        error_msg = str(error)
+        print(f"Worker {self.worker_id} failed job {job_id}: {error_msg}")
+        self.queue_manager.clear_segments(job_id)
+        job.error_message = error_msg
+        await self.queue_manager.update_job_progress(
+            job_id,
+            JobStatus.FAILED,
+            job.progress,
+            "Failed",
+            f"Error: {error_msg}"
+        )
+
+    async def extract_audio(self, job_id: str, job):
+        """Stage 1: decode the job's audio. Returns a PCM buffer or WAV path."""
+        await self.queue_manager.update_job_progress(
+            job_id,
+            JobStatus.EXTRACTING_AUDIO,
+            self.track_progress(job, PipelineStage.EXTRACT, 0.0),
+            "Starting audio extraction",
+            "Initializing FFmpeg..."
+        )
+
+        async def ffmpeg_progress(progress: float, message: str):
+            overall_progress = self.track_progress(job, PipelineStage.EXTRACT, progress / 100)
             await self.queue_manager.update_job_progress(
                 job_id,
                 JobStatus.EXTRACTING_AUDIO,
-                0,
-                "Starting audio extraction",
-                "Initializing FFmpeg..."
+                overall_progress,
+                "Extracting audio",
+                message
             )
 
-            # Generate audio path in storage/audio directory
-            audio_filename = Path(job.filename).stem + ".wav"
-            audio_path = str(Path("storage/audio") / audio_filename)
+        if not Path(job.video_path).exists():
+            raise PermanentError(f"Upload not found: {job.video_path}")
 
-            async def ffmpeg_progress(progress: float, message: str):
-                # Map FFmpeg progress to 0-40%
-                overall_progress = progress * 0.4
-                await self.queue_manager.update_job_progress(
-                    job_id,
-                    JobStatus.EXTRACTING_AUDIO,
-                    overall_progress,
-                    "Extracting audio",
-                    message
-                )
+        # Media is normally probed at upload; probe here only for older jobs
+        if job.media is None:
+            job.media = await self.ffmpeg.probe(job.video_path)
+        duration = job.media.duration if job.media else 0.0
 
-            success = await self.ffmpeg.extract_audio(
+        audio_config = settings["audio"]
+        in_memory = audio_config["in_memory"] and duration <= audio_config["max_in_memory_seconds"]
+
+        # Already Whisper-ready audio (16 kHz mono PCM WAV) needs no FFmpeg pass
+        if job.media and job.media.is_whisper_ready and await asyncio.to_thread(is_whisper_ready_wav, job.video_path):
+            await ffmpeg_progress(100, "Audio is already 16 kHz mono PCM, skipping FFmpeg")
+            if not in_memory:
+                return job.video_path
+            return await asyncio.to_thread(read_wav, job.video_path)
+
+        started = time.monotonic()
+        if in_memory:
+            # Decode to an in-memory PCM buffer, no intermediate WAV
+            audio = await self.ffmpeg.decode_audio(
                 job.video_path,
-                audio_path,
-                ffmpeg_progress
+                ffmpeg_progress,
+                duration=duration
             )
+            if audio is None:
+                raise Exception("Audio extraction failed")
+            await asyncio.to_thread(
+                throughput_stats.record, PipelineStage.EXTRACT.value, FFMPEG_PROFILE,
+                duration, time.monotonic() - started
+            )
+            return audio
 
+        # Extract to a temp file and rename, so a killed run never leaves a truncated WAV
+        audio_path = audio_file(job_id)
+        tmp_path = temp_path(audio_path)
+        try:
+            success = await self.ffmpeg.extract_audio(
+                job.video_path,
+                str(tmp_path),
+                ffmpeg_progress,
+                duration=duration
+            )
             if not success:
                 raise Exception("Audio extraction failed")
+            await asyncio.to_thread(os.replace, tmp_path, audio_path)
+        finally:
+            await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+        audio_path = str(audio_path)
+        await asyncio.to_thread(
+            throughput_stats.record, PipelineStage.EXTRACT.value, FFMPEG_PROFILE,
+            duration, time.monotonic() - started
+        )
+
+        job.audio_path = audio_path
+        return audio_path
+
+    async def transcribe(self, job_id: str, job, audio) -> str:
+        """Stage 2: transcribe audio. Returns the raw transcript path."""
+        await self.queue_manager.update_job_progress(
+            job_id,
+            JobStatus.TRANSCRIBING,
+            self.track_progress(job, PipelineStage.TRANSCRIBE, 0.0),
+            "Starting transcription",
+            "Loading Whisper model..."
+        )
+
+        # Lazy initialize the job's transcription engine
+        engine = await asyncio.to_thread(self.get_engine, job.engine)
+        job.engine_used = engine.name
+
+        # Resume after the last segment committed by an earlier, interrupted run
+        checkpoint = TranscriptCheckpoint(job_id)
+        resume_offset = 0.0
+        # Segments streamed by a failed earlier attempt are replaced below
+        self.queue_manager.clear_segments(job_id)
+        if settings["checkpoint"]["enabled"]:
+            committed = await asyncio.to_thread(checkpoint.load)
+            resume_offset = checkpoint.resume_offset(committed)
+            for segment in committed:
+                await self.queue_manager.add_segment(job_id, segment)
+            if resume_offset > 0:
+                job.resumed_from = resume_offset
+                print(f"Worker {self.worker_id} resuming job {job_id} from {resume_offset:.1f}s "
+                      f"({len(committed)} segments checkpointed)")
+                audio = await asyncio.to_thread(trim_audio, audio, resume_offset)
+
+        # Long files are split on pauses and decoded across the process pool
+        if await asyncio.to_thread(should_parallelize, audio):
+            config = settings["transcription"]
+            # Resolved device, so the pool loads the same variant as the engine
+            engine = ParallelTranscriber(
+                engine.name, config["model_size"], engine.device, engine.beam_size
+            )
+            print(f"Worker {self.worker_id} using parallel transcription for job {job_id}")
 
-            job.audio_path = audio_path
+        # The engine writes a temp file that is renamed into place on success
+        raw_transcript_path = transcript_file(job_id, "raw_transcript.txt")
+        raw_transcript_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = temp_path(raw_transcript_path)
 
-            # Stage 2: Transcribe (40-70%)
+        async def whisper_progress(progress: float, message: str):
+            overall_progress = self.track_progress(job, PipelineStage.TRANSCRIBE, progress / 100, engine)
             await self.queue_manager.update_job_progress(
                 job_id,
                 JobStatus.TRANSCRIBING,
-                40,
-                "Starting transcription",
-                "Loading Whisper model..."
+                overall_progress,
+                "Transcribing",
+                message
             )
 
-            # Lazy initialize Whisper wrapper
-            if self.whisper is None:
-                try:
-                    self.whisper = WhisperWrapper()
-                    print(f"Worker {self.worker_id} initialized Whisper wrapper")
-                except Exception as e:
-                    raise Exception(f"Failed to initialize Whisper: {str(e)}")
-
-            # Generate raw transcript path in storage/transcripts directory
-            raw_transcript_filename = Path(job.filename).stem + "_raw_transcript.txt"
-            raw_transcript_path = str(Path("storage/transcripts") / raw_transcript_filename)
-
-            async def whisper_progress(progress: float, message: str):
-                # Map Whisper progress to 40-70%
-                overall_progress = 40 + (progress * 0.3)
-                await self.queue_manager.update_job_progress(
-                    job_id,
-                    JobStatus.TRANSCRIBING,
-                    overall_progress,
-                    "Transcribing",
-                    message
-                )
+        async def stream_segment(segment):
+            # Engines time segments from the start of the audio they were given
+            segment = {
+                "text": segment["text"],
+                "start": segment["start"] + resume_offset,
+                "end": segment["end"] + resume_offset
+            }
+            self.beat()
+            if settings["checkpoint"]["enabled"]:
+                await checkpoint.append(segment)
+            # Push each segment to clients as soon as it is decoded
+            await self.queue_manager.add_segment(job_id, segment)
+
+        async def inference_slot(acquired: bool):
+            if self.current_job_id != job_id:
+                # Late report from an attempt that was already abandoned
+                return
+            if acquired:
+                # The deadline covers decoding, not the queue for the model
+                self.begin_stage(job, PipelineStage.TRANSCRIBE)
+            else:
+                # Waiting for the model is not progress, but it is not a stall either
+                self.stage_running = None
+                self.beat()
 
-            success = await self.whisper.transcribe_with_progress(
-                audio_path,
-                raw_transcript_path,
-                whisper_progress
+        self.current_engine = engine
+        started = time.monotonic()
+        try:
+            success = await engine.transcribe_with_progress(
+                audio,
+                str(tmp_path),
+                whisper_progress,
+                stream_segment,
+                inference_slot
             )
-
             if not success:
                 raise Exception("Transcription failed")
+            await asyncio.to_thread(os.replace, tmp_path, raw_transcript_path)
+        finally:
+            self.current_engine = None
+            await asyncio.to_thread(checkpoint.close)
+            await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+        raw_transcript_path = str(raw_transcript_path)
+        await asyncio.to_thread(
+            throughput_stats.record, PipelineStage.TRANSCRIBE.value, engine.profile(),
+            get_audio_duration(audio), time.monotonic() - started
+        )
 
-            job.transcript_raw_path = raw_transcript_path
-
-            # Stage 3: LLM Processing (70-100%)
-            # Check if LLM processing is needed
-            if job.target_language and job.llm_model:
-                await self.process_with_llm(job_id, job, raw_transcript_path)
-            else:
-                # No LLM processing, use raw transcript as final
-                job.transcript_path = raw_transcript_path
-                job.llm_processing_skipped = True
+        segments = self.queue_manager.get_segments(job_id) or []
+        if resume_offset > 0:
+            # The engine only saw the tail, rebuild the transcript from every segment
+            await asyncio.to_thread(
+                atomic_write_text, raw_transcript_path, format_segments_with_pauses(segments)
+            )
 
-            # Complete
-            await self.queue_manager.update_job_progress(
-                job_id,
-                JobStatus.COMPLETED,
-                100,
-                "Completed",
-                "Job completed successfully"
+        job.transcript_raw_path = raw_transcript_path
+
+        # Keep the timed segments next to the transcript for /segments
+        segments_path = str(transcript_file(job_id, "segments.json"))
+        await asyncio.to_thread(atomic_write_text, segments_path, json.dumps(segments, ensure_ascii=False))
+        job.segments_path = segments_path
+        self.queue_manager.clear_segments(job_id)
+        await asyncio.to_thread(checkpoint.remove)
+
+        await asyncio.to_thread(self.store_transcript_in_cache, job, raw_transcript_path, segments)
+        return raw_transcript_path
+
+    # ============== Progress and ETA ==============
+
+    def stage_profile(self, job, stage: PipelineStage, engine=None) -> Profile:
+        """Key a stage's speed is recorded and looked up under."""
+        if stage == PipelineStage.EXTRACT:
+            return FFMPEG_PROFILE
+        if stage == PipelineStage.TRANSCRIBE:
+            if engine is not None:
+                return engine.profile()
+            # Engine not created yet; its device may still read "auto"
+            config = settings["transcription"]
+            return (resolve_engine_name(job.engine), config["model_size"], config["device"])
+        return (llm_service.config.get("provider", "ollama"), job.llm_model or "", "")
+
+    def track_progress(self, job, stage: PipelineStage, fraction: float, engine=None) -> float:
+        """
+        Overall job progress for a fraction of one stage; also updates the ETA.
+
+        Stages are weighted by their predicted duration for this job's media,
+        from measured throughput, so the percentage tracks elapsed work.
+        """
+        duration = job.media.duration if job.media else 0.0
+        fraction = min(max(fraction, 0.0), 1.0)
+        if duration <= 0:
+            self._beat_if_advanced(stage, fraction)
+            start, end = LEGACY_BANDS[stage.value]
+            return start + fraction * (end - start)
+
+        stages = [PipelineStage.EXTRACT, PipelineStage.TRANSCRIBE]
+        if self.needs_llm(job):
+            stages.append(PipelineStage.LLM)
+
+        done = remaining = 0.0
+        for index, other in enumerate(stages):
+            seconds = throughput_stats.estimate(
+                other.value, self.stage_profile(job, other, engine), duration
             )
+            if index < stages.index(stage):
+                done += seconds
+            elif other == stage:
+                done += fraction * seconds
+                remaining += (1 - fraction) * seconds
+            else:
+                remaining += seconds
+
+        job.eta_seconds = round(remaining, 1)
+        job.estimated_completion_at = datetime.now() + timedelta(seconds=remaining)
+        self._beat_if_advanced(stage, fraction)
+        total = done + remaining
+        # Never move backwards, and leave 100% for completion
+        return min(max(job.progress, done / total * 100 if total else 0.0), 99.0)
+
+    def _beat_if_advanced(self, stage: PipelineStage, fraction: float):
+        """Heartbeat only on real progress; repeated identical updates do not count."""
+        last_stage, last_fraction = self._beat_progress
+        if stage != last_stage or fraction > last_fraction:
+            self._beat_progress = (stage, fraction)
+            self.beat()
+
+    # ============== Transcript cache ==============
+
+    def _cache_keys(self, job):
+        """Cache keys for the job's transcript and final (LLM) output."""
+        engine_name = resolve_engine_name(job.engine)
+        engine = self.engines.get(engine_name)
+        transcript_key = make_key(
+            "transcript",
+            job.content_hash,
+            engine_name,
+            settings["transcription"]["model_size"],
+            engine.beam_size if engine else None,
+            None  # language (auto-detect)
+        )
+        final_key = make_key("final", transcript_key, job.target_language, job.llm_model)
+        return transcript_key, final_key
+
+    async def restore_from_cache(self, job_id: str, job):
+        """
+        Fill in the job's transcripts from the cache.
+
+        Returns:
+            Raw transcript path on a hit (job.transcript_path is also set
+            when the final LLM output was cached), or None on a miss
+        """
+        if not settings["cache"]["enabled"]:
+            return None
+
+        if job.content_hash is None:
+            job.content_hash = await asyncio.to_thread(hash_file, job.video_path)
+
+        # The engine supplies beam_size for the key
+        await asyncio.to_thread(self.get_engine, job.engine)
+        transcript_key, final_key = self._cache_keys(job)
+        wants_llm = bool(job.target_language and job.llm_model)
+
+        # One job is one lookup, counted once however many keys it tries
+        entry = await asyncio.to_thread(transcript_cache.get, final_key, False) if wants_llm else None
+        if entry is None:
+            entry = await asyncio.to_thread(transcript_cache.get, transcript_key, False)
+        transcript_cache.record_lookup(entry is not None)
+        if entry is None:
+            return None
+
+        print(f"Worker {self.worker_id} cache hit for job {job_id}")
+        raw_transcript_path = str(transcript_file(job_id, "raw_transcript.txt"))
+        await asyncio.to_thread(atomic_write_text, raw_transcript_path, entry["files"]["raw.txt"])
+        job.transcript_raw_path = raw_transcript_path
+        job.engine_used = entry["meta"].get("engine")
+        job.cache_hit = True
+
+        if "segments.json" in entry["files"]:
+            segments_path = str(transcript_file(job_id, "segments.json"))
+            await asyncio.to_thread(atomic_write_text, segments_path, entry["files"]["segments.json"])
+            job.segments_path = segments_path
+
+        if "final.txt" in entry["files"]:
+            final_transcript_path = str(transcript_file(job_id, "transcript.txt"))
+            await asyncio.to_thread(atomic_write_text, final_transcript_path, entry["files"]["final.txt"])
+            job.transcript_path = final_transcript_path
+            job.detected_language = entry["meta"].get("detected_language")
+            job.llm_model_used = entry["meta"].get("llm_model_used")
 
-            print(f"Worker {self.worker_id} completed job {job_id}")
+        return raw_transcript_path
 
+    def store_transcript_in_cache(self, job, raw_transcript_path: str, segments):
+        """Cache the raw transcript and its segments (blocking, run in a thread)."""
+        if not settings["cache"]["enabled"] or job.content_hash is None:
+            return
+        try:
+            transcript_key, _ = self._cache_keys(job)
+            transcript_cache.put(
+                transcript_key,
+                {
+                    "raw.txt": Path(raw_transcript_path).read_text(encoding='utf-8'),
+                    "segments.json": json.dumps(segments, ensure_ascii=False)
+                },
+                {"engine": job.engine_used}
+            )
         except Exception as e:
-            error_msg = str(e)
-            print(f"Worker {self.worker_id} failed job {job_id}: {error_msg}")
-            job.error_message = error_msg
-            await self.queue_manager.update_job_progress(
-                job_id,
-                JobStatus.FAILED,
-                job.progress,
-                "Failed",
-                f"Error: {error_msg}"
+            print(f"Error caching transcript for job {job.id}: {e}")
+
+    def store_final_in_cache(self, job):
+        """Cache the LLM-processed transcript, if LLM processing succeeded (blocking, run in a thread)."""
+        if not settings["cache"]["enabled"] or job.content_hash is None:
+            return
+        if job.llm_processing_skipped or not job.transcript_path:
+            return
+        try:
+            _, final_key = self._cache_keys(job)
+            transcript_cache.put(
+                final_key,
+                {
+                    "raw.txt": Path(job.transcript_raw_path).read_text(encoding='utf-8'),
+                    "final.txt": Path(job.transcript_path).read_text(encoding='utf-8'),
+                    **(
+                        {"segments.json": Path(job.segments_path).read_text(encoding='utf-8')}
+                        if job.segments_path and Path(job.segments_path).exists() else {}
+                    )
+                },
+                {
+                    "engine": job.engine_used,
+                    "detected_language": job.detected_language,
+                    "llm_model_used": job.llm_model_used
+                }
             )
+        except Exception as e:
+            print(f"Error caching final transcript for job {job.id}: {e}")
+
+    def get_engine(self, name=None) -> BaseTranscriptionEngine:
+        """Get this worker's engine instance, creating it on first use."""
+        engine_name = resolve_engine_name(name)
+        if engine_name not in self.engines:
+            try:
+                self.engines[engine_name] = create_engine(engine_name)
+                print(f"Worker {self.worker_id} initialized {engine_name} engine")
+            except Exception as e:
+                # A missing backend will not appear on retry
+                error = PermanentError if isinstance(e, ImportError) else Exception
+                raise error(f"Failed to initialize {engine_name}: {str(e)}")
+        return self.engines[engine_name]
 
     async def process_with_llm(self, job_id: str, job, raw_transcript_path: str):
         """Process transcript with LLM for formatting and/or translation."""
         await self.queue_manager.update_job_progress(
             job_id,
             JobStatus.FORMATTING_LLM,
-            70,
+            self.track_progress(job, PipelineStage.LLM, 0.0),
             "LLM Processing",
             "Checking LLM service..."
         )
@@ -173,20 +802,24 @@ class Worker:
         provider = status.get("provider", "ollama")
         provider_status = status.get(provider, {})
 
+        if not status.get("enabled", True):
+            raise LLMStageSkipped("LLM disabled")
         if not provider_status or not provider_status.get("available", False):
             error_msg = provider_status.get("error", "LLM service not available") if provider_status else "LLM service not configured"
             print(f"LLM service not available: {error_msg}")
-            job.transcript_path = raw_transcript_path
-            job.llm_processing_skipped = True
-            await self.queue_manager.update_job_progress(
-                job_id,
-                JobStatus.FORMATTING_LLM,
-                95,
-                "LLM Processing",
-                f"LLM unavailable ({provider}), using raw transcript"
-            )
-            return
+            # Only a server that is down or busy may come back before the next attempt
+            retryable = bool(provider_status) and provider_status.get("retryable", False)
+            error = LLMStageError if retryable else LLMStageSkipped
+            raise error(f"LLM unavailable ({provider}: {error_msg})")
+
+        try:
+            await self.run_llm_requests(job_id, job, raw_transcript_path)
+        except LLMRequestError as e:
+            error = LLMStageError if e.retryable else LLMStageSkipped
+            raise error(f"LLM request failed ({e})")
 
+    async def run_llm_requests(self, job_id: str, job, raw_transcript_path: str):
+        """Detect the language, then format or translate the transcript."""
         # Read raw transcript
         with open(raw_transcript_path, 'r', encoding='utf-8') as f:
             raw_text = f.read()
@@ -200,7 +833,7 @@ class Worker:
         await self.queue_manager.update_job_progress(
             job_id,
             JobStatus.FORMATTING_LLM,
-            75,
+            self.track_progress(job, PipelineStage.LLM, 0.05),
             "LLM Processing",
             "Detecting source language..."
         )
@@ -210,13 +843,12 @@ class Worker:
         print(f"Detected language: {detected_lang}, Target language: {job.target_language}")
 
         # Generate final transcript path
-        final_transcript_filename = Path(job.filename).stem + "_transcript.txt"
-        final_transcript_path = str(Path("storage/transcripts") / final_transcript_filename)
+        final_transcript_path = str(transcript_file(job_id, "transcript.txt"))
 
         # Progress callback for LLM operations
         async def llm_progress(progress: float, message: str):
-            # Map LLM progress to 80-95%
-            overall_progress = 80 + (progress * 0.15)
+            # Formatting/translation is the bulk of the stage (10-95%)
+            overall_progress = self.track_progress(job, PipelineStage.LLM, 0.1 + progress / 100 * 0.85)
             await self.queue_manager.update_job_progress(
                 job_id,
                 JobStatus.FORMATTING_LLM,
@@ -231,7 +863,7 @@ class Worker:
             await self.queue_manager.update_job_progress(
                 job_id,
                 JobStatus.FORMATTING_LLM,
-                80,
+                self.track_progress(job, PipelineStage.LLM, 0.1),
                 "LLM Processing",
                 "Source and target language match, formatting only..."
             )
@@ -245,7 +877,7 @@ class Worker:
             await self.queue_manager.update_job_progress(
                 job_id,
                 JobStatus.FORMATTING_LLM,
-                80,
+                self.track_progress(job, PipelineStage.LLM, 0.1),
                 "LLM Processing",
                 f"Translating to {job.target_language}..."
             )
@@ -256,22 +888,19 @@ class Worker:
                 llm_progress
             )
 
+        if not processed_text:
+            # An empty answer comes back the same on retry
+            raise LLMStageSkipped("LLM processing failed")
+
         # Save processed transcript
-        if processed_text:
-            with open(final_transcript_path, 'w', encoding='utf-8') as f:
-                f.write(processed_text)
-            job.transcript_path = final_transcript_path
-            job.llm_model_used = job.llm_model
-        else:
-            # LLM processing failed, fall back to raw transcript
-            job.transcript_path = raw_transcript_path
-            job.llm_processing_skipped = True
-            print(f"LLM processing failed for job {job_id}, using raw transcript")
+        await asyncio.to_thread(atomic_write_text, final_transcript_path, processed_text)
+        job.transcript_path = final_transcript_path
+        job.llm_model_used = job.llm_model
 
         await self.queue_manager.update_job_progress(
             job_id,
             JobStatus.FORMATTING_LLM,
-            95,
+            self.track_progress(job, PipelineStage.LLM, 0.95),
             "LLM Processing",
             "LLM processing complete"
         )
@@ -280,3 +909,77 @@ class Worker:
         """Stop worker."""
         self.running = False
         print(f"Worker {self.worker_id} stopped")
+
+
+class Pipeline:
+    """
+    Staged worker pools: extraction, transcription and LLM each get their
+    own queue and separately sized pool, so a job waiting on the LLM does
+    not hold transcription capacity and extraction overlaps decoding.
+    """
+
+    def __init__(self, queue_manager: QueueManager, sizes: Dict[str, int], handoff_limit: int):
+        """
+        Initialize pipeline.
+
+        Args:
+            queue_manager: Shared queue manager (feeds the extraction stage)
+            sizes: Worker count per stage name
+            handoff_limit: Max extracted jobs waiting for transcription;
+                extractors block beyond this so decoded audio stays bounded
+        """
+        self.queue_manager = queue_manager
+        self.sizes = sizes
+        self.queues: Dict[PipelineStage, asyncio.Queue] = {
+            PipelineStage.TRANSCRIBE: asyncio.Queue(maxsize=max(1, handoff_limit)),
+            PipelineStage.LLM: asyncio.Queue()
+        }
+        self.workers: List[Worker] = []
+
+    def start(self, first_worker_id: int = 0) -> List[Worker]:
+        """Create and start every stage's workers."""
+        worker_id = first_worker_id
+        for stage in PipelineStage:
+            for _ in range(self.sizes.get(stage.value, 1)):
+                worker = self.add_worker(stage, worker_id)
+                asyncio.create_task(worker.start())
+                worker_id += 1
+        return list(self.workers)
+
+    def add_worker(self, stage: PipelineStage, worker_id: int) -> Worker:
+        """Create (but do not start) a worker for one stage."""
+        worker = Worker(worker_id, self.queue_manager, stage=stage, pipeline=self)
+        self.workers.append(worker)
+        return worker
+
+    def discard_worker(self, worker: Worker):
+        """Forget a worker that has exited."""
+        if worker in self.workers:
+            self.workers.remove(worker)
+
+    def backlog(self, stage: PipelineStage) -> int:
+        """Jobs waiting for a stage, including those not yet extracted."""
+        waiting = self.queue_manager.get_queue_size()
+        if stage != PipelineStage.EXTRACT:
+            waiting += self.queues[PipelineStage.TRANSCRIBE].qsize()
+        if stage == PipelineStage.LLM:
+            waiting += self.queues[PipelineStage.LLM].qsize()
+        return waiting
+
+    def stop(self):
+        """Stop every stage's workers."""
+        for worker in self.workers:
+            worker.stop()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Per-stage pool size and backlog."""
+        return {
+            stage.value: {
+                "workers": len([w for w in self.workers if w.stage == stage]),
+                "waiting": (
+                    self.queue_manager.get_queue_size() if stage == PipelineStage.EXTRACT
+                    else self.queues[stage].qsize()
+                )
+            }
+            for stage in PipelineStage
+        }
@@ -1,29 +1,73 @@
 """FastAPI main application."""
 
-from fastapi import FastAPI, UploadFile, File, WebSocket, WebSocketDisconnect, HTTPException, Form
+from fastapi import FastAPI, UploadFile, File, WebSocket, WebSocketDisconnect, HTTPException, Form, Header, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from pathlib import Path
-import shutil
+from starlette.requests import ClientDisconnect
 import asyncio
+import hashlib
+import json
 import logging
 from typing import List, Optional
 from contextlib import asynccontextmanager
-
-from .core.queue_manager import QueueManager
-from .core.worker import Worker
+from uuid import uuid4
+
+from .core.queue_manager import QueueManager, TERMINAL_STATUSES
+from .core.admission import admission, AdmissionRejected
+from .core.job_store import JobStore
+from .core.broker import JobBroker
+from .core.worker import Worker, Pipeline, PipelineStage
+from .core.autoscaler import WorkerSupervisor, get_max_workers
+from .core.watchdog import Watchdog
+from .config import settings
+from .core.ffmpeg_processor import FFmpegProcessor
 from .core.llm_service import llm_service
+from .core.model_registry import model_registry
+from .core.model_policy import model_policy
+from .core.transcription_engine import list_engines
+from .core.parallel_transcriber import shutdown_pool
+from .core.transcript_cache import transcript_cache
+from .core.throughput_stats import throughput_stats
+from .core.storage import STORAGE_DIRS, clean_incoming, incoming_path, store_upload
+from .core.uploads import (
+    upload_manager, save_stream, iter_file, parse_upload_metadata, UploadRejected, TUS_VERSION
+)
 from .models import (
-    Job, OllamaConfig, OllamaStatus, OpenRouterConfig, OpenRouterStatus,
-    LLMConfig, LLMStatus, LLMProvider, SupportedLanguage, SUPPORTED_LANGUAGES
+    Job, JobStatus, MediaInfo, OllamaConfig, OllamaStatus, OpenRouterConfig, OpenRouterStatus,
+    LLMConfig, LLMStatus, LLMProvider, SupportedLanguage, SUPPORTED_LANGUAGES,
+    TranscriptionEngine, TranscriptSegment
 )
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
 # Global queue manager and workers
-queue_manager = QueueManager(max_workers=2)
+queue_manager = QueueManager(
+    max_workers=get_max_workers(),
+    store=JobStore(
+        Path(settings["job_store"]["path"]),
+        flush_interval=settings["job_store"]["flush_interval"]
+    ) if settings["job_store"]["enabled"] else None,
+    broker=JobBroker(
+        Path(settings["broker"]["path"])
+    ) if settings["broker"]["enabled"] else None
+)
 workers = []
+pipeline: Optional[Pipeline] = None
+# Scales the transcription pool (or the whole-job pool without the pipeline)
+supervisor: Optional[WorkerSupervisor] = None
+
+
+def all_workers() -> List[Worker]:
+    """Fixed workers plus those the supervisor currently runs or drains."""
+    if supervisor is None:
+        return list(workers)
+    return workers + supervisor.workers + supervisor.draining
+
+
+# Recovers jobs whose stage hangs or overruns its deadline
+watchdog = Watchdog(queue_manager, all_workers)
 
 
 @asynccontextmanager
@@ -33,24 +77,81 @@ async def lifespan(app: FastAPI):
     print("Starting up application...", flush=True)
 
     # Create storage directories
-    Path("storage/uploads").mkdir(parents=True, exist_ok=True)
-    Path("storage/audio").mkdir(parents=True, exist_ok=True)
-    Path("storage/transcripts").mkdir(parents=True, exist_ok=True)
+    for directory in STORAGE_DIRS:
+        directory.mkdir(parents=True, exist_ok=True)
     print("Storage directories created", flush=True)
 
+    # Drop uploads abandoned while the server was down
+    upload_manager.expire()
+    clean_incoming()
+
+    # Restore job history and requeue jobs interrupted by the last shutdown
+    await queue_manager.start()
+
+    # Warm the models up (before serving, with models.block_startup);
+    # in broker mode the worker nodes run the models instead
+    await model_policy.start(
+        block=settings["models"]["block_startup"],
+        runs_models=queue_manager.broker is None
+    )
+
     # Start workers
-    for i in range(queue_manager.max_workers):
-        worker = Worker(i, queue_manager)
-        workers.append(worker)
-        asyncio.create_task(worker.start())
-    print(f"Started {queue_manager.max_workers} workers", flush=True)
+    global pipeline, supervisor
+    pipeline_config = settings["pipeline"]
+    if queue_manager.broker:
+        # Jobs run on worker nodes; this process only relays their progress
+        print("Broker mode: start workers with `python -m app.worker_node`", flush=True)
+    elif pipeline_config["enabled"]:
+        # One pool per stage so extraction, ASR and LLM work overlap;
+        # the supervisor owns the transcription pool
+        pipeline = Pipeline(
+            queue_manager,
+            sizes={
+                "extract": pipeline_config["extract_workers"],
+                "transcribe": 0,
+                "llm": pipeline_config["llm_workers"]
+            },
+            handoff_limit=pipeline_config["handoff_limit"]
+        )
+        workers.extend(pipeline.start())
+        supervisor = WorkerSupervisor(
+            spawn=lambda worker_id: pipeline.add_worker(PipelineStage.TRANSCRIBE, worker_id),
+            backlog=lambda: pipeline.backlog(PipelineStage.TRANSCRIBE),
+            discard=pipeline.discard_worker,
+            first_worker_id=len(workers),
+            inference_slots=model_registry.inference_slots,
+            add_inference_slot=model_registry.add_inference_slot
+        )
+        supervisor.start(pipeline_config["transcribe_workers"])
+        print(f"Started staged pipeline: {pipeline.get_status()}", flush=True)
+    else:
+        supervisor = WorkerSupervisor(
+            spawn=lambda worker_id: Worker(worker_id, queue_manager),
+            backlog=queue_manager.get_queue_size
+        )
+        supervisor.start(settings["autoscale"]["min_workers"])
+        print(f"Started {len(supervisor.workers)} workers", flush=True)
+    if supervisor:
+        print(
+            f"Autoscaling {'on' if supervisor.enabled else 'off'}: "
+            f"{supervisor.min_workers}-{supervisor.max_workers} workers",
+            flush=True
+        )
+        if settings["watchdog"]["enabled"]:
+            watchdog.start()
 
     yield
 
     # Shutdown
     print("Shutting down application...", flush=True)
+    model_policy.stop()
+    watchdog.stop()
+    if supervisor:
+        supervisor.stop()
     for worker in workers:
         worker.stop()
+    shutdown_pool()
+    await queue_manager.shutdown()
     print("Workers stopped", flush=True)
 
 
@@ -61,13 +162,62 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# CORS middleware
+@app.middleware("http")
+async def upload_admission(request: Request, call_next):
+    """Reject uploads before their body is read when a queue or disk limit is reached."""
+    if (
+        request.method == "POST"
+        and request.url.path in ("/api/upload", "/api/uploads")
+        and settings["admission"]["enabled"]
+    ):
+        try:
+            # A resumable upload declares its size up front
+            size = request.headers.get("upload-length") or request.headers.get("content-length")
+            admission.check(
+                queue_manager.get_unfinished_jobs(),
+                incoming_bytes=int(size) if (size or "").isdigit() else 0
+            )
+        except AdmissionRejected as e:
+            return JSONResponse(
+                status_code=429,
+                content={"detail": e.reason},
+                headers={"Retry-After": str(e.retry_after)}
+            )
+    return await call_next(request)
+
+
+# 409 detail for a retry that arrives while the first upload with its key is running
+IDEMPOTENCY_CONFLICT = "An upload with this Idempotency-Key is still in progress"
+
+
+@app.middleware("http")
+async def upload_idempotency(request: Request, call_next):
+    """Answer a repeated upload with its existing job before the body is read."""
+    if request.method == "POST" and request.url.path == "/api/upload":
+        key = request.headers.get("idempotency-key")
+        job = queue_manager.find_by_idempotency_key(key)
+        if job:
+            return JSONResponse(
+                content=job.model_dump(mode="json"),
+                headers={"Idempotent-Replayed": "true"}
+            )
+        if queue_manager.idempotency_key_pending(key):
+            return JSONResponse(status_code=409, content={"detail": IDEMPOTENCY_CONFLICT})
+    return await call_next(request)
+
+
+# CORS middleware (added last so it also wraps the responses above)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],  # React dev server
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "Location", "Retry-After", "Idempotent-Replayed",
+        "Tus-Resumable", "Upload-Offset", "Upload-Length", "X-Next-Cursor", "Link",
+        "ETag", "X-Sequence"
+    ],
 )
 
 
@@ -79,12 +229,16 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "upload": "POST /api/upload",
+            "resumable_upload": "POST /api/uploads, HEAD/PATCH/DELETE /api/uploads/{upload_id} (tus 1.0)",
             "jobs": "GET /api/jobs",
             "job": "GET /api/jobs/{job_id}",
+            "cancel": "DELETE /api/jobs/{job_id} or POST /api/jobs/{job_id}/cancel",
+            "segments": "GET /api/jobs/{job_id}/segments",
             "download": "GET /api/download/{job_id}",
             "download_raw": "GET /api/download/{job_id}/raw",
             "websocket": "WS /ws",
             "status": "GET /api/status",
+            "ready": "GET /api/ready",
             "llm_config": "GET/PUT /api/config/llm",
             "llm_status": "GET /api/llm/status",
             "llm_models": "GET /api/llm/models",
@@ -93,7 +247,8 @@ async def root():
             "ollama_models": "GET /api/ollama/models",
             "openrouter_status": "GET /api/openrouter/status",
             "openrouter_models": "GET /api/openrouter/models",
-            "languages": "GET /api/languages"
+            "languages": "GET /api/languages",
+            "engines": "GET /api/engines"
         }
     }
 
@@ -101,44 +256,74 @@ async def root():
 @app.get("/api/status")
 async def get_status():
     """Get system status including worker information."""
+    current = all_workers()
+    counts = queue_manager.status_counts()
     return {
         "workers": {
-            "count": len(workers),
+            "count": len(current),
             "max_workers": queue_manager.max_workers,
-            "running": [w.running for w in workers],
-            "worker_ids": [w.worker_id for w in workers]
+            "running": [w.running for w in current],
+            "worker_ids": [w.worker_id for w in current],
+            "stages": [w.stage.value if w.stage else None for w in current]
         },
+        "autoscale": supervisor.stats() if supervisor else None,
+        "watchdog": watchdog.stats(),
+        "pipeline": pipeline.get_status() if pipeline else None,
+        "broker": queue_manager.broker.counts() if queue_manager.broker else None,
         "queue": {
             "size": queue_manager.get_queue_size(),
+            "policy": queue_manager.job_queue.policy,
+            "order": queue_manager.job_queue.snapshot()[:20],
             "total_jobs": len(queue_manager.jobs)
         },
+        # Maintained on every status change, not counted per request
         "jobs": {
             "total": len(queue_manager.jobs),
-            "queued": len([j for j in queue_manager.jobs.values() if j.status.value == "queued"]),
-            "processing": len([j for j in queue_manager.jobs.values() if j.status.value in ["extracting_audio", "transcribing"]]),
-            "completed": len([j for j in queue_manager.jobs.values() if j.status.value == "completed"]),
-            "failed": len([j for j in queue_manager.jobs.values() if j.status.value == "failed"])
-        }
+            "queued": counts["queued"],
+            "processing": counts["extracting_audio"] + counts["transcribing"],
+            "completed": counts["completed"],
+            "failed": counts["failed"],
+            "cancelled": counts["cancelled"],
+            "by_status": counts
+        },
+        "models": model_registry.stats(),
+        "model_policy": model_policy.stats(),
+        "cache": transcript_cache.stats(),
+        "admission": admission.stats(queue_manager.get_unfinished_jobs()),
+        "throughput": throughput_stats.stats()
     }
 
 
-@app.post("/api/upload", response_model=Job)
-async def upload_video(
-    file: UploadFile = File(...),
-    target_language: Optional[str] = Form(None),
-    llm_model: Optional[str] = Form(None)
+@app.get("/api/ready")
+async def get_ready():
+    """Readiness probe: 503 until the models are warmed up."""
+    stats = model_policy.stats()
+    if not stats["ready"]:
+        return JSONResponse(status_code=503, content=stats)
+    return stats
+
+
+VIDEO_EXTENSIONS = {".mp4", ".avi", ".mkv", ".mov", ".webm", ".flv", ".wmv"}
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".flac", ".m4a", ".ogg", ".opus"}
+ALLOWED_EXTENSIONS = VIDEO_EXTENSIONS | AUDIO_EXTENSIONS
+
+
+def validate_upload_options(
+    filename: Optional[str],
+    target_language: Optional[str],
+    engine: Optional[str],
+    priority: int
 ):
-    """Upload video file and add to processing queue."""
-    if not file.filename:
+    """Raise HTTPException for an unsupported file type or job option."""
+    if not filename:
         raise HTTPException(status_code=400, detail="No filename provided")
 
     # Validate file extension
-    allowed_extensions = {".mp4", ".avi", ".mkv", ".mov", ".webm", ".flv", ".wmv"}
-    file_ext = Path(file.filename).suffix.lower()
-    if file_ext not in allowed_extensions:
+    file_ext = Path(filename).suffix.lower()
+    if file_ext not in ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported file format. Allowed: {', '.join(allowed_extensions)}"
+            detail=f"Unsupported file format. Allowed: {', '.join(sorted(ALLOWED_EXTENSIONS))}"
         )
 
     # Validate target_language if provided
@@ -150,41 +335,416 @@ async def upload_video(
                 detail=f"Unsupported language. Allowed: {', '.join(valid_codes)}"
             )
 
-    # Save uploaded file
-    video_path = Path("storage/uploads") / file.filename
+    # Validate engine if provided
+    if engine:
+        valid_engines = [e.value for e in TranscriptionEngine]
+        if engine not in valid_engines:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported engine. Allowed: {', '.join(valid_engines)}"
+            )
+
+    # Validate priority
+    if not -10 <= priority <= 10:
+        raise HTTPException(status_code=400, detail="Priority must be between -10 and 10")
+
+
+async def admit_upload(path: Path) -> Optional[MediaInfo]:
+    """
+    Probe a received upload and re-check admission now that its duration
+    is known. Raises 400 for media without audio, 429 when the queue is
+    full; the file is left for the caller to keep or delete.
+
+    Returns:
+        MediaInfo, or None if ffprobe failed
+    """
+    # Probe once; every stage reuses the result stored on the job
+    media = await FFmpegProcessor().probe(str(path))
+    if media is not None and media.audio_stream is None:
+        raise HTTPException(status_code=400, detail="File has no audio stream")
+
+    if settings["admission"]["enabled"]:
+        try:
+            admission.check(
+                queue_manager.get_unfinished_jobs(),
+                incoming_seconds=media.duration if media else 0.0
+            )
+        except AdmissionRejected as e:
+            raise HTTPException(
+                status_code=429,
+                detail=e.reason,
+                headers={"Retry-After": str(e.retry_after)}
+            )
+    return media
+
+
+async def enqueue_upload(
+    response: Response,
+    video_path: Path,
+    filename: str,
+    content_hash: str,
+    target_language: Optional[str] = None,
+    llm_model: Optional[str] = None,
+    engine: Optional[str] = None,
+    priority: int = 0,
+    idempotency_key: Optional[str] = None,
+    job_id: Optional[str] = None,
+    media: Optional[MediaInfo] = None
+) -> Job:
+    """
+    Probe a received upload, re-check admission and queue it.
+
+    The upload is rejected from storage/uploads/incoming, or once accepted
+    moved into the content-addressed store and linked under the new job's id
+    (job_id if the caller reserved one along with its Idempotency-Key).
+    Callers that already admitted the upload pass its media info.
+    """
+    if media is None:
+        try:
+            media = await admit_upload(video_path)
+        except HTTPException:
+            video_path.unlink(missing_ok=True)
+            raise
+
+    job_id = job_id or str(uuid4())
+    file_size = video_path.stat().st_size
     try:
-        with video_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        video_path = await asyncio.to_thread(store_upload, video_path, content_hash, job_id, filename)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
+        video_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=500, detail=f"Failed to store file: {str(e)}")
 
     # Add to queue with language and model info
     job = await queue_manager.add_job(
-        filename=file.filename,
-        file_size=video_path.stat().st_size,
+        job_id=job_id,
+        filename=filename,
+        file_size=file_size,
         video_path=str(video_path),
         target_language=target_language,
-        llm_model=llm_model
+        llm_model=llm_model,
+        engine=engine,
+        media=media,
+        priority=priority,
+        idempotency_key=idempotency_key,
+        content_hash=content_hash
     )
 
     return job
 
 
+@app.post("/api/upload", response_model=Job)
+async def upload_video(
+    response: Response,
+    file: UploadFile = File(...),
+    target_language: Optional[str] = Form(None),
+    llm_model: Optional[str] = Form(None),
+    engine: Optional[str] = Form(None),
+    priority: int = Form(0),
+    idempotency_key: Optional[str] = Header(None)
+):
+    """
+    Upload a video or audio file and add it to the processing queue.
+
+    Uploads sent with the same Idempotency-Key header return the job the
+    first one created instead of queueing a duplicate. Large files should
+    use the resumable /api/uploads endpoints instead.
+    """
+    if idempotency_key is not None and not 0 < len(idempotency_key) <= 255:
+        raise HTTPException(status_code=400, detail="Idempotency-Key must be 1-255 characters")
+    existing = queue_manager.find_by_idempotency_key(idempotency_key)
+    if existing:
+        response.headers["Idempotent-Replayed"] = "true"
+        return existing
+
+    validate_upload_options(file.filename, target_language, engine, priority)
+
+    # Claim the key before the first await, so a concurrent retry with the
+    # same key is turned away instead of creating a second job
+    job_id = str(uuid4())
+    if not queue_manager.reserve_idempotency_key(idempotency_key, job_id):
+        raise HTTPException(status_code=409, detail=IDEMPOTENCY_CONFLICT)
+
+    try:
+        # Stream to disk off the event loop, hashing and sniffing on the way
+        video_path = incoming_path(file.filename)
+        try:
+            writer = await save_stream(
+                iter_file(file, settings["uploads"]["chunk_size"]), video_path
+            )
+        except UploadRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=e.reason)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
+
+        return await enqueue_upload(
+            response,
+            video_path,
+            file.filename,
+            await writer.hexdigest(),
+            target_language=target_language,
+            llm_model=llm_model,
+            engine=engine,
+            priority=priority,
+            idempotency_key=idempotency_key,
+            job_id=job_id
+        )
+    finally:
+        # Frees the key for a retry if no job was created
+        queue_manager.release_idempotency_key(idempotency_key, job_id)
+
+
+# ============== Resumable uploads (tus 1.0) ==============
+
+def tus_headers(**headers) -> dict:
+    """Response headers every tus response carries, plus the given ones."""
+    return {
+        "Tus-Resumable": TUS_VERSION,
+        **{name.replace("_", "-"): str(value) for name, value in headers.items()}
+    }
+
+
+@app.options("/api/uploads")
+async def tus_options():
+    """Advertise the tus version and extensions supported."""
+    headers = tus_headers(Tus_Version=TUS_VERSION, Tus_Extension="creation,termination")
+    if settings["uploads"]["max_bytes"]:
+        headers["Tus-Max-Size"] = str(settings["uploads"]["max_bytes"])
+    return Response(status_code=204, headers=headers)
+
+
+@app.post("/api/uploads")
+async def create_upload(
+    upload_length: Optional[int] = Header(None),
+    upload_metadata: Optional[str] = Header(None)
+):
+    """
+    Create a resumable upload.
+
+    Upload-Metadata carries filename plus the /api/upload form fields
+    (target_language, llm_model, engine, priority), base64-encoded.
+    """
+    if upload_length is None or upload_length <= 0:
+        raise HTTPException(status_code=400, detail="Upload-Length header required")
+    try:
+        metadata = parse_upload_metadata(upload_metadata)
+        priority = int(metadata.get("priority") or 0)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.reason)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Priority must be an integer")
+
+    options = {
+        "target_language": metadata.get("target_language") or None,
+        "llm_model": metadata.get("llm_model") or None,
+        "engine": metadata.get("engine") or None,
+        "priority": priority
+    }
+    validate_upload_options(metadata.get("filename"), options["target_language"], options["engine"], priority)
+
+    try:
+        session = upload_manager.create(metadata["filename"], upload_length, options)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.reason)
+    return Response(
+        status_code=201,
+        headers=tus_headers(Location=f"/api/uploads/{session.id}", Upload_Offset=0)
+    )
+
+
+@app.head("/api/uploads/{upload_id}")
+async def get_upload_offset(upload_id: str):
+    """Report how many bytes of an upload the server has, to resume from."""
+    session = upload_manager.get(upload_id)
+    if session is None:
+        return Response(status_code=404, headers=tus_headers())
+    return Response(
+        status_code=200,
+        headers=tus_headers(
+            Upload_Offset=session.offset,
+            Upload_Length=session.length,
+            Cache_Control="no-store"
+        )
+    )
+
+
+@app.patch("/api/uploads/{upload_id}")
+async def append_upload(
+    upload_id: str,
+    request: Request,
+    response: Response,
+    upload_offset: Optional[int] = Header(None),
+    content_type: Optional[str] = Header(None)
+):
+    """
+    Append bytes at Upload-Offset, streaming them to disk as they arrive.
+
+    Returns 204 with the new offset, or the queued job once every byte
+    has been received.
+    """
+    session = upload_manager.get(upload_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Upload not found", headers=tus_headers())
+    if content_type != "application/offset+octet-stream":
+        raise HTTPException(status_code=415, detail="Content-Type must be application/offset+octet-stream")
+    if upload_offset is None:
+        raise HTTPException(status_code=400, detail="Upload-Offset header required")
+
+    try:
+        offset = await upload_manager.append(session, upload_offset, request.stream())
+    except ClientDisconnect:
+        # Bytes received so far are kept; the client resumes from HEAD's offset
+        return Response(status_code=204, headers=tus_headers(Upload_Offset=session.offset))
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.reason, headers=tus_headers())
+
+    if offset < session.length:
+        return Response(status_code=204, headers=tus_headers(Upload_Offset=offset))
+
+    # Admit before completing: on 429 the session and its bytes are kept,
+    # and after Retry-After an empty PATCH at the final offset completes it
+    try:
+        media = await admit_upload(session.path)
+    except HTTPException as e:
+        if e.status_code != 429:
+            upload_manager.delete(session)
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail,
+            headers={**(e.headers or {}), **tus_headers(Upload_Offset=offset)}
+        )
+
+    try:
+        video_path, content_hash, _ = await upload_manager.complete(session)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.reason, headers=tus_headers())
+    response.headers.update(tus_headers(Upload_Offset=offset))
+    return await enqueue_upload(
+        response,
+        video_path,
+        session.filename,
+        content_hash,
+        media=media,
+        **session.options
+    )
+
+
+@app.delete("/api/uploads/{upload_id}")
+async def delete_upload(upload_id: str):
+    """Abandon an incomplete upload."""
+    session = upload_manager.get(upload_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Upload not found", headers=tus_headers())
+    upload_manager.delete(session)
+    return Response(status_code=204, headers=tus_headers())
+
+
+# Page size limits for /api/jobs
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches the current ETag."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def page_etag(jobs: List[Job], *query) -> str:
+    """
+    ETag of one page of jobs: changes when a listed job changes or the
+    page's membership does, but not on updates to jobs outside it.
+    """
+    state = (query, [(job.id, job.seq) for job in jobs])
+    return f'"{hashlib.sha1(repr(state).encode()).hexdigest()[:16]}"'
+
+
 @app.get("/api/jobs", response_model=List[Job])
-async def get_jobs():
-    """Get all jobs."""
-    return queue_manager.get_all_jobs()
+async def get_jobs(
+    response: Response,
+    status: Optional[List[JobStatus]] = Query(None),
+    cursor: Optional[int] = Query(None, ge=0),
+    since: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Get jobs, newest first, one page at a time.
+
+    Filter with one or more ?status= values. When more jobs remain, the
+    X-Next-Cursor header (and a Link rel="next") holds the cursor to pass
+    for the next page.
+
+    With ?since=<seq>, returns only the jobs changed after that change
+    sequence number instead, oldest change first; X-Sequence holds the
+    value to pass as since next time. The ETag is derived from the page
+    returned (its jobs' sequence numbers and the query), so a page whose
+    jobs are unchanged answers If-None-Match with 304 even while other
+    jobs update.
+    """
+    statuses = [s.value for s in status or ()]
+    if since is not None:
+        jobs, next_since = queue_manager.get_changes(since, status or (), limit)
+        headers = {"X-Sequence": str(next_since)}
+        etag = page_etag(jobs, statuses, "since", since, limit, next_since)
+    else:
+        jobs, next_cursor = queue_manager.get_jobs(status or (), cursor, limit)
+        headers = {"X-Sequence": str(queue_manager.seq)}
+        if next_cursor is not None:
+            query = "".join(f"status={value}&" for value in statuses)
+            headers["X-Next-Cursor"] = str(next_cursor)
+            headers["Link"] = f'</api/jobs?{query}cursor={next_cursor}&limit={limit}>; rel="next"'
+        etag = page_etag(jobs, statuses, "cursor", cursor, limit, next_cursor)
+
+    headers["ETag"] = etag
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return jobs
 
 
 @app.get("/api/jobs/{job_id}", response_model=Job)
-async def get_job(job_id: str):
-    """Get specific job by ID."""
+async def get_job(job_id: str, response: Response, if_none_match: Optional[str] = Header(None)):
+    """Get specific job by ID (304 when If-None-Match has its current ETag)."""
     job = queue_manager.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
+    etag = f'"{job.seq}"'
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return job
 
 
+@app.delete("/api/jobs/{job_id}", response_model=Job)
+@app.post("/api/jobs/{job_id}/cancel", response_model=Job)
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job."""
+    job = queue_manager.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status in TERMINAL_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Job already {job.status.value}")
+
+    return await queue_manager.cancel_job(job_id)
+
+
+@app.get("/api/jobs/{job_id}/segments", response_model=List[TranscriptSegment])
+async def get_job_segments(job_id: str, since: int = 0):
+    """Get transcript segments decoded so far, starting at index since."""
+    job = queue_manager.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    segments = queue_manager.get_segments(job_id)
+    if segments is None and job.segments_path and Path(job.segments_path).exists():
+        segments = await asyncio.to_thread(
+            lambda: json.loads(Path(job.segments_path).read_text(encoding='utf-8'))
+        )
+    return (segments or [])[since:]
+
+
 @app.get("/api/download/{job_id}")
 async def download_transcript(job_id: str):
     """Download transcript file."""
@@ -312,15 +872,37 @@ async def get_supported_languages():
     return SUPPORTED_LANGUAGES
 
 
+@app.get("/api/engines")
+async def get_engines():
+    """Get available transcription engines."""
+    return {"engines": list_engines()}
+
+
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time job updates."""
+async def websocket_endpoint(websocket: WebSocket, since: Optional[int] = None):
+    """
+    WebSocket endpoint for real-time job updates.
+
+    Clients that connect with ?since=<seq> (the highest job seq they hold;
+    0 on first connect) get one {"type": "sync"} message carrying only the
+    jobs changed since then and the current sequence number, instead of
+    every job replayed one message at a time.
+    """
     await queue_manager.websocket_manager.connect(websocket)
     try:
-        # Send current jobs on connect
-        jobs = queue_manager.get_all_jobs()
-        for job in jobs:
-            await websocket.send_json(job.model_dump(mode='json'))
+        if since is not None:
+            # Updates broadcast meanwhile may arrive first; clients keep the higher seq
+            jobs, seq = queue_manager.get_changes(since)
+            await websocket.send_json({
+                "type": "sync",
+                "seq": seq,
+                "jobs": [job.model_dump(mode='json') for job in jobs]
+            })
+        else:
+            # Send current jobs on connect
+            jobs = queue_manager.get_all_jobs()
+            for job in jobs:
+                await websocket.send_json(job.model_dump(mode='json'))
 
         # Keep connection alive and listen for messages
         while True:
@@ -14,6 +14,55 @@ class JobStatus(str, Enum):
     FORMATTING_LLM = "formatting_llm"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class TranscriptionEngine(str, Enum):
+    """Transcription engine enumeration."""
+    FASTER_WHISPER = "faster-whisper"
+    OPENAI_WHISPER = "openai-whisper"
+
+
+class MediaStream(BaseModel):
+    """A single stream reported by ffprobe."""
+    index: int
+    codec_type: str
+    codec_name: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    channel_layout: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+
+class MediaInfo(BaseModel):
+    """Media metadata probed once at upload time."""
+    format_name: Optional[str] = None
+    duration: float = 0.0
+    bit_rate: Optional[int] = None
+    streams: List[MediaStream] = []
+
+    @property
+    def audio_stream(self) -> Optional[MediaStream]:
+        """First audio stream, if any."""
+        return next((s for s in self.streams if s.codec_type == "audio"), None)
+
+    @property
+    def has_video(self) -> bool:
+        """Whether the file has a (non cover-art) video stream."""
+        return any(s.codec_type == "video" for s in self.streams)
+
+    @property
+    def is_whisper_ready(self) -> bool:
+        """Whether this is audio-only 16 kHz mono 16-bit PCM, needing no conversion."""
+        stream = self.audio_stream
+        return (
+            stream is not None
+            and not self.has_video
+            and stream.codec_name == "pcm_s16le"
+            and stream.sample_rate == 16000
+            and stream.channels == 1
+        )
 
 
 class JobCreate(BaseModel):
@@ -32,17 +81,44 @@ class Job(BaseModel):
     current_stage: str
     created_at: datetime
     completed_at: Optional[datetime] = None
+    # When a worker first picked the job up
+    started_at: Optional[datetime] = None
+    # Predicted completion time, set when the upload is accepted and
+    # refined from measured stage throughput while the job runs
+    estimated_completion_at: Optional[datetime] = None
+    # Predicted seconds of processing left
+    eta_seconds: Optional[float] = None
     error_message: Optional[str] = None
     video_path: str
+    media: Optional[MediaInfo] = None
     audio_path: Optional[str] = None
     transcript_path: Optional[str] = None
     transcript_raw_path: Optional[str] = None
+    segments_path: Optional[str] = None
+    # Higher runs sooner (-10..10)
+    priority: int = 0
     # LLM processing fields
     target_language: Optional[str] = None
     llm_model: Optional[str] = None
     llm_model_used: Optional[str] = None
     llm_processing_skipped: bool = False
     detected_language: Optional[str] = None
+    # Transcription engine fields
+    engine: Optional[str] = None
+    engine_used: Optional[str] = None
+    # Transcript cache fields
+    content_hash: Optional[str] = None
+    cache_hit: bool = False
+    # Seconds of audio restored from a transcription checkpoint
+    resumed_from: Optional[float] = None
+    # Stage attempts repeated after transient failures
+    retries: int = 0
+    # Times the watchdog killed and requeued a stuck stage
+    stalls: int = 0
+    # Client key that makes repeated uploads return this job
+    idempotency_key: Optional[str] = None
+    # Change sequence number of the job's latest update (see /api/jobs?since=)
+    seq: int = 0
 
     class Config:
         json_encoders = {
@@ -50,6 +126,14 @@ class Job(BaseModel):
         }
 
 
+class TranscriptSegment(BaseModel):
+    """A decoded transcript segment."""
+    index: int
+    text: str
+    start: float
+    end: float
+
+
 class ProgressUpdate(BaseModel):
     """Model for progress update messages."""
     job_id: str
@@ -0,0 +1,173 @@
+"""
+Standalone worker node.
+
+Claims jobs from the shared broker and runs them with the same
+Worker.process_job logic the API process uses, so transcription can be
+scaled across processes and hosts separately from the API tier.
+
+Every node must run from a backend directory whose storage/ is shared with
+the API (uploads, transcripts, checkpoints, broker database):
+
+    python -m app.worker_node --concurrency 2
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import time
+from pathlib import Path
+
+from .config import settings
+from .models import JobStatus
+from .core.broker import JobBroker, BrokerPublisher, CANCELLED
+from .core.queue_manager import QueueManager
+from .core.worker import Worker
+from .core.watchdog import Watchdog
+from .core.model_policy import model_policy
+from .core.storage import STORAGE_DIRS
+from .core.parallel_transcriber import shutdown_pool
+
+
+class WorkerNode:
+    """Runs up to `concurrency` broker jobs at a time on this host."""
+
+    def __init__(self, node_id: str, concurrency: int, broker: JobBroker):
+        self.node_id = node_id
+        self.concurrency = concurrency
+        self.broker = broker
+        self.publisher = BrokerPublisher(broker)
+        # Local job state only; updates go to the API through the publisher
+        self.queue_manager = QueueManager(max_workers=concurrency)
+        self.queue_manager.websocket_manager = self.publisher
+        self.workers = [Worker(slot, self.queue_manager) for slot in range(concurrency)]
+        # Stuck stages are killed here; their jobs go back to the broker
+        self.watchdog = Watchdog(self.queue_manager, lambda: self.workers, requeue=self._requeue)
+        self.running = False
+
+    async def run(self):
+        """Claim and process jobs until stopped."""
+        for directory in STORAGE_DIRS:
+            directory.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(self.broker.open)
+        # Claim jobs only once the model is warm, so none waits on the load
+        await model_policy.start(block=True)
+        self.publisher.start()
+        if settings["watchdog"]["enabled"]:
+            self.watchdog.start()
+        self.running = True
+        print(f"Worker node {self.node_id} started with {self.concurrency} slots", flush=True)
+        try:
+            await asyncio.gather(*(self._slot(worker) for worker in self.workers))
+        finally:
+            self.watchdog.stop()
+            model_policy.stop()
+            await self.publisher.close()
+            shutdown_pool()
+            self.broker.close()
+
+    def _worker_id(self, worker: Worker) -> str:
+        """Lease owner name of one of this node's slots."""
+        return f"{self.node_id}/{worker.worker_id}"
+
+    async def _slot(self, worker: Worker):
+        """One job at a time: claim, run under a kept-alive lease, release."""
+        worker_id = self._worker_id(worker)
+        config = settings["broker"]
+
+        while self.running:
+            try:
+                job = await asyncio.to_thread(self.broker.claim, worker_id, config["lease_seconds"])
+                if job is None:
+                    await asyncio.sleep(config["poll_interval"])
+                    continue
+
+                print(f"Worker {worker_id} claimed job {job.id}")
+                self.queue_manager.adopt_job(job)
+                lease = asyncio.create_task(self._keep_lease(job.id, worker_id, worker))
+                try:
+                    await worker.run_cancellable(job.id, worker.process_job(job.id))
+                finally:
+                    lease.cancel()
+                    # Updates must reach the API before the lease is released
+                    await self.publisher.flush()
+                    # No-op for a job the watchdog already handed back
+                    await asyncio.to_thread(self.broker.finish, job.id, worker_id)
+                    self.queue_manager.drop_job(job.id)
+                    self.queue_manager.clear_segments(job.id)
+
+            except Exception as e:
+                print(f"Worker {worker_id} error: {e}")
+                await asyncio.sleep(1)
+
+    async def _requeue(self, job, current_stage: str):
+        """Put a job the watchdog stopped back on the broker for any node to claim."""
+        job.status = JobStatus.QUEUED
+        self.queue_manager.index.update(job)
+        job.progress = 0.0
+        job.started_at = None
+        job.current_stage = current_stage
+        await self.queue_manager.broadcast_update(job)
+        # The API must see the job queued before another node's updates
+        await self.publisher.flush()
+        _, owner = await asyncio.to_thread(self.broker.lease_state, job.id)
+        if owner in {self._worker_id(worker) for worker in self.workers}:
+            await asyncio.to_thread(self.broker.release, job, owner)
+
+    async def _keep_lease(self, job_id: str, worker_id: str, worker: Worker):
+        """
+        Renew the lease while the job makes progress; stop the job if it
+        was cancelled or taken over.
+
+        A stage the watchdog would call stuck (past its deadline, or no
+        heartbeat for stall_seconds) gets no renewals, so even if it cannot
+        be killed here its lease expires and another node resumes the job.
+        """
+        config = settings["broker"]
+        last_renewal = time.monotonic()
+        while True:
+            await asyncio.sleep(config["poll_interval"])
+            state, owner = await asyncio.to_thread(self.broker.lease_state, job_id)
+
+            if state == CANCELLED:
+                print(f"Worker {worker_id}: job {job_id} cancelled")
+                await self.queue_manager.cancel_job(job_id)
+                return
+            if owner != worker_id:
+                # Lease expired (e.g. the node stalled) and another node took the job
+                print(f"Worker {worker_id}: lost lease on job {job_id}")
+                worker.cancel_current(discard_checkpoint=False)
+                return
+
+            now = time.monotonic()
+            if settings["watchdog"]["enabled"] and Watchdog.overdue(worker, now):
+                continue
+            if now - last_renewal >= config["heartbeat_interval"]:
+                await asyncio.to_thread(
+                    self.broker.heartbeat, job_id, worker_id, config["lease_seconds"]
+                )
+                last_renewal = time.monotonic()
+
+    def stop(self):
+        """Stop claiming new jobs."""
+        self.running = False
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Run a transcription worker node")
+    parser.add_argument("--concurrency", type=int, default=1, help="jobs run at the same time")
+    parser.add_argument("--node-id", default=f"{socket.gethostname()}-{os.getpid()}")
+    parser.add_argument("--broker", default=settings["broker"]["path"], help="broker database path")
+    args = parser.parse_args()
+
+    node = WorkerNode(args.node_id, max(1, args.concurrency), JobBroker(Path(args.broker)))
+    try:
+        asyncio.run(node.run())
+    except KeyboardInterrupt:
+        # Leases of unfinished jobs expire and other nodes resume them
+        print(f"Worker node {args.node_id} stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Shared test setup: import the backend's app package, keep storage in a temp dir.
+
+Run from backend/: python -m pytest tests
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Every storage path (jobs.db, uploads, cache, checkpoints) is relative to
+# the working directory, so run the suite from an empty one
+os.chdir(tempfile.mkdtemp(prefix="transcriber-tests-"))
+
+from app.models import Job, JobStatus, MediaInfo  # noqa: E402
+
+
+@pytest.fixture
+def make_job():
+    """Factory for queued jobs; duration sets the probed media length."""
+    def make(job_id: str, duration: float = 0.0, priority: int = 0, **fields) -> Job:
+        return Job(
+            id=job_id,
+            filename=f"{job_id}.mp4",
+            file_size=1,
+            status=JobStatus.QUEUED,
+            progress=0.0,
+            current_stage="Queued",
+            created_at=datetime.now(),
+            video_path=f"storage/uploads/{job_id}.mp4",
+            media=MediaInfo(duration=duration),
+            priority=priority,
+            **fields
+        )
+    return make
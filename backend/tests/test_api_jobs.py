@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.config import settings
+from app.core.queue_manager import QueueManager
+from app.models import JobStatus, MediaInfo, MediaStream
+
+MP4_HEAD = b"\x00\x00\x00\x20ftypisom\x00\x00\x02\x00isomiso2mp41" + b"\x00" * 64
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    """A fresh in-memory queue behind the API (no store, no workers)."""
+    queue = QueueManager()
+    monkeypatch.setattr(main, "queue_manager", queue)
+    monkeypatch.setitem(settings["admission"], "enabled", False)
+    return queue
+
+
+@pytest.fixture
+def client(queue):
+    # Not entered as a context manager, so the lifespan (workers) never runs
+    return TestClient(main.app)
+
+
+def add_jobs(queue, count, **fields):
+    async def add():
+        return [
+            await queue.add_job(filename=f"{i}.mp4", file_size=1, video_path=f"{i}.mp4", **fields)
+            for i in range(count)
+        ]
+    return asyncio.run(add())
+
+
+def update(queue, job, status=JobStatus.TRANSCRIBING, progress=50.0):
+    asyncio.run(queue.update_job_progress(job.id, status, progress, "Transcribing"))
+
+
+def test_jobs_page_answers_304_until_a_listed_job_changes(client, queue):
+    oldest, newest = add_jobs(queue, 2)
+    first = client.get("/api/jobs", params={"limit": 1})
+    etag = first.headers["ETag"]
+    assert [job["id"] for job in first.json()] == [newest.id]
+
+    assert client.get("/api/jobs", params={"limit": 1}, headers={"If-None-Match": etag}).status_code == 304
+
+    # A job on a later page changing leaves this page's ETag alone
+    update(queue, oldest)
+    assert client.get("/api/jobs", params={"limit": 1}, headers={"If-None-Match": etag}).status_code == 304
+
+    update(queue, newest)
+    changed = client.get("/api/jobs", params={"limit": 1}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_etag_depends_on_the_query(client, queue):
+    add_jobs(queue, 2)
+    etag = client.get("/api/jobs").headers["ETag"]
+    assert client.get("/api/jobs", params={"status": "queued"}, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_since_returns_jobs_changed_after_the_sequence(client, queue):
+    first, second, third = add_jobs(queue, 3)
+    seq = int(client.get("/api/jobs").headers["X-Sequence"])
+    assert client.get("/api/jobs", params={"since": seq}).json() == []
+
+    update(queue, third)
+    update(queue, first)
+    response = client.get("/api/jobs", params={"since": seq})
+    assert [job["id"] for job in response.json()] == [third.id, first.id]
+    assert int(response.headers["X-Sequence"]) == queue.seq
+
+    next_seq = response.headers["X-Sequence"]
+    assert client.get("/api/jobs", params={"since": next_seq}).json() == []
+
+
+def test_since_with_limit_resumes_after_the_last_job_returned(client, queue):
+    jobs = add_jobs(queue, 3)
+    seq = int(client.get("/api/jobs").headers["X-Sequence"])
+    for job in jobs:
+        update(queue, job)
+
+    page = client.get("/api/jobs", params={"since": seq, "limit": 2})
+    assert [job["id"] for job in page.json()] == [jobs[0].id, jobs[1].id]
+    rest = client.get("/api/jobs", params={"since": page.headers["X-Sequence"], "limit": 2})
+    assert [job["id"] for job in rest.json()] == [jobs[2].id]
+
+
+def test_since_etag_matches_an_unchanged_response(client, queue):
+    add_jobs(queue, 1)
+    params = {"since": 0}
+    etag = client.get("/api/jobs", params=params).headers["ETag"]
+    assert client.get("/api/jobs", params=params, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_upload_with_a_known_idempotency_key_replays_its_job(client, queue):
+    job, = add_jobs(queue, 1, idempotency_key="upload-1")
+    response = client.post(
+        "/api/upload",
+        files={"file": ("clip.mp4", MP4_HEAD, "video/mp4")},
+        headers={"Idempotency-Key": "upload-1"}
+    )
+    assert response.status_code == 200
+    assert response.headers["Idempotent-Replayed"] == "true"
+    assert response.json()["id"] == job.id
+    assert len(queue.jobs) == 1
+
+
+def test_upload_while_the_key_is_reserved_is_a_conflict(client, queue):
+    assert queue.reserve_idempotency_key("upload-1", "pending-job")
+    response = client.post(
+        "/api/upload",
+        files={"file": ("clip.mp4", MP4_HEAD, "video/mp4")},
+        headers={"Idempotency-Key": "upload-1"}
+    )
+    assert response.status_code == 409
+    assert queue.jobs == {}
+
+
+def test_retried_upload_creates_one_job(client, queue, monkeypatch):
+    async def admit(path):
+        return MediaInfo(duration=10.0, streams=[MediaStream(index=0, codec_type="audio")])
+    monkeypatch.setattr(main, "admit_upload", admit)
+
+    def upload():
+        return client.post(
+            "/api/upload",
+            files={"file": ("clip.mp4", MP4_HEAD, "video/mp4")},
+            headers={"Idempotency-Key": "upload-1"}
+        )
+
+    first = upload()
+    assert first.status_code == 200, first.text
+    assert "Idempotent-Replayed" not in first.headers
+    again = upload()
+    assert again.headers["Idempotent-Replayed"] == "true"
+    assert again.json()["id"] == first.json()["id"]
+    assert len(queue.jobs) == 1
+
+
+def test_failed_upload_frees_its_idempotency_key(client, queue):
+    # Passes the extension check, then fails content sniffing mid-stream
+    response = client.post(
+        "/api/upload",
+        files={"file": ("notes.mp4", b"%PDF-1.7\n" + b"\x00" * 64, "video/mp4")},
+        headers={"Idempotency-Key": "upload-1"}
+    )
+    assert response.status_code == 415, response.text
+    assert not queue.idempotency_key_pending("upload-1")
+    assert queue.idempotency_keys == {}
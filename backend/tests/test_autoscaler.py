@@ -0,0 +1,170 @@
+import asyncio
+import time
+
+import pytest
+
+from app.config import settings
+from app.core import autoscaler
+from app.core.autoscaler import WorkerSupervisor
+
+GB = 1024 ** 3
+
+
+class FakeWorker:
+    """Worker that runs until stopped; idle unless given a job."""
+
+    def __init__(self, worker_id):
+        self.worker_id = worker_id
+        self.idle_since = time.monotonic()
+        self.running = True
+
+    async def start(self):
+        while self.running:
+            await asyncio.sleep(0.01)
+
+    def stop(self):
+        self.running = False
+
+
+class Slots:
+    """Inference slot counter standing in for the model registry."""
+
+    def __init__(self, count):
+        self.count = count
+
+    def __call__(self):
+        return self.count
+
+    def add(self):
+        self.count += 1
+
+
+@pytest.fixture(autouse=True)
+def host(monkeypatch):
+    """Plenty of RAM and an idle CPU unless a test says otherwise."""
+    monkeypatch.setitem(settings["autoscale"], "scale_up_cooldown", 0)
+    state = {"free": 64 * GB, "load": 0.1}
+    monkeypatch.setattr(autoscaler, "available_memory", lambda: state["free"])
+    monkeypatch.setattr(autoscaler, "cpu_load", lambda: state["load"])
+    monkeypatch.setattr(autoscaler, "process_memory", lambda: None)
+    return state
+
+
+def supervisor(backlog=0, max_workers=8, **kwargs):
+    waiting = {"jobs": backlog}
+    sup = WorkerSupervisor(spawn=FakeWorker, backlog=lambda: waiting["jobs"], **kwargs)
+    sup.min_workers = 1
+    sup.max_workers = max_workers
+    sup.enabled = False
+    sup.waiting = waiting
+    return sup
+
+
+def run(coro_fn):
+    async def main():
+        try:
+            return await coro_fn()
+        finally:
+            for task in asyncio.all_tasks() - {asyncio.current_task()}:
+                task.cancel()
+    return asyncio.run(main())
+
+
+def test_limit_without_slot_accounting_is_max_workers():
+    assert supervisor(max_workers=6).limit() == 6
+
+
+def test_limit_is_capped_by_fixed_inference_slots():
+    assert supervisor(max_workers=6, inference_slots=Slots(3)).limit() == 3
+    assert supervisor(max_workers=6, inference_slots=Slots(0)).limit() == 1
+
+
+def test_limit_ignores_slots_that_can_be_added():
+    slots = Slots(2)
+    assert supervisor(max_workers=6, inference_slots=slots, add_inference_slot=slots.add).limit() == 6
+
+
+def test_scales_up_to_the_backlog():
+    async def scenario():
+        sup = supervisor(backlog=3)
+        sup.start(1)
+        sup.evaluate()
+        return len(sup.workers), sup.decisions[-1]["action"]
+    # One of the three waiting jobs goes to the idle worker
+    assert run(scenario) == (3, "scale_up")
+
+
+def test_scale_up_stops_at_fixed_inference_slots():
+    async def scenario():
+        sup = supervisor(backlog=10, inference_slots=Slots(3))
+        sup.start(1)
+        sup.evaluate()
+        return len(sup.workers)
+    assert run(scenario) == 3
+
+
+def test_scale_up_adds_inference_slots():
+    slots = Slots(2)
+
+    async def scenario():
+        sup = supervisor(backlog=10, max_workers=5, inference_slots=slots, add_inference_slot=slots.add)
+        sup.start(1)
+        sup.evaluate()
+        return len(sup.workers)
+    assert run(scenario) == 5
+    assert slots.count == 5
+
+
+def test_scale_up_is_bounded_by_memory_headroom(host):
+    host["free"] = 5 * GB
+
+    async def scenario():
+        sup = supervisor(backlog=10)
+        sup.memory_per_job = 2 * GB
+        sup.start(1)
+        sup.evaluate()
+        return len(sup.workers)
+    # 5 GB free - 1 GB reserve leaves room for two more 2 GB jobs
+    assert run(scenario) == 3
+
+
+def test_no_growth_under_cpu_load(host):
+    host["load"] = 0.95
+
+    async def scenario():
+        sup = supervisor(backlog=10)
+        sup.start(1)
+        sup.evaluate()
+        return len(sup.workers)
+    assert run(scenario) == 1
+
+
+def test_sheds_a_worker_under_memory_pressure(host):
+    async def scenario():
+        sup = supervisor(backlog=0)
+        sup.start(3)
+        host["free"] = GB // 2
+        sup.evaluate()
+        return len(sup.workers), sup.decisions[-1]["action"]
+    assert run(scenario) == (2, "scale_down")
+
+
+def test_drains_workers_idle_past_the_threshold():
+    async def scenario():
+        sup = supervisor(backlog=0)
+        sup.start(4)
+        busy, stale, _, _ = sup.workers
+        busy.idle_since = None
+        stale.idle_since -= settings["autoscale"]["scale_down_idle_seconds"]
+        sup.evaluate()
+        return busy in sup.workers, stale in sup.workers, len(sup.workers)
+    assert run(scenario) == (True, False, 3)
+
+
+def test_keeps_min_workers():
+    async def scenario():
+        sup = supervisor(backlog=0)
+        sup.start(1)
+        sup.evaluate()
+        return len(sup.workers)
+    assert run(scenario) == 1
@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core import checkpoint
+from app.core.checkpoint import TranscriptCheckpoint
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_ROOT", tmp_path)
+    return tmp_path
+
+
+def segment(start):
+    return {"text": f"at {start}", "start": start, "end": start + 1.0}
+
+
+def write_segments(job_id, segments):
+    async def run():
+        cp = TranscriptCheckpoint(job_id, fsync_interval=0)
+        for s in segments:
+            await cp.append(s)
+        await asyncio.to_thread(cp.close)
+    asyncio.run(run())
+
+
+def test_round_trip_and_resume_offset():
+    write_segments("job", [segment(0), segment(1)])
+    cp = TranscriptCheckpoint("job")
+    segments = cp.load()
+
+    assert segments == [segment(0), segment(1)]
+    assert cp.resume_offset(segments) == 2.0
+    assert cp.resume_offset([]) == 0.0
+
+
+def test_missing_checkpoint_loads_empty():
+    assert TranscriptCheckpoint("none").load() == []
+
+
+@pytest.mark.parametrize("tail", [b'{"text": "cut', b'{"text": "x", "start": 2, "end": 3}', b"\xe4\xb8"])
+def test_torn_tail_is_truncated_before_resuming(checkpoint_root, tail):
+    write_segments("job", [segment(0), segment(1)])
+    path = checkpoint_root / "job.jsonl"
+    path.write_bytes(path.read_bytes() + tail)
+
+    assert TranscriptCheckpoint("job").load() == [segment(0), segment(1)]
+    write_segments("job", [segment(2)])
+
+    lines = path.read_bytes().split(b"\n")
+    assert lines[-1] == b""
+    assert [json.loads(line) for line in lines[:-1]] == [segment(0), segment(1), segment(2)]
+    assert TranscriptCheckpoint("job").load() == [segment(0), segment(1), segment(2)]
+
+
+def test_remove_deletes_the_file(checkpoint_root):
+    write_segments("job", [segment(0)])
+    TranscriptCheckpoint("job").remove()
+    assert not (checkpoint_root / "job.jsonl").exists()
+    TranscriptCheckpoint("job").remove()
@@ -0,0 +1,79 @@
+from app.core.job_index import JobIndex
+from app.models import JobStatus
+
+
+def build(make_job, count):
+    index = JobIndex()
+    jobs = [make_job(f"j{i}") for i in range(count)]
+    for job in jobs:
+        index.add(job)
+    return index, jobs
+
+
+def test_pages_newest_first_with_cursor(make_job):
+    index, _ = build(make_job, 5)
+
+    ids, cursor = index.page(limit=2)
+    assert ids == ["j4", "j3"]
+    ids, cursor = index.page(cursor=cursor, limit=2)
+    assert ids == ["j2", "j1"]
+    ids, cursor = index.page(cursor=cursor, limit=2)
+    assert ids == ["j0"]
+    assert cursor is None
+
+
+def test_full_last_page_has_no_cursor(make_job):
+    index, _ = build(make_job, 4)
+    assert index.page(limit=4) == (["j3", "j2", "j1", "j0"], None)
+
+
+def test_page_filters_and_merges_statuses(make_job):
+    index, jobs = build(make_job, 5)
+    for i, status in ((0, JobStatus.COMPLETED), (2, JobStatus.FAILED), (3, JobStatus.COMPLETED)):
+        jobs[i].status = status
+        index.update(jobs[i])
+
+    assert index.page([JobStatus.COMPLETED]) == (["j3", "j0"], None)
+    ids, cursor = index.page([JobStatus.COMPLETED, JobStatus.FAILED], limit=2)
+    assert ids == ["j3", "j2"]
+    assert index.page([JobStatus.COMPLETED, JobStatus.FAILED], cursor, limit=2) == (["j0"], None)
+    assert index.page([JobStatus.QUEUED]) == (["j4", "j1"], None)
+
+
+def test_status_counts_follow_updates_and_removal(make_job):
+    index, jobs = build(make_job, 3)
+    jobs[0].status = JobStatus.TRANSCRIBING
+    index.update(jobs[0])
+    index.remove("j1")
+
+    counts = index.counts()
+    assert counts["queued"] == 1
+    assert counts["transcribing"] == 1
+    assert sum(counts.values()) == len(index) == 2
+    assert index.count(JobStatus.QUEUED, JobStatus.TRANSCRIBING) == 2
+    assert index.ids(JobStatus.QUEUED, JobStatus.TRANSCRIBING) == ["j0", "j2"]
+    assert index.page() == (["j2", "j0"], None)
+
+
+def test_re_adding_a_job_keeps_its_position(make_job):
+    index, jobs = build(make_job, 3)
+    jobs[0].status = JobStatus.COMPLETED
+    index.add(jobs[0])
+
+    assert len(index) == 3
+    assert index.page() == (["j2", "j1", "j0"], None)
+    assert index.count(JobStatus.COMPLETED) == 1
+
+
+def test_changed_since_lists_latest_changes_in_order(make_job):
+    index, _ = build(make_job, 3)
+    index.touch("j0", 1)
+    index.touch("j1", 2)
+    index.touch("j2", 3)
+    index.touch("j0", 4)
+
+    assert index.changed_since(0) == ["j1", "j2", "j0"]
+    assert index.changed_since(2) == ["j2", "j0"]
+    assert index.changed_since(4) == []
+    index.remove("j2")
+    assert index.changed_since(2) == ["j0"]
@@ -0,0 +1,44 @@
+import numpy as np
+
+from app.core.parallel_transcriber import find_split_points
+from app.core.transcription_engine import SAMPLE_RATE
+
+
+def speech_with_pauses(seconds, pauses):
+    """Noise standing in for speech, silent for 0.5 s at each pause (in seconds)."""
+    audio = np.random.default_rng(0).uniform(-0.5, 0.5, int(seconds * SAMPLE_RATE)).astype(np.float32)
+    for pause in pauses:
+        audio[int(pause * SAMPLE_RATE):int((pause + 0.5) * SAMPLE_RATE)] = 0.0
+    return audio
+
+
+def test_chunks_cover_the_audio_without_gaps():
+    audio = speech_with_pauses(100, [])
+    ranges = find_split_points(audio, chunk_seconds=30, search_seconds=2)
+
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == len(audio)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+
+
+def test_cuts_land_in_nearby_pauses():
+    audio = speech_with_pauses(100, [31, 59])
+    ranges = find_split_points(audio, chunk_seconds=30, search_seconds=3)
+    cuts = [start / SAMPLE_RATE for start, _ in ranges[1:]]
+
+    assert len(cuts) == 2
+    assert 31 <= cuts[0] <= 31.5
+    assert 59 <= cuts[1] <= 59.5
+
+
+def test_short_tail_stays_in_the_last_chunk():
+    audio = speech_with_pauses(70, [])
+    ranges = find_split_points(audio, chunk_seconds=30, search_seconds=2)
+
+    assert len(ranges) == 2
+    assert ranges[-1][1] - ranges[-1][0] > 30 * SAMPLE_RATE
+
+
+def test_audio_shorter_than_a_chunk_is_one_range():
+    audio = speech_with_pauses(10, [])
+    assert find_split_points(audio, chunk_seconds=30, search_seconds=2) == [(0, len(audio))]
@@ -0,0 +1,36 @@
+import pytest
+
+from app.core.retry import PermanentError, RetryPolicy
+
+
+def test_delay_doubles_up_to_the_cap():
+    policy = RetryPolicy(max_attempts=6, base_delay=5, max_delay=30)
+    assert [policy.delay(attempt, jitter=0) for attempt in range(1, 6)] == [5, 10, 20, 30, 30]
+
+
+@pytest.mark.parametrize("jitter", [-0.2, 0.2])
+def test_delay_applies_jitter(jitter):
+    policy = RetryPolicy(max_attempts=3, base_delay=10, max_delay=60)
+    assert policy.delay(2, jitter=jitter) == pytest.approx(20 * (1 + jitter))
+
+
+def test_random_jitter_stays_within_twenty_percent():
+    policy = RetryPolicy(max_attempts=3, base_delay=10, max_delay=60)
+    for _ in range(100):
+        assert 8 <= policy.delay(1) <= 12
+
+
+def test_retries_transient_errors_until_the_last_attempt():
+    policy = RetryPolicy(max_attempts=3, base_delay=1, max_delay=1)
+    assert policy.should_retry(1, RuntimeError("timeout"))
+    assert policy.should_retry(2, RuntimeError("timeout"))
+    assert not policy.should_retry(3, RuntimeError("timeout"))
+
+
+@pytest.mark.parametrize("error", [PermanentError("bad media"), FileNotFoundError("gone"), ImportError("torch")])
+def test_never_retries_permanent_errors(error):
+    assert not RetryPolicy(max_attempts=5, base_delay=1, max_delay=1).should_retry(1, error)
+
+
+def test_at_least_one_attempt():
+    assert RetryPolicy(max_attempts=0, base_delay=1, max_delay=1).max_attempts == 1
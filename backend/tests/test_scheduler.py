@@ -0,0 +1,82 @@
+import asyncio
+
+from app.core.scheduler import JobScheduler
+
+
+def drain(scheduler):
+    async def get_all():
+        return [await scheduler.get() for _ in range(scheduler.qsize())]
+    return asyncio.run(get_all())
+
+
+def enqueue(scheduler, *entries):
+    async def put_all():
+        for job, enqueued_at in entries:
+            await scheduler.put(job, enqueued_at)
+    asyncio.run(put_all())
+
+
+def test_shortest_job_runs_first(make_job):
+    scheduler = JobScheduler(aging_rate=0.0)
+    enqueue(
+        scheduler,
+        (make_job("long", duration=3600), 0),
+        (make_job("short", duration=60), 1),
+        (make_job("medium", duration=600), 2)
+    )
+    assert scheduler.snapshot() == ["short", "medium", "long"]
+    assert drain(scheduler) == ["short", "medium", "long"]
+
+
+def test_aging_bounds_how_long_a_job_can_be_overtaken(make_job):
+    # With aging_rate 1 a job costing c waits for arrivals within c seconds only
+    scheduler = JobScheduler(aging_rate=1.0)
+    enqueue(
+        scheduler,
+        (make_job("long", duration=600), 0),
+        (make_job("soon", duration=60), 100),
+        (make_job("late", duration=60), 1000)
+    )
+    assert drain(scheduler) == ["soon", "long", "late"]
+
+
+def test_priority_outweighs_cost(make_job):
+    scheduler = JobScheduler(aging_rate=0.0, priority_weight=600)
+    enqueue(
+        scheduler,
+        (make_job("short", duration=60), 0),
+        (make_job("urgent", duration=300, priority=1), 1)
+    )
+    assert drain(scheduler) == ["urgent", "short"]
+
+
+def test_fifo_orders_by_priority_then_arrival(make_job):
+    scheduler = JobScheduler(policy="fifo")
+    enqueue(
+        scheduler,
+        (make_job("first", duration=3600), 0),
+        (make_job("second", duration=1), 1),
+        (make_job("urgent", duration=3600, priority=1), 2)
+    )
+    assert drain(scheduler) == ["urgent", "first", "second"]
+
+
+def test_removed_job_is_skipped(make_job):
+    scheduler = JobScheduler()
+    enqueue(scheduler, (make_job("a", duration=10), 0), (make_job("b", duration=20), 0))
+
+    assert scheduler.remove("a") is True
+    assert scheduler.remove("a") is False
+    assert scheduler.qsize() == 1
+    assert drain(scheduler) == ["b"]
+
+
+def test_requeued_job_takes_its_new_rank(make_job):
+    scheduler = JobScheduler(aging_rate=0.0)
+    job = make_job("a", duration=1000)
+    enqueue(scheduler, (job, 0), (make_job("b", duration=500), 0))
+    job.media.duration = 10
+    enqueue(scheduler, (job, 0))
+
+    assert scheduler.qsize() == 2
+    assert drain(scheduler) == ["a", "b"]
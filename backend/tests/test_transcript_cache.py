@@ -0,0 +1,64 @@
+from app.core.transcript_cache import TranscriptCache
+
+
+def test_hits_misses_and_hit_rate(tmp_path):
+    cache = TranscriptCache(tmp_path, max_bytes=1024, max_entries=10)
+    cache.put("a", {"raw.txt": "hello"}, {"language": "en"})
+
+    entry = cache.get("a")
+    assert entry["files"] == {"raw.txt": "hello"}
+    assert entry["meta"]["language"] == "en"
+    assert cache.get("b") is None
+    cache.get("a", count=False)
+    cache.record_lookup(hit=False)
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 2, 0.333)
+
+
+def test_evicts_least_recently_used_entry_over_the_entry_limit(tmp_path):
+    cache = TranscriptCache(tmp_path, max_bytes=1024, max_entries=2)
+    cache.put("a", {"raw.txt": "a"})
+    cache.put("b", {"raw.txt": "b"})
+    cache.get("a")
+    cache.put("c", {"raw.txt": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.evictions == 1
+    assert not (tmp_path / "b").exists()
+
+
+def test_evicts_down_to_the_byte_limit(tmp_path):
+    cache = TranscriptCache(tmp_path, max_bytes=10, max_entries=10)
+    cache.put("a", {"raw.txt": "x" * 4})
+    cache.put("b", {"raw.txt": "x" * 4})
+    cache.put("c", {"raw.txt": "x" * 4})
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] == 8
+    assert cache.get("a") is None
+
+
+def test_lru_order_survives_a_reload(tmp_path):
+    cache = TranscriptCache(tmp_path, max_bytes=1024, max_entries=2)
+    cache.put("a", {"raw.txt": "a"})
+    cache.put("b", {"raw.txt": "b"})
+    cache.get("a")
+
+    reloaded = TranscriptCache(tmp_path, max_bytes=1024, max_entries=2)
+    reloaded.put("c", {"raw.txt": "c"})
+    assert reloaded.get("b") is None
+    assert reloaded.get("a") is not None
+
+
+def test_replacing_an_entry_keeps_one_copy(tmp_path):
+    cache = TranscriptCache(tmp_path, max_bytes=1024, max_entries=10)
+    cache.put("a", {"raw.txt": "old"})
+    cache.put("a", {"raw.txt": "newer"})
+
+    assert cache.get("a")["files"] == {"raw.txt": "newer"}
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] == 5
@@ -0,0 +1,32 @@
+import pytest
+
+from app.core.uploads import sniff_container
+
+
+@pytest.mark.parametrize("head, container", [
+    (b"\x00\x00\x00\x20ftypisom\x00\x00\x02\x00", "mp4"),
+    (b"\x00\x00\x00\x14ftypqt  \x00\x00\x00\x00", "mp4"),
+    (b"\x1a\x45\xdf\xa3\x01\x00\x00\x00\x00\x00\x00\x1f", "matroska"),
+    (b"RIFF\x24\x00\x00\x00AVI LIST", "avi"),
+    (b"RIFF\x24\x00\x00\x00WAVEfmt ", "wav"),
+    (b"fLaC\x00\x00\x00\x22", "flac"),
+    (b"OggS\x00\x02\x00\x00", "ogg"),
+    (b"ID3\x04\x00\x00\x00\x00", "mp3"),
+    (b"\xff\xfb\x90\x64\x00\x00", "mp3"),
+    (b"FLV\x01\x05\x00\x00\x00\x09", "flv"),
+    (b"\x30\x26\xb2\x75\x8e\x66\xcf\x11\xa6\xd9\x00\xaa", "asf"),
+])
+def test_recognises_media_containers(head, container):
+    assert sniff_container(head) == container
+
+
+@pytest.mark.parametrize("head", [
+    b"",
+    b"\xff",
+    b"%PDF-1.7\n%\xe2\xe3",
+    b"PK\x03\x04\x14\x00\x00\x00",
+    b"RIFF\x24\x00\x00\x00WEBPVP8 ",
+    b"<!DOCTYPE html>",
+])
+def test_rejects_other_files(head):
+    assert sniff_container(head) is None
@@ -15,7 +15,7 @@ const { Title, Text } = Typography;
 const WS_URL = 'ws://localhost:8000/ws';
 
 const App: React.FC = () => {
-  const { jobs, isConnected } = useWebSocket(WS_URL);
+  const { jobs, segments, isConnected } = useWebSocket(WS_URL);
 
   return (
     <Layout style={{ minHeight: '100vh', background: '#f0f2f5' }}>
@@ -42,7 +42,7 @@ const App: React.FC = () => {
           <Space direction="vertical" size="large" style={{ width: '100%' }}>
             <VideoUpload />
             <Divider />
-            <JobQueue jobs={jobs} />
+            <JobQueue jobs={jobs} segments={segments} />
           </Space>
         </div>
       </Content>
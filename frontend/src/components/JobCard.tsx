@@ -6,22 +6,24 @@ import React from 'react';
 import { Card, Progress, Tag, Button, Typography, Space, Alert } from 'antd';
 import {
   DownloadOutlined,
+  StopOutlined,
   ClockCircleOutlined,
   CheckCircleOutlined,
   CloseCircleOutlined,
   SyncOutlined,
 } from '@ant-design/icons';
-import { Job, JobStatus } from '../types';
+import { Job, JobStatus, TranscriptSegment } from '../types';
 
 const { Text, Title } = Typography;
 
 interface JobCardProps {
   job: Job;
+  segments?: TranscriptSegment[]; // live segments while transcribing
 }
 
 const API_URL = 'http://localhost:8000';
 
-export const JobCard: React.FC<JobCardProps> = ({ job }) => {
+export const JobCard: React.FC<JobCardProps> = ({ job, segments }) => {
   const getStatusTag = () => {
     switch (job.status) {
       case JobStatus.QUEUED:
@@ -54,6 +56,12 @@ export const JobCard: React.FC<JobCardProps> = ({ job }) => {
             失败
           </Tag>
         );
+      case JobStatus.CANCELLED:
+        return (
+          <Tag icon={<StopOutlined />} color="warning">
+            已取消
+          </Tag>
+        );
       default:
         return <Tag>{job.status}</Tag>;
     }
@@ -77,10 +85,28 @@ export const JobCard: React.FC<JobCardProps> = ({ job }) => {
     return date.toLocaleString('zh-CN');
   };
 
+  const formatDuration = (seconds: number) => {
+    if (seconds < 60) return `${Math.ceil(seconds)} 秒`;
+    if (seconds < 3600) return `${Math.ceil(seconds / 60)} 分钟`;
+    return `${(seconds / 3600).toFixed(1)} 小时`;
+  };
+
+  const formatTimestamp = (seconds: number) => {
+    const minutes = Math.floor(seconds / 60);
+    const secs = Math.floor(seconds % 60);
+    return `${String(minutes).padStart(2, '0')}:${String(secs).padStart(2, '0')}`;
+  };
+
   const handleDownload = () => {
     window.open(`${API_URL}/api/download/${job.id}`, '_blank');
   };
 
+  const handleCancel = () => {
+    fetch(`${API_URL}/api/jobs/${job.id}`, { method: 'DELETE' });
+  };
+
+  const isActive = ![JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED].includes(job.status);
+
   return (
     <Card
       style={{ marginBottom: 16 }}
@@ -93,7 +119,7 @@ export const JobCard: React.FC<JobCardProps> = ({ job }) => {
         </Space>
       }
       extra={
-        job.status === JobStatus.COMPLETED && (
+        job.status === JobStatus.COMPLETED ? (
           <Button
             type="primary"
             icon={<DownloadOutlined />}
@@ -101,6 +127,14 @@ export const JobCard: React.FC<JobCardProps> = ({ job }) => {
           >
             下载转录文本
           </Button>
+        ) : isActive && (
+          <Button
+            danger
+            icon={<StopOutlined />}
+            onClick={handleCancel}
+          >
+            取消
+          </Button>
         )
       }
     >
@@ -118,6 +152,11 @@ export const JobCard: React.FC<JobCardProps> = ({ job }) => {
           <>
             <div>
               <Text strong>{job.current_stage}</Text>
+              {isActive && job.eta_seconds != null && (
+                <Text type="secondary" style={{ marginLeft: 16 }}>
+                  预计剩余：{formatDuration(job.eta_seconds)}
+                </Text>
+              )}
               <Progress
                 percent={Math.round(job.progress)}
                 status={getProgressStatus()}
@@ -130,6 +169,28 @@ export const JobCard: React.FC<JobCardProps> = ({ job }) => {
           </>
         )}
 
+        {job.status === JobStatus.TRANSCRIBING && segments && segments.length > 0 && (
+          <div
+            style={{
+              maxHeight: 240,
+              overflowY: 'auto',
+              padding: '8px 12px',
+              background: '#fafafa',
+              border: '1px solid #f0f0f0',
+              borderRadius: 4,
+            }}
+          >
+            {segments.map((segment) => (
+              <div key={segment.index}>
+                <Text type="secondary" style={{ marginRight: 8 }}>
+                  [{formatTimestamp(segment.start)}]
+                </Text>
+                <Text>{segment.text}</Text>
+              </div>
+            ))}
+          </div>
+        )}
+
         {job.status === JobStatus.COMPLETED && job.completed_at && (
           <Alert
             message="转录完成"
@@ -4,18 +4,19 @@
 
 import React, { useState } from 'react';
 import { Card, Typography, Empty, Radio, Space } from 'antd';
-import { Job, JobStatus } from '../types';
+import { Job, JobStatus, TranscriptSegment } from '../types';
 import { JobCard } from './JobCard';
 
 const { Title } = Typography;
 
 interface JobQueueProps {
   jobs: Job[];
+  segments: Map<string, TranscriptSegment[]>;
 }
 
 type FilterType = 'all' | 'processing' | 'completed' | 'failed';
 
-export const JobQueue: React.FC<JobQueueProps> = ({ jobs }) => {
+export const JobQueue: React.FC<JobQueueProps> = ({ jobs, segments }) => {
   const [filter, setFilter] = useState<FilterType>('all');
 
   const filterJobs = (jobs: Job[]): Job[] => {
@@ -95,7 +96,7 @@ export const JobQueue: React.FC<JobQueueProps> = ({ jobs }) => {
         ) : (
           <div>
             {filteredJobs.map((job) => (
-              <JobCard key={job.id} job={job} />
+              <JobCard key={job.id} job={job} segments={segments.get(job.id)} />
             ))}
           </div>
         )}
@@ -19,10 +19,10 @@ export const VideoUpload: React.FC = () => {
   const uploadProps: UploadProps = {
     name: 'file',
     multiple: false,
-    accept: '.mp4,.avi,.mkv,.mov,.webm,.flv,.wmv',
+    accept: '.mp4,.avi,.mkv,.mov,.webm,.flv,.wmv,.wav,.mp3,.flac,.m4a,.ogg,.opus',
     showUploadList: true,
     beforeUpload: (file) => {
-      const isVideo = [
+      const isMedia = [
         'video/mp4',
         'video/x-msvideo',
         'video/x-matroska',
@@ -30,16 +30,24 @@ export const VideoUpload: React.FC = () => {
         'video/webm',
         'video/x-flv',
         'video/x-ms-wmv',
-      ].includes(file.type) || file.name.match(/\.(mp4|avi|mkv|mov|webm|flv|wmv)$/i);
+        'audio/wav',
+        'audio/x-wav',
+        'audio/mpeg',
+        'audio/flac',
+        'audio/mp4',
+        'audio/x-m4a',
+        'audio/ogg',
+        'audio/opus',
+      ].includes(file.type) || file.name.match(/\.(mp4|avi|mkv|mov|webm|flv|wmv|wav|mp3|flac|m4a|ogg|opus)$/i);
 
-      if (!isVideo) {
-        message.error('只能上传视频文件！');
+      if (!isMedia) {
+        message.error('只能上传视频或音频文件！');
         return Upload.LIST_IGNORE;
       }
 
       const isLt2G = file.size / 1024 / 1024 / 1024 < 2;
       if (!isLt2G) {
-        message.error('视频文件必须小于 2GB！');
+        message.error('文件必须小于 2GB！');
         return Upload.LIST_IGNORE;
       }
 
@@ -83,7 +91,7 @@ export const VideoUpload: React.FC = () => {
     <Card>
       <Title level={3}>上传视频</Title>
       <Text type="secondary">
-        支持的格式：MP4, AVI, MKV, MOV, WEBM, FLV, WMV（最大 2GB）
+        支持的格式：MP4, AVI, MKV, MOV, WEBM, FLV, WMV，音频 WAV, MP3, FLAC, M4A, OGG, OPUS（最大 2GB）
       </Text>
       <div style={{ marginTop: 16 }}>
         <Dragger {...uploadProps} disabled={uploading}>
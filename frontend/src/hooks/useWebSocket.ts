@@ -3,18 +3,30 @@
  */
 
 import { useEffect, useRef, useState } from 'react';
-import { Job } from '../types';
+import { Job, SegmentMessage, SyncMessage, TranscriptSegment } from '../types';
+
+// Keep whichever copy of a job is newer
+const mergeJob = (jobs: Map<string, Job>, job: Job) => {
+  const current = jobs.get(job.id);
+  if (!current || (job.seq ?? 0) >= (current.seq ?? 0)) {
+    jobs.set(job.id, job);
+  }
+};
 
 export const useWebSocket = (url: string) => {
   const [jobs, setJobs] = useState<Map<string, Job>>(new Map());
+  const [segments, setSegments] = useState<Map<string, TranscriptSegment[]>>(new Map());
   const [isConnected, setIsConnected] = useState(false);
   const ws = useRef<WebSocket | null>(null);
   const reconnectTimeout = useRef<NodeJS.Timeout | null>(null);
+  // Highest change sequence number seen; reconnects only fetch what changed after it
+  const lastSeq = useRef(0);
 
   useEffect(() => {
     const connect = () => {
-      console.log('Connecting to WebSocket:', url);
-      ws.current = new WebSocket(url);
+      const resumeUrl = `${url}${url.includes('?') ? '&' : '?'}since=${lastSeq.current}`;
+      console.log('Connecting to WebSocket:', resumeUrl);
+      ws.current = new WebSocket(resumeUrl);
 
       ws.current.onopen = () => {
         console.log('WebSocket connected');
@@ -29,11 +41,47 @@ export const useWebSocket = (url: string) => {
             return;
           }
 
-          const job: Job = JSON.parse(event.data);
+          const data = JSON.parse(event.data);
+
+          // Live transcript segment for a job that is still transcribing
+          if (data.type === 'segment') {
+            const message = data as SegmentMessage;
+            const segment: TranscriptSegment = {
+              index: message.index,
+              text: message.text,
+              start: message.start,
+              end: message.end,
+            };
+            setSegments((prev) => {
+              const newSegments = new Map(prev);
+              // A retried or resumed run re-sends from its checkpoint, so drop
+              // anything at or after this index instead of duplicating it
+              const kept = (prev.get(message.job_id) || []).filter((s) => s.index < message.index);
+              newSegments.set(message.job_id, [...kept, segment]);
+              return newSegments;
+            });
+            return;
+          }
+
+          // Jobs missed while disconnected, in one message
+          if (data.type === 'sync') {
+            const message = data as SyncMessage;
+            console.log('Resynced', message.jobs.length, 'changed jobs up to seq', message.seq);
+            lastSeq.current = Math.max(lastSeq.current, message.seq);
+            setJobs((prev) => {
+              const newJobs = new Map(prev);
+              message.jobs.forEach((job) => mergeJob(newJobs, job));
+              return newJobs;
+            });
+            return;
+          }
+
+          const job: Job = data;
           console.log('Received job update:', job.id, job.status, job.progress);
+          lastSeq.current = Math.max(lastSeq.current, job.seq ?? 0);
           setJobs((prev) => {
             const newJobs = new Map(prev);
-            newJobs.set(job.id, job);
+            mergeJob(newJobs, job);
             return newJobs;
           });
         } catch (error) {
@@ -83,6 +131,7 @@ export const useWebSocket = (url: string) => {
     jobs: Array.from(jobs.values()).sort(
       (a, b) => new Date(b.created_at).getTime() - new Date(a.created_at).getTime()
     ),
+    segments,
     isConnected,
   };
 };
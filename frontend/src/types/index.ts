@@ -8,6 +8,7 @@ export enum JobStatus {
   TRANSCRIBING = 'transcribing',
   COMPLETED = 'completed',
   FAILED = 'failed',
+  CANCELLED = 'cancelled',
 }
 
 export interface Job {
@@ -23,6 +24,28 @@ export interface Job {
   video_path: string;
   audio_path?: string;
   transcript_path?: string;
+  estimated_completion_at?: string;
+  eta_seconds?: number;
+  seq: number; // change sequence number of the latest update
+}
+
+export interface TranscriptSegment {
+  index: number;
+  text: string;
+  start: number;
+  end: number;
+}
+
+export interface SegmentMessage extends TranscriptSegment {
+  type: 'segment';
+  job_id: string;
+}
+
+// Jobs changed since the seq a client (re)connected with
+export interface SyncMessage {
+  type: 'sync';
+  seq: number;
+  jobs: Job[];
 }
 
 export interface ProgressUpdate {
@@ -12,15 +12,19 @@ class TranscriberError(Exception):
 class WhisperTranscriber:
     """Handles Whisper model loading and transcription."""
 
-    def __init__(self, device="auto", verbose=False):
+    def __init__(self, device="auto", verbose=False, model_size=None):
         """
         Initialize the transcriber.
 
         Args:
             device: Device preference ("auto", "cpu", or "cuda")
             verbose: Enable verbose output
+            model_size: Whisper model name (defaults to Config.MODEL_SIZE)
         """
+        self.model_size = model_size or Config.MODEL_SIZE
         self.device = Config.detect_device(device)
+        # "float16" for GPU, "int8" for CPU for better performance
+        self.compute_type = "float16" if self.device == "cuda" else "int8"
         self.verbose = verbose
         self.model = None
         self._model_loaded = False
@@ -31,17 +35,14 @@ class WhisperTranscriber:
             return
 
         if self.verbose:
-            print(f"Loading Whisper {Config.MODEL_SIZE} model on {self.device}...")
+            print(f"Loading Whisper {self.model_size} model on {self.device}...")
 
         try:
             # Load model with faster-whisper
-            # compute_type: "float16" for GPU, "int8" for CPU for better performance
-            compute_type = "float16" if self.device == "cuda" else "int8"
-
             self.model = WhisperModel(
-                Config.MODEL_SIZE,
+                self.model_size,
                 device=self.device,
-                compute_type=compute_type,
+                compute_type=self.compute_type,
                 download_root=str(Config.get_cache_dir())
             )
             self._model_loaded = True
@@ -112,5 +113,5 @@ class WhisperTranscriber:
         return {
             "device": self.device,
             "model_loaded": self._model_loaded,
-            "model_size": Config.MODEL_SIZE
+            "model_size": self.model_size
         }